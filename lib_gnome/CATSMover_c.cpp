@@ -45,6 +45,9 @@ CATSMover_c::CATSMover_c () : CurrentMover_c() {
 	bApplyLogProfile = false;
 
 	memset(&fOptimize, 0, sizeof(fOptimize));
+	fStepTimeValue.u = 1;
+	fStepTimeValue.v = 1;
+	fStepTime = 0;
 }
 
 
@@ -63,6 +66,9 @@ CATSMover_c::CATSMover_c(TMap *owner, char *name) : CurrentMover_c(owner, name)
 	bApplyLogProfile = false;
 
 	memset(&fOptimize, 0, sizeof(fOptimize));
+	fStepTimeValue.u = 1;
+	fStepTimeValue.v = 1;
+	fStepTime = 0;
 
 	SetClassName(name);
 }
@@ -306,6 +312,12 @@ OSErr CATSMover_c::PrepareForModelStep(const Seconds &model_time,
 	this->fOptimize.isOptimizedForStep = true;
 	this->fOptimize.value = sqrt(6 * (fEddyDiffusion / 10000) / time_step);
 
+	// look the time value up once per step - a ShioTimeValue recomputes
+	// its table in GetTimeValue, so get_move must not call it from
+	// more than one thread
+	fStepTime = model_time;
+	fStepTimeValue = GetTimeFileValue(model_time);
+
 	return err;
 }
 
@@ -391,14 +403,32 @@ WorldPoint3D CATSMover_c::GetMove(const Seconds &model_time, Seconds timeStep,
 }
 
 
+VelocityRec CATSMover_c::GetTimeFileValue(const Seconds &model_time)
+{
+	VelocityRec timeValue = {1, 1};
+	OSErr err = 0;
+
+	if (timeDep && bTimeFileActive) {
+		// VelocityRec errVelocity={1,1};
+		// JLM 11/22/99, if there are no time file values, use zero not 1
+		VelocityRec errVelocity = {0, 1};
+
+		err = timeDep->GetTimeValue(model_time, &timeValue); // AH 07/10/2012
+		if (err)
+			timeValue = errVelocity;
+	}
+
+	return timeValue;
+}
+
+
 /// 5/12/99 JLM, we only add the eddy uncertainty when the vectors are big enough when the timeValue is 1
 // This is in response to the Prince William sound problem where 5 patterns are being added together
 VelocityRec CATSMover_c::GetScaledPatValue(const Seconds &model_time,
 										   WorldPoint3D p, Boolean *useEddyUncertainty)
 {
-	VelocityRec	patVelocity, timeValue = {1, 1};
+	VelocityRec	patVelocity, timeValue;
 	float lengthSquaredBeforeTimeFactor;
-	OSErr err = 0;
 
 	if (!this->fOptimize.isOptimizedForStep && this->scaleType == SCALE_OTHERGRID) {
 		// we need to update refScale
@@ -406,15 +436,10 @@ VelocityRec CATSMover_c::GetScaledPatValue(const Seconds &model_time,
 	}
 	
 	// get and apply our time file scale factor
-	if (timeDep && bTimeFileActive) {
-		// VelocityRec errVelocity={1,1};
-		// JLM 11/22/99, if there are no time file values, use zero not 1
-		VelocityRec errVelocity = {0, 1};
-
-		err = timeDep->GetTimeValue(model_time, &timeValue); // AH 07/10/2012
-		if (err)
-			timeValue = errVelocity;
-	}
+	if (this->fOptimize.isOptimizedForStep && model_time == fStepTime)
+		timeValue = fStepTimeValue;
+	else
+		timeValue = GetTimeFileValue(model_time);
 
 	patVelocity = GetPatValue(p);
 	patVelocity.u *= refScale; 
@@ -52,6 +52,8 @@ public:
 	double			fEddyDiffusion;			// cm**2/s minimum eddy velocity for uncertainty
 	double			fEddyV0;			//  in m/s, used for cutoff of minimum eddy for uncertainty
 	TCM_OPTIMZE fOptimize; // this does not need to be saved to the save file	
+	VelocityRec		fStepTimeValue;			// timeDep value at fStepTime, set in PrepareForModelStep
+	Seconds			fStepTime;
 	
 #ifndef pyGNOME
 						CATSMover_c (TMap *owner, char *name);
@@ -70,6 +72,7 @@ public:
 	void				DeleteTimeDep ();
 	VelocityRec			GetPatValue (WorldPoint3D p);
 	VelocityRec 		GetScaledPatValue(const Seconds& model_time, WorldPoint3D p,Boolean * useEddyUncertainty);//JLM 5/12/99
+	VelocityRec			GetTimeFileValue(const Seconds& model_time);
 	VelocityRec			GetSmoothVelocity (WorldPoint p);
 	virtual OSErr       ComputeVelocityScale(const Seconds& model_time);
 	virtual WorldPoint3D       GetMove(const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType);
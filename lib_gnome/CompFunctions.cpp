@@ -178,6 +178,41 @@ void GetRandomVectorInUnitCircle(float *u,float *v)
 	} while ( (*u)*(*u) +  (*v)*(*v) > 1.0);
 }
 
+RandomStream::RandomStream(unsigned long seed, long index)
+{
+	fState = ((unsigned long long)seed << 32) ^ (unsigned long long)index;
+	Next();	// scramble the seed so neighbouring indexes start far apart
+}
+
+unsigned long long RandomStream::Next()
+{	// splitmix64
+	unsigned long long z;
+
+	fState += 0x9E3779B97F4A7C15ULL;
+	z = fState;
+	z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+	z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+
+	return z ^ (z >> 31);
+}
+
+float RandomStream::GetFloat(float low, float high)
+{
+	// top 24 bits give a uniform float in [0, 1]
+	double r = (double)(Next() >> 40) / (double)0xFFFFFF;
+
+	return (float)(low + (high - low) * r);
+}
+
+void RandomStream::GetVectorInUnitCircle(float *u, float *v)
+{
+	do
+	{
+		*u = GetFloat(-1.0, 1.0);
+		*v = GetFloat(-1.0, 1.0);
+	} while ( (*u)*(*u) +  (*v)*(*v) > 1.0);
+}
+
 
 char *SwapN(char *s, short n)
 {
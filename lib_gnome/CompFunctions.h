@@ -41,6 +41,22 @@ short ScaleToShort(long n);
 long GetRandom(long low, long high);
 float GetRandomFloat(float low, float high);
 void GetRandomVectorInUnitCircle(float *u,float *v);
+
+// Private random number sequence, seeded from (seed, index) so that the
+// draws for one LE don't depend on which thread or chunk moves it.
+// Unlike GetRandomFloat it doesn't touch the global rand() state.
+class RandomStream
+{
+public:
+	RandomStream(unsigned long seed, long index);
+	float GetFloat(float low, float high);
+	void GetVectorInUnitCircle(float *u, float *v);
+
+private:
+	unsigned long long fState;
+	unsigned long long Next();
+};
+
 char *SwapN(char *s, short n);
 long Assoc(long key, LONGPTR table, short n);
 void SwitchShorts(SHORTPTR a, SHORTPTR b);
@@ -162,7 +162,7 @@ void CurrentCycleMover_c::ModelStepIsDone()
 }
 
 
-OSErr CurrentCycleMover_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
+OSErr CurrentCycleMover_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, int* cell_index) {
 
 	//char errmsg[256];
 	if(!ref || !delta) {
@@ -184,6 +184,9 @@ OSErr CurrentCycleMover_c::get_move(int n, Seconds model_time, Seconds step_len,
 	
 	WorldPoint3D zero_delta ={0,0,0.};
 	
+	// cell_index is optional, it keeps the grid cell of each LE between steps
+	TDagTree *dagTree = (cell_index && timeGrid) ? timeGrid->GetDagTree() : 0;
+
 	for (int i = 0; i < n; i++) {
 		
 		// only operate on LE if the status is in water
@@ -201,12 +204,19 @@ OSErr CurrentCycleMover_c::get_move(int n, Seconds model_time, Seconds step_len,
 		rec.p.pLat *= 1000000;	
 		rec.p.pLong*= 1000000;
 		
+		// start the grid cell search from the cell the LE was in last step
+		if (dagTree) dagTree->SetTriHint(cell_index[i]);
+
 		delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
 		
+		if (dagTree) cell_index[i] = dagTree->GetLastTri();
+
 		delta[i].p.pLat /= 1000000;
 		delta[i].p.pLong /= 1000000;
 	}
 	
+	if (dagTree) dagTree->SetTriHint(-1);
+
 	return noErr;
 }
 
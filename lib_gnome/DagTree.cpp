@@ -5,6 +5,25 @@
 
 using namespace std;
 
+#ifdef _MSC_VER
+#define THREAD_LOCAL __declspec(thread)
+#else
+#define THREAD_LOCAL __thread
+#endif
+
+// The triangle hint and the last triangle found are kept per thread, not in
+// the tree, so several threads can move chunks of LEs on the same grid at
+// once. A get_move() call runs on one thread, so this makes them per call.
+// They belong to the tree that last used them and are ignored by the others
+typedef struct TriHint
+{
+	const TDagTree	*tree;
+	long			hintTri;
+	long			lastTri;
+} TriHint;
+
+static THREAD_LOCAL TriHint sTriHint = {0, -1, -1};
+
 void TDagTree::GetVelocity(long ntri,VelocityRec *r)
 {
 	if(fVelH) {
@@ -43,6 +62,19 @@ TDagTree::TDagTree(LongPoint **ptsHdl, Topology **topHdl, DAG** tree,VelocityFH
 	fVelH = velocityH;
 
 	fNumBranches = nBranches;
+
+	fNumTri = topHdl ? _GetHandleSize((Handle)topHdl)/sizeof(Topology) : 0;
+}
+
+void TDagTree::SetTriHint(long ntri)
+{
+	sTriHint.tree = this;
+	sTriHint.hintTri = sTriHint.lastTri = ntri;
+}
+
+long TDagTree::GetLastTri()
+{
+	return sTriHint.tree == this ? sTriHint.lastTri : -1;
 }
 
 void TDagTree::Dispose ()
@@ -90,10 +122,53 @@ long TDagTree::FindThirdPoint(long p1, long p2, long index)
 // locate the triangle that the point falls within or identify if
 // the point is outside of the boundary (the infinite triangle).
 // RETURNS a negative number if there is an error
+//
+// If a hint is set (SetTriHint), the hinted triangle and its neighbors are
+// checked before the DAG tree. LEs move less than a triangle per step so
+// the triangle an LE was in last step is almost always right or next to it.
+// A triangle is only accepted if the point is strictly inside it, where the
+// answer is unique, so the result is the same as searching the tree.
 //////////////////////////////////////////////////////////////////////
 long TDagTree::WhatTriAmIIn(LongPoint pt)
 {
-	return WhatTriIsPtIn(fTreeH,fTopH,fPtsH,pt);
+	long i, adjTri;
+	long hintTri = (sTriHint.tree == this) ? sTriHint.hintTri : -1;
+
+	if (sTriHint.tree != this)
+	{
+		sTriHint.tree = this;
+		sTriHint.hintTri = -1;
+	}
+
+	if (hintTri >= 0 && hintTri < fNumTri)
+	{
+		if (IsPtInTri(hintTri, pt))
+			return (sTriHint.lastTri = hintTri);
+
+		for (i = 0; i < 3; i++)
+		{
+			// adjTriN is opposite vertexN, see Topology
+			adjTri = (i == 0) ? (*fTopH)[hintTri].adjTri1 :
+					 (i == 1) ? (*fTopH)[hintTri].adjTri2 :
+								(*fTopH)[hintTri].adjTri3;
+			if (adjTri >= 0 && IsPtInTri(adjTri, pt))
+				return (sTriHint.lastTri = adjTri);
+		}
+	}
+
+	sTriHint.lastTri = WhatTriIsPtIn(fTreeH,fTopH,fPtsH,pt);
+	return sTriHint.lastTri;
+}
+
+// The triangles are defined counterclockwise, so a point strictly inside a
+// triangle is to the left of all three sides
+Boolean TDagTree::IsPtInTri(long ntri, LongPoint pt)
+{
+	Topology tri = (*fTopH)[ntri];
+
+	return (Right_or_Left_Point(tri.vertex1, tri.vertex2, pt) == -1 &&
+			Right_or_Left_Point(tri.vertex2, tri.vertex3, pt) == -1 &&
+			Right_or_Left_Point(tri.vertex3, tri.vertex1, pt) == -1);
 }
 
 /////////////////////////////////////////////////////////////////////////////////////////
@@ -43,6 +43,7 @@ class TDagTree
 		TopologyHdl			fTopH;
 		VelocityFH			fVelH;
 		//long**				longH;
+		long				fNumTri;
 
 		int Right_or_Left_Point(long ref_p1, long ref_p2, LongPoint test_p1);
 		long FindThirdPoint(long p1, long p2, long index);
@@ -53,6 +54,9 @@ class TDagTree
 		virtual void 	Dispose();
 
 		long			WhatTriAmIIn(LongPoint pt);
+		Boolean			IsPtInTri(long ntri, LongPoint pt);
+		void			SetTriHint(long ntri);	// checked first by WhatTriAmIIn, -1 for none
+		long			GetLastTri();			// result of the last WhatTriAmIIn or the hint
 		LongPointHdl	GetPointsHdl(){return fPtsH;};
 		TopologyHdl		GetTopologyHdl(){return fTopH;};
 		VelocityFH		GetVelocityHdl(){return fVelH;};
@@ -79,7 +79,7 @@ public:
 			bool 		IsTriangleGrid(){return timeGrid->IsTriangleGrid();}
 			bool 		IsDataOnCells(){return timeGrid->IsDataOnCells();}
 
-			OSErr		get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID);
+			OSErr		get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, int* cell_index = 0);
 
 
 
@@ -70,7 +70,7 @@ public:
 	OSErr			TextRead(char *path,char *topFilePath);
 	OSErr 			ExportTopology(char* path){return timeGrid->ExportTopology(path);}
 
-	OSErr 			get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, double* windages, short* LE_status, LEType spillType, long spill_ID);
+	OSErr 			get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, double* windages, short* LE_status, LEType spillType, long spill_ID, int* cell_index = 0);
 };
 
 #endif
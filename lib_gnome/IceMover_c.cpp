@@ -216,7 +216,7 @@ void IceMover_c::ModelStepIsDone()
 }
 
 
-OSErr IceMover_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
+OSErr IceMover_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, int* cell_index) {
 
 	if(!ref || !delta) {
 		//cout << "worldpoints array not provided! returning.\n";
@@ -237,6 +237,9 @@ OSErr IceMover_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoi
 	
 	WorldPoint3D zero_delta ={0,0,0.};
 	
+	// cell_index is optional, it keeps the grid cell of each LE between steps
+	TDagTree *dagTree = (cell_index && timeGrid) ? timeGrid->GetDagTree() : 0;
+
 	for (int i = 0; i < n; i++) {
 		
 		// only operate on LE if the status is in water
@@ -252,12 +255,19 @@ OSErr IceMover_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoi
 		rec.p.pLat *= 1000000;	
 		rec.p.pLong*= 1000000;
 		
+		// start the grid cell search from the cell the LE was in last step
+		if (dagTree) dagTree->SetTriHint(cell_index[i]);
+
 		delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
 		
+		if (dagTree) cell_index[i] = dagTree->GetLastTri();
+
 		delta[i].p.pLat /= 1000000;
 		delta[i].p.pLong /= 1000000;
 	}
 	
+	if (dagTree) dagTree->SetTriHint(-1);
+
 	return noErr;
 }
 
@@ -62,6 +62,12 @@ void RandomVertical_c::ModelStepIsDone()
 
 OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
 	
+	return get_move(n, model_time, step_len, ref, delta, LE_status, spillType, spill_ID, 0, 0);
+}
+
+// seed != 0 draws from a RandomStream per LE, see Random_c::get_move
+OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, long le_offset, unsigned long seed) {
+	
 	// JS Ques: Is this required? Could cy/python invoke this method without well defined numpy arrays?
 	if(!delta || !ref) {
 		//cout << "worldpoints arrays not provided! returning.\n";
@@ -95,7 +101,13 @@ OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, Wo
 		rec.p.pLat *= 1000000;	
 		rec.p.pLong*= 1000000;
 		
-		delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+		if (seed)
+		{
+			RandomStream stream(seed, le_offset + i);
+			delta[i] = GetMove(step_len, prec, &stream);
+		}
+		else
+			delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
 		
 		delta[i].p.pLat /= 1000000;
 		delta[i].p.pLong /= 1000000;
@@ -111,7 +123,17 @@ double GetDepthAtPoint(WorldPoint p)
 	return depthAtPt;
 }
 
+static float DrawRandomFloat(RandomStream *stream, float low, float high)
+{
+	return stream ? stream->GetFloat(low, high) : GetRandomFloat(low, high);
+}
+
 WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType)
+{
+	return GetMove(timeStep, theLE, NULL);
+}
+
+WorldPoint3D RandomVertical_c::GetMove (Seconds timeStep, LERec *theLE, RandomStream *stream)
 {
 	double	dLong, dLat, z = 0;
 	WorldPoint3D	deltaPoint = {0,0,0.};
@@ -139,7 +161,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		{
 			if (fVerticalDiffusionCoefficient==0) return deltaPoint;	
 			verticalDiffusionCoefficient = sqrt(6.*(fVerticalDiffusionCoefficient/10000.)*timeStep);
-			rand = GetRandomFloat(-1.0, 1.0);
+			rand = DrawRandomFloat(stream, -1.0, 1.0);
 			deltaPoint.z = rand*verticalDiffusionCoefficient;
 			//z = deltaPoint.z;	// will add this on to the next move
 			
@@ -155,7 +177,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 			{
 				deltaPoint.z = mixedLayerDepth - (totalLEDepth - mixedLayerDepth) - (*theLE).z; // reflect about mixed layer depth
 				// check if went above surface and put randomly into mixed layer
-				if ((*theLE).z+deltaPoint.z <= 0) deltaPoint.z = GetRandomFloat(eps,mixedLayerDepth) - (*theLE).z;	
+				if ((*theLE).z+deltaPoint.z <= 0) deltaPoint.z = DrawRandomFloat(stream, eps,mixedLayerDepth) - (*theLE).z;	
 					// or just let it go and deal with it later? then it will go into full water column...
 			}
 		}
@@ -164,7 +186,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		// now apply below mixed layer depth diffusion to all particles above and below
 		if (fVerticalBottomDiffusionCoefficient==0/* && z==0*/) /*return deltaPoint*/goto dochecks;	// don't return until do checks
 		verticalDiffusionCoefficient = sqrt(6.*(fVerticalBottomDiffusionCoefficient/10000.)*timeStep);
-		rand = GetRandomFloat(-1.0, 1.0);
+		rand = DrawRandomFloat(stream, -1.0, 1.0);
 		deltaPoint.z = rand*verticalDiffusionCoefficient;
 		
 		z = z + deltaPoint.z;	// add move to previous move if any
@@ -181,7 +203,7 @@ dochecks:
 			deltaPoint.z = - totalLEDepth - (*theLE).z;	// reflect below surface
 			totalLEDepth = (*theLE).z + deltaPoint.z;
 			if (totalLEDepth > depthAtPoint) 
-				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps) - (*theLE).z;
+				deltaPoint.z = DrawRandomFloat(stream, eps,depthAtPoint-eps) - (*theLE).z;
 			return deltaPoint;
 		}
 		if (totalLEDepth==depthAtPoint) 
@@ -196,7 +218,7 @@ dochecks:
 			totalLEDepth = (*theLE).z + deltaPoint.z;
 			if (totalLEDepth <= 0) 
 				// put randomly into water column
-				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps) - (*theLE).z;
+				deltaPoint.z = DrawRandomFloat(stream, eps,depthAtPoint-eps) - (*theLE).z;
 			return deltaPoint;
 		}
 		else
@@ -15,6 +15,8 @@
 #include "Mover_c.h"
 #include "ExportSymbols.h"
 
+class RandomStream;
+
 class DLL_API RandomVertical_c : virtual public Mover_c {
 	
 public:
@@ -36,9 +38,11 @@ public:
 	
 	
 	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID);
+	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, long le_offset, unsigned long seed);
 
 protected:
 	void				Init();
+	WorldPoint3D		GetMove(Seconds timeStep, LERec *theLE, RandomStream *stream);
 };
 
 #endif
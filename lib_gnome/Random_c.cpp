@@ -61,6 +61,14 @@ void Random_c::ModelStepIsDone()
 
 OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
 	
+	return get_move(n, model_time, step_len, ref, delta, LE_status, spillType, spill_ID, 0, 0);
+}
+
+// seed != 0 draws from a RandomStream per LE, keyed on le_offset + i,
+// instead of the global rand(), so chunks of the arrays can be moved
+// from different threads and still give the same result
+OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, long le_offset, unsigned long seed) {
+	
 	// JS Ques: Is this required? Could cy/python invoke this method without well defined numpy arrays?
 	if(!delta || !ref) {
 		//cout << "worldpoints arrays not provided! returning.\n";
@@ -94,7 +102,13 @@ OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint
 		rec.p.pLat *= 1000000;	// really only need this for the latitude
 		//rec.p.pLong*= 1000000;
 		
-		delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+		if (seed)
+		{
+			RandomStream stream(seed, le_offset + i);
+			delta[i] = GetMove(step_len, prec, spillType, &stream);
+		}
+		else
+			delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
 		
 		delta[i].p.pLat /= 1000000;
 		delta[i].p.pLong /= 1000000;
@@ -104,12 +118,20 @@ OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint
 }
 
 WorldPoint3D Random_c::GetMove (const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType)
+{
+	return GetMove(timeStep, theLE, leType, NULL);
+}
+
+// the per step values are kept in locals so this doesn't write to the mover
+WorldPoint3D Random_c::GetMove (Seconds timeStep, LERec *theLE, LETYPE leType, RandomStream *stream)
 {
 	double		dLong, dLat;
 	WorldPoint3D	deltaPoint = {0,0,0.};
 	WorldPoint refPoint = (*theLE).p;	
 	float rand1,rand2;
 	double 	diffusionCoefficient;
+	double	value = this -> fOptimize.value;
+	double	uncertaintyValue = this -> fOptimize.uncertaintyValue;
 	
 	//if (deltaPoint.z > 0) return deltaPoint;	// only use for surface LEs ?
 	
@@ -131,8 +153,8 @@ WorldPoint3D Random_c::GetMove (const Seconds& model_time, Seconds timeStep,long
 			localDiffusionCoefficient = pow(10.,factor);
 		else
 			localDiffusionCoefficient = 0;
-		this -> fOptimize.value =  sqrt(6.*(localDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
-		this -> fOptimize.uncertaintyValue =  sqrt(fUncertaintyFactor*6.*(localDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
+		value =  sqrt(6.*(localDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
+		uncertaintyValue =  sqrt(fUncertaintyFactor*6.*(localDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
 		/*if (depth<20)
 		 {
 		 localDiffusionCoefficient = 0;
@@ -151,18 +173,26 @@ WorldPoint3D Random_c::GetMove (const Seconds& model_time, Seconds timeStep,long
 	}
 	if(!this->fOptimize.isOptimizedForStep && !bUseDepthDependent)  
 	{
-		this -> fOptimize.value =  sqrt(6.*(fDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
-		this -> fOptimize.uncertaintyValue =  sqrt(fUncertaintyFactor*6.*(fDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
+		value =  sqrt(6.*(fDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
+		uncertaintyValue =  sqrt(fUncertaintyFactor*6.*(fDiffusionCoefficient/10000.)*timeStep)/METERSPERDEGREELAT; // in deg lat
 	}
 	
 	if (leType == UNCERTAINTY_LE)
-		diffusionCoefficient = this -> fOptimize.uncertaintyValue;
+		diffusionCoefficient = uncertaintyValue;
 	else
-		diffusionCoefficient = this -> fOptimize.value;
+		diffusionCoefficient = value;
 	
 	if(this -> fOptimize.isFirstStep)
 	{
-		GetRandomVectorInUnitCircle(&rand1,&rand2);
+		if (stream)
+			stream->GetVectorInUnitCircle(&rand1,&rand2);
+		else
+			GetRandomVectorInUnitCircle(&rand1,&rand2);
+	}
+	else if (stream)
+	{
+		rand1 = stream->GetFloat(-1.0, 1.0);
+		rand2 = stream->GetFloat(-1.0, 1.0);
 	}
 	else
 	{
@@ -267,6 +267,12 @@ TimeGridVel_c::TimeGridVel_c ()
 	memset(&fEndData,0,sizeof(fEndData));
 	fEndData.timeIndex = UNASSIGNEDINDEX;
 	fEndData.dataHdl = 0;
+	memset(&fNextData,0,sizeof(fNextData));
+	fNextData.timeIndex = UNASSIGNEDINDEX;
+	fNextData.dataHdl = 0;
+	fNextDataPath[0] = 0;
+	fNumPrefetchHits = 0;
+	fNumPrefetchStalls = 0;
 	
 	fInputFilesHdl = 0;	// for multiple files case
 	
@@ -291,6 +297,7 @@ void TimeGridVel_c::Dispose ()
 	
 	if(fStartData.dataHdl)DisposeLoadedData(&fStartData); 
 	if(fEndData.dataHdl)DisposeLoadedData(&fEndData);
+	if(fNextData.dataHdl)DisposeLoadedData(&fNextData);
 	
 	if(fInputFilesHdl) {DisposeHandle((Handle)fInputFilesHdl); fInputFilesHdl=0;}
 	
@@ -493,6 +500,7 @@ void TimeGridVel_c::DisposeAllLoadedData()
 {
 	if(fStartData.dataHdl)DisposeLoadedData(&fStartData); 
 	if(fEndData.dataHdl)DisposeLoadedData(&fEndData);
+	if(fNextData.dataHdl)DisposeLoadedData(&fNextData);
 }
 
 void TimeGridVel_c::ClearLoadedData(LoadedData *dataPtr)
@@ -1384,14 +1392,14 @@ OSErr TimeGridVel_c::SetInterval(char *errmsg, const Seconds& model_time)
 		
 		if(fStartData.dataHdl == 0 && indexOfStart >= 0) 
 		{ // start data is not loaded
-			err = this -> ReadTimeData(indexOfStart,&fStartData.dataHdl,errmsg);
+			err = this -> GetTimeData(indexOfStart,&fStartData.dataHdl,errmsg);
 			if(err) goto done;
 			fStartData.timeIndex = indexOfStart;
 		}	
 		
 		if(indexOfEnd < numTimesInFile && indexOfEnd != UNASSIGNEDINDEX)  // not past the last interval and not constant current
 		{
-			err = this -> ReadTimeData(indexOfEnd,&fEndData.dataHdl,errmsg);
+			err = this -> GetTimeData(indexOfEnd,&fEndData.dataHdl,errmsg);
 			if(err) goto done;
 			fEndData.timeIndex = indexOfEnd;
 		}
@@ -1409,6 +1417,96 @@ done:
 }
 
 
+// Same as ReadTimeData, but uses the data read ahead by PrefetchNextTime
+// if it is the time needed.
+OSErr TimeGridVel_c::GetTimeData(long index, VelocityFH *velocityH, char* errmsg)
+{
+	if (fNextData.dataHdl && fNextData.timeIndex == index &&
+		!strcmp(fNextDataPath, fVar.pathName))
+	{
+		*velocityH = fNextData.dataHdl;
+		ClearLoadedData(&fNextData);
+		fNumPrefetchHits++;
+		errmsg[0] = 0;
+		return 0;
+	}
+
+	fNumPrefetchStalls++;
+	return this -> ReadTimeData(index, velocityH, errmsg);
+}
+
+
+// Read the time after the loaded interval into fNextData so the next
+// SetInterval doesn't have to wait on the file. When the end of the
+// interval is the last time in the file, the first time of the next file
+// in the list is read, unless the grid can only read the file it scanned
+// (CanPrefetchFromNextFile). Cycles start over at the first time.
+//
+// This is meant to run on a background thread while the loaded interval
+// is being used. It only changes fNextData, but it borrows fVar.pathName
+// and the file reading code is not thread safe, so it must not run at the
+// same time as SetInterval or anything else that reads files or allocates
+// handles.
+OSErr TimeGridVel_c::PrefetchNextTime(char *errmsg)
+{
+	OSErr err = 0;
+	long i, nextIndex, numFiles = GetNumFiles();
+	char path[kMaxNameLen], loadedPath[kMaxNameLen];
+
+	errmsg[0] = 0;
+
+	if (fEndData.timeIndex == UNASSIGNEDINDEX)
+		return 0;	// constant or extrapolated, nothing comes next
+
+	strcpy(path, fVar.pathName);
+	nextIndex = fEndData.timeIndex + 1;
+
+	if (nextIndex >= GetNumTimesInFile())
+	{
+		nextIndex = UNASSIGNEDINDEX;
+		if (numFiles > 1 && CanPrefetchFromNextFile())
+		{
+			for (i = 0; i < numFiles - 1; i++)
+			{
+				if (!strcmp((*fInputFilesHdl)[i].pathName, fVar.pathName))
+				{
+					strcpy(path, (*fInputFilesHdl)[i + 1].pathName);
+					nextIndex = 0;
+					break;
+				}
+			}
+		}
+		else if (fTimeAlpha >= 0)
+			nextIndex = 0;	// start over, see SetInterval
+	}
+
+	if (nextIndex == UNASSIGNEDINDEX)
+		return 0;
+
+	if (fNextData.dataHdl && fNextData.timeIndex == nextIndex &&
+		!strcmp(fNextDataPath, path))
+		return 0;	// already read
+
+	DisposeLoadedData(&fNextData);
+
+	strcpy(loadedPath, fVar.pathName);
+	strcpy(fVar.pathName, path);
+	err = this -> ReadTimeData(nextIndex, &fNextData.dataHdl, errmsg);
+	strcpy(fVar.pathName, loadedPath);
+
+	if (err)
+	{
+		DisposeLoadedData(&fNextData);
+		return err;
+	}
+
+	fNextData.timeIndex = nextIndex;
+	strcpy(fNextDataPath, path);
+
+	return 0;
+}
+
+
 OSErr TimeGridVel_c::CheckAndScanFile(char *errmsg, const Seconds& model_time)
 {
 	OSErr err = 0;
@@ -1459,7 +1557,7 @@ OSErr TimeGridVel_c::CheckAndScanFile(char *errmsg, const Seconds& model_time)
 				
 				DisposeLoadedData(&fEndData);
 				strcpy(fVar.pathName,(*fInputFilesHdl)[fileNum-1].pathName);
-				err = this->ReadTimeData(GetNumTimesInFile() - 1, &fStartData.dataHdl, errmsg);
+				err = this->GetTimeData(GetNumTimesInFile() - 1, &fStartData.dataHdl, errmsg);
 				if (err)
 					return err;
 			}
@@ -1469,7 +1567,7 @@ OSErr TimeGridVel_c::CheckAndScanFile(char *errmsg, const Seconds& model_time)
 			err = ScanFileForTimes((*fInputFilesHdl)[fileNum].pathName,&fTimeHdl);	
 			
 			strcpy(fVar.pathName,(*fInputFilesHdl)[fileNum].pathName);
-			err = this -> ReadTimeData(0,&fEndData.dataHdl,errmsg);
+			err = this -> GetTimeData(0,&fEndData.dataHdl,errmsg);
 			if(err) return err;
 			fEndData.timeIndex = 0;
 			fOverLap = true;
@@ -1492,7 +1590,7 @@ OSErr TimeGridVel_c::CheckAndScanFile(char *errmsg, const Seconds& model_time)
 				
 				DisposeLoadedData(&fEndData);
 				strcpy(fVar.pathName,(*fInputFilesHdl)[i-1].pathName);
-				err = this->ReadTimeData(GetNumTimesInFile() - 1, &fStartData.dataHdl, errmsg);
+				err = this->GetTimeData(GetNumTimesInFile() - 1, &fStartData.dataHdl, errmsg);
 				if (err)
 					return err;
 			}
@@ -1502,7 +1600,7 @@ OSErr TimeGridVel_c::CheckAndScanFile(char *errmsg, const Seconds& model_time)
 			err = ScanFileForTimes((*fInputFilesHdl)[i].pathName,&fTimeHdl);	
 			
 			strcpy(fVar.pathName,(*fInputFilesHdl)[i].pathName);
-			err = this -> ReadTimeData(0,&fEndData.dataHdl,errmsg);
+			err = this -> GetTimeData(0,&fEndData.dataHdl,errmsg);
 			if(err) return err;
 			fEndData.timeIndex = 0;
 			fOverLap = true;
@@ -1706,6 +1804,15 @@ Seconds TimeGridVel_c::GetStartTimeValue(long index)
 	return time;
 }
 
+// curvilinear and triangle grids locate points with a DAG tree search. The
+// movers set a per LE hint on the tree before each LE - see TDagTree
+TDagTree* TimeGridVel_c::GetDagTree()
+{
+	TTriGridVel *triGrid = dynamic_cast<TTriGridVel*>(fGrid);
+
+	return triGrid ? triGrid->GetDagTree() : 0;
+}
+
 long TimeGridVel_c::GetVelocityIndex(WorldPoint p) 
 {
 	long rowNum, colNum;
@@ -10131,7 +10238,7 @@ OSErr TimeGridCurRect_c::CheckAndScanFile(char *errmsg, const Seconds &model_tim
 				DisposeLoadedData(&fEndData);
 				strcpy(fVar.pathName,(*fInputFilesHdl)[fileNum-1].pathName);
 
-				err = this -> ReadTimeData(GetNumTimesInFile()-1,&fStartData.dataHdl,errmsg);
+				err = this -> GetTimeData(GetNumTimesInFile()-1,&fStartData.dataHdl,errmsg);
 				if (err)
 					return err;
 			}
@@ -10140,7 +10247,7 @@ OSErr TimeGridCurRect_c::CheckAndScanFile(char *errmsg, const Seconds &model_tim
 			DisposeTimeHdl();
 			err = ScanFileForTimes((*fInputFilesHdl)[fileNum].pathName,&fTimeDataHdl,&fTimeHdl);	// AH 07/17/2012
 			strcpy(fVar.pathName,(*fInputFilesHdl)[fileNum].pathName);
-			err = this -> ReadTimeData(0,&fEndData.dataHdl,errmsg);
+			err = this -> GetTimeData(0,&fEndData.dataHdl,errmsg);
 			if(err) return err;
 			fEndData.timeIndex = 0;
 			fOverLap = true;
@@ -10163,7 +10270,7 @@ OSErr TimeGridCurRect_c::CheckAndScanFile(char *errmsg, const Seconds &model_tim
 				DisposeLoadedData(&fEndData);
 				strcpy(fVar.pathName,(*fInputFilesHdl)[i-1].pathName);
 
-				err = this->ReadTimeData(GetNumTimesInFile() - 1, &fStartData.dataHdl, errmsg);
+				err = this->GetTimeData(GetNumTimesInFile() - 1, &fStartData.dataHdl, errmsg);
 				if (err)
 					return err;
 			}
@@ -10173,7 +10280,7 @@ OSErr TimeGridCurRect_c::CheckAndScanFile(char *errmsg, const Seconds &model_tim
 			err = ScanFileForTimes((*fInputFilesHdl)[i].pathName,&fTimeDataHdl,&fTimeHdl);	// AH 07/17/2012
 			if (err) return err;
 			strcpy(fVar.pathName,(*fInputFilesHdl)[i].pathName);
-			err = this -> ReadTimeData(0,&fEndData.dataHdl,errmsg);
+			err = this -> GetTimeData(0,&fEndData.dataHdl,errmsg);
 			if(err) return err;
 			fEndData.timeIndex = 0;
 			fOverLap = true;
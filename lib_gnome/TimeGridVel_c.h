@@ -55,6 +55,10 @@ public:
 	Seconds **fTimeHdl;
 	LoadedData fStartData; 
 	LoadedData fEndData;
+	LoadedData fNextData;	// time after fEndData, read ahead by PrefetchNextTime
+	char fNextDataPath[kMaxNameLen];	// file fNextData was read from
+	long fNumPrefetchHits;	// times GetTimeData found in fNextData
+	long fNumPrefetchStalls;	// times GetTimeData had to read the file
 
 	float fFillValue;
 	//double fFileScaleFactor;	
@@ -124,6 +128,9 @@ public:
 	virtual Boolean 	CheckInterval(long &timeDataInterval, const Seconds& model_time);	
 	virtual OSErr		TextRead(const char *path, const char *topFilePath) {return 0;}
 	virtual OSErr 		ReadTimeData(long index,VelocityFH *velocityH, char* errmsg) {return 0;}
+	OSErr 				GetTimeData(long index,VelocityFH *velocityH, char* errmsg);
+	OSErr 				PrefetchNextTime(char *errmsg);
+	virtual Boolean		CanPrefetchFromNextFile() {return true;}
 	OSErr 				ReadInputFileNames(char *fileNamesPath);
 	//void				SetInputFilesHdl(PtCurFileInfoH inputFilesHdl) {if (fInputFilesHdl) {DisposeHandle((Handle)fInputFilesHdl)} fInputFilesHdl = inputFilesHdl;}
 	virtual	OSErr 		ExportTopology(char* path) {return 0;}
@@ -137,6 +144,8 @@ public:
 
 	virtual	bool 		IsTriangleGrid(){return false;}
 	virtual	bool 		IsDataOnCells(){return true;}
+
+	TDagTree*			GetDagTree();	// for the cell search, 0 for regular grids
 };
 
 
@@ -366,6 +375,9 @@ public:
 
 	virtual void		DisposeTimeHdl();
 	virtual OSErr 		CheckAndScanFile(char *errmsg, const Seconds& model_time);	
+	// ReadTimeData uses the offsets in fTimeDataHdl, which are only known
+	// for the file that was last scanned
+	virtual Boolean		CanPrefetchFromNextFile() {return false;}
 	virtual OSErr		GetStartTime(Seconds *startTime);	// switch this to GetTimeValue
 	virtual OSErr		GetEndTime(Seconds *endTime);
 
@@ -11,6 +11,7 @@ import unit_conversion as uc
 from oil_library.models import Oil, Density, DBSession
 from oil_library.mock_oil import sample_oil_to_mock_oil
 from oil_library.oil_props import OilProps
+from oil_library.catalog import OilCatalog
 
 
 # Some standard oils - scope is module level, non-public
@@ -145,6 +146,19 @@ def _get_db_session():
     return session
 
 
+# process-wide catalog of the database oils
+_catalog = OilCatalog(_get_db_session)
+
+
+def get_oil_catalog():
+    '''
+    returns the process-wide OilCatalog. It caches the Oil objects returned
+    by get_oil() and provides indexed lookup of the oils in the database by
+    name, API range and category
+    '''
+    return _catalog
+
+
 def get_oil(oil_, max_cuts=None):
     """
     function returns the Oil object given the name of the oil as a string.
@@ -188,23 +202,10 @@ def get_oil(oil_, max_cuts=None):
         '''
         db_file should exist - if it doesn't then create if first
         should we raise error here?
+        The catalog keeps recently used oils so we only query the database
+        the first time an oil is requested
         '''
-        session = _get_db_session()
-
-        try:
-            oil = session.query(Oil).filter(Oil.name == oil_).one()
-            oil.densities
-            oil.kvis
-            oil.cuts
-            oil.sara_fractions
-            oil.sara_densities
-            oil.molecular_weights
-            return oil
-        except NoResultFound, ex:
-            ex.message = ("oil with name '{0}', not found in database.  "
-                          "{1}".format(oil_, ex.message))
-            ex.args = (ex.message, )
-            raise ex
+        return _catalog.get_oil(oil_)
 
 
 def prune_db_ids(oil_):
@@ -0,0 +1,199 @@
+'''
+In-memory catalog of the oils in the OilLib database
+
+The catalog keeps:
+
+- a compact, read-only record (name, api, categories) for every oil in the
+  database, indexed by name, API and category. The records are loaded with
+  a single pass over the database the first time they are needed.
+- an LRU of the data of recently used oils so repeated get_oil() calls for
+  the same handful of oils do not go back to the database. Each call builds
+  a new Oil object from the cached data.
+
+There is one process-wide catalog - see oil_library.get_oil_catalog()
+'''
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from threading import Lock
+
+from repoze.lru import LRUCache
+from sqlalchemy.orm.exc import NoResultFound
+
+from .models import Oil, ImportedRecord, Category, oil_to_category
+
+
+OilRecord = namedtuple('OilRecord', ['name', 'api', 'categories'])
+
+
+def category_path(category):
+    '''
+    name of the category including its parents, separated by '-'.
+    eg. 'Crude-Medium'
+    '''
+    names = []
+    while category is not None:
+        names.insert(0, category.name)
+        category = category.parent
+
+    return '-'.join(names)
+
+
+class OilCatalog(object):
+    '''
+    process-wide read-only catalog of the OilLib database
+    '''
+    def __init__(self, get_session, max_oils=32):
+        '''
+        :param get_session: callable that returns a database session
+        :param max_oils: number of oils whose data is kept in the LRU
+        '''
+        self._get_session = get_session
+        self._oils = LRUCache(max_oils)
+
+        self._lock = Lock()
+        self._records = None
+        self._by_api = None
+        self._by_category = None
+
+    def clear(self):
+        '''
+        drop the cached oil data and the record indexes. Use this if the
+        database is modified in this process
+        '''
+        with self._lock:
+            self._oils.clear()
+            self._records = None
+            self._by_api = None
+            self._by_category = None
+
+    def get_oil(self, name):
+        '''
+        return a new, fully loaded Oil object with this name. Raises
+        NoResultFound if it is not in the database
+
+        The Oil is not attached to a database session, so it stays usable
+        after the transaction ends, and callers may modify it without
+        affecting other callers.
+        '''
+        data = self._oils.get(name)
+        if data is None:
+            data = self._load_oil(name)
+            self._oils.put(name, data)
+
+        oil_json, imported_json = data
+
+        oil = Oil.from_json(oil_json)
+        if imported_json is not None:
+            oil.imported = ImportedRecord(**imported_json)
+
+        return oil
+
+    def _load_oil(self, name):
+        '''
+        returns (oil_json, imported_json) - the plain data of the oil with
+        this name and the columns of its imported record
+        '''
+        session = self._get_session()
+
+        try:
+            oil = session.query(Oil).filter(Oil.name == name).one()
+        except NoResultFound, ex:
+            ex.message = ("oil with name '{0}', not found in database.  "
+                          "{1}".format(name, ex.message))
+            ex.args = (ex.message, )
+            raise ex
+
+        # the session is thread scoped and it is expired and closed when the
+        # transaction ends, so only plain data is cached.  The imported
+        # record is used by OilProps.get()
+        if oil.imported is not None:
+            imported_json = oil.imported.columnitems(recurse=0)
+        else:
+            imported_json = None
+
+        return oil.tojson(), imported_json
+
+    @property
+    def records(self):
+        '''
+        dict of OilRecord objects keyed by oil name
+        '''
+        if self._records is None:
+            self._load_records()
+
+        return self._records
+
+    def get_record(self, name):
+        '''
+        return the OilRecord for this name or None if it is not in the
+        database
+        '''
+        return self.records.get(name)
+
+    def query(self, name=None, api_min=None, api_max=None, category=None):
+        '''
+        return the OilRecords, sorted by name, that match all the given
+        criteria
+
+        :param name: case insensitive substring of the oil name
+        :param api_min: minimum API, inclusive
+        :param api_max: maximum API, inclusive
+        :param category: category path like 'Crude' or 'Crude-Medium'
+        '''
+        records = self.records
+
+        if api_min is not None or api_max is not None:
+            apis, names = self._by_api
+            lo = 0 if api_min is None else bisect_left(apis, api_min)
+            hi = len(apis) if api_max is None else bisect_right(apis, api_max)
+            found = set(names[lo:hi])
+        else:
+            found = None
+
+        if category is not None:
+            in_category = self._by_category.get(category, frozenset())
+            found = (in_category if found is None
+                     else found.intersection(in_category))
+
+        if found is None:
+            found = records.iterkeys()
+
+        if name is not None:
+            name = name.lower()
+            found = [n for n in found if name in n.lower()]
+
+        return [records[n] for n in sorted(found)]
+
+    def _load_records(self):
+        with self._lock:
+            if self._records is not None:
+                return
+
+            session = self._get_session()
+
+            oil_categories = {}
+            for oil_id, cat in (session.query(oil_to_category.c.oil_id,
+                                              Category)
+                                .join(Category,
+                                      Category.id ==
+                                      oil_to_category.c.category_id)):
+                path = category_path(cat)
+                oil_categories.setdefault(oil_id, set()).update(
+                    (path, path.split('-')[0]))
+
+            records = {}
+            by_category = {}
+            for oil_id, name, api in session.query(Oil.id, Oil.name, Oil.api):
+                cats = frozenset(oil_categories.get(oil_id, ()))
+                records[name] = OilRecord(name, api, cats)
+
+                for c in cats:
+                    by_category.setdefault(c, set()).add(name)
+
+            with_api = sorted((r.api, r.name) for r in records.itervalues()
+                              if r.api is not None)
+
+            self._by_api = ([a for a, n in with_api], [n for a, n in with_api])
+            self._by_category = dict((c, frozenset(names))
+                                     for c, names in by_category.iteritems())
+            self._records = records
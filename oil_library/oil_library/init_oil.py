@@ -6,8 +6,16 @@
     with the Oil object.  This is where we will place the estimated oil
     properties.
 '''
+import sys
+import time
 from math import log, log10, exp, fabs
+from itertools import imap, islice
+from multiprocessing import Pool
+
 import transaction
+from sqlalchemy import create_engine, case
+from sqlalchemy.orm import sessionmaker
+from zope.sqlalchemy import mark_changed
 
 import numpy as np
 
@@ -42,28 +50,182 @@ class OilRejected(Exception):
                                                  self.message)
 
 
-def process_oils(session_class):
+# Oil relationships that are populated by add_oil()
+_oil_children = ('densities', 'kvis', 'cuts',
+                 'sara_fractions', 'sara_densities', 'molecular_weights')
+
+# sessionmaker used by the process_oils() pool workers
+_worker_session = None
+
+
+def process_oils(session_class, processes=None, batch_size=100):
+    '''
+    Estimate an Oil object for every ImportedRecord in the database.
+
+    The estimations are done in a pool of worker processes, each with its
+    own connection to the database. The workers only read - they return the
+    estimated oils as plain rows, which are inserted here in batches of
+    batch_size oils per transaction. Rejected records are reported and
+    skipped.
+
+    :param session_class: the session class used to write the oils
+    :param processes: number of worker processes. Defaults to the number of
+        cpus. If 1, the estimations are done in this process.
+    :param batch_size: number of oils committed per transaction
+    '''
     session = session_class()
     record_ids = [r.adios_oil_id for r in session.query(ImportedRecord)]
+    db_url = str(session.get_bind().url)
     session.close()
 
     print '\nAdding Oil objects...'
-    for record_id in record_ids:
-        # Note: committing our transaction for every record slows the
-        #       import job significantly.  But this is necessary if we
-        #       want the option of rejecting oil records.
-        session = session_class()
-        transaction.begin()
-        rec = (session.query(ImportedRecord)
-               .filter(ImportedRecord.adios_oil_id == record_id)
-               .one())
-
-        try:
-            add_oil(rec)
+    pool = None
+    if processes == 1:
+        _init_worker(db_url)
+        results = imap(_estimate_oil, record_ids)
+    else:
+        pool = Pool(processes, _init_worker, (db_url,))
+        results = pool.imap(_estimate_oil, record_ids, chunksize=8)
+
+    start = time.time()
+    added = rejected = 0
+
+    try:
+        while True:
+            batch = list(islice(results, batch_size))
+            if not batch:
+                break
+
+            session = session_class()
+            transaction.begin()
+
+            oils = []
+            for rows, error in batch:
+                if error is not None:
+                    print error
+                    rejected += 1
+                else:
+                    oils.append(rows)
+
+            _add_oil_rows(session, oils)
+            added += len(oils)
+
             transaction.commit()
-        except OilRejected as e:
-            print repr(e)
-            transaction.abort()
+
+            done = added + rejected
+            elapsed = time.time() - start
+            sys.stderr.write('{0}/{1} records processed in {2:.1f}s '
+                             '({3:.1f} records/s)\n'
+                             .format(done, len(record_ids), elapsed,
+                                     done / elapsed if elapsed else 0.0))
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    print ('finished!!!  {0} oils added, {1} records rejected in {2:.1f}s.'
+           .format(added, rejected, time.time() - start))
+
+
+def _init_worker(db_url):
+    '''
+    pool initializer - each worker needs its own engine
+    '''
+    global _worker_session
+    _worker_session = sessionmaker(bind=create_engine(db_url))
+
+
+def _estimate_oil(record_id):
+    '''
+    Run in a pool worker. Estimates the Oil for the imported record and
+    returns (rows, None) where rows is the oil as plain data that can be
+    sent back to the parent process (see _oil_to_rows), or (None, error) if
+    the record is rejected. Nothing is written to the database.
+    '''
+    session = _worker_session()
+
+    try:
+        with session.no_autoflush:
+            rec = (session.query(ImportedRecord)
+                   .filter(ImportedRecord.adios_oil_id == record_id)
+                   .one())
+
+            try:
+                add_oil(rec)
+            except OilRejected as e:
+                return None, repr(e)
+
+            rows = _oil_to_rows(rec.oil)
+            rows['oil']['imported_record_id'] = rec.id
+
+            return rows, None
+    finally:
+        session.rollback()
+        session.close()
+
+
+def _columns(obj, exclude=('id',)):
+    return dict((c, getattr(obj, c)) for c in obj.columns
+                if c not in exclude)
+
+
+def _oil_to_rows(oil):
+    '''
+    The oil's columns, its estimated flags and its child rows. Children that
+    already exist in the database (eg. densities shared with the imported
+    record) are referenced by their id.
+    '''
+    rows = {'oil': _columns(oil, ('id', 'estimated_id')),
+            'estimated': _columns(oil.estimated)}
+
+    for rel in _oil_children:
+        rows[rel] = [c.id if c.id is not None
+                     else _columns(c, ('id', 'oil_id'))
+                     for c in getattr(oil, rel)]
+
+    return rows
+
+
+def _add_oil_rows(session, batch):
+    '''
+    insert a batch of oils, as returned by the workers, without building
+    the ORM objects. Each table gets one bulk insert per batch, and the
+    children that already exist in the database get their oil_id with one
+    UPDATE per table.
+    '''
+    if not batch:
+        return
+
+    estimated = [dict(rows['estimated']) for rows in batch]
+    session.bulk_insert_mappings(Estimated, estimated, return_defaults=True)
+
+    oils = [dict(rows['oil'], estimated_id=est['id'])
+            for rows, est in zip(batch, estimated)]
+    session.bulk_insert_mappings(Oil, oils, return_defaults=True)
+
+    for rel in _oil_children:
+        cls = Oil.__mapper__.relationships[rel].mapper.class_
+        new_rows = []
+        shared = {}
+
+        for rows, oil in zip(batch, oils):
+            for row in rows[rel]:
+                if isinstance(row, dict):
+                    new_rows.append(dict(row, oil_id=oil['id']))
+                else:
+                    shared[row] = oil['id']
+
+        if new_rows:
+            session.bulk_insert_mappings(cls, new_rows)
+
+        if shared:
+            table = cls.__table__
+            session.execute(table.update()
+                            .where(table.c.id.in_(shared.keys()))
+                            .values(oil_id=case(shared, value=table.c.id)))
+
+    # the session doesn't see the bulk writes - make sure they are committed
+    mark_changed(session)
 
 
 def add_oil(record):
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 
 import transaction
 from sqlalchemy import engine_from_config
@@ -28,7 +29,13 @@ def initialize_sql(settings):
     Base.metadata.create_all(engine)
 
 
-def load_database(settings):
+def load_database(settings, processes=None):
+    '''
+    :param processes: number of worker processes used to estimate the oils.
+        See init_oil.process_oils()
+    '''
+    start = time.time()
+
     with transaction.manager:
         # -- Our loading routine --
         session = DBSession()
@@ -61,19 +68,27 @@ def load_database(settings):
 
             rowcount += 1
 
-        print 'finished!!!  {0} rows processed.'.format(rowcount)
+        print ('finished!!!  {0} rows processed in {1:.1f}s.'
+               .format(rowcount, time.time() - start))
         session.close()
 
-        # we need to open a session for each record here because we want
-        # the option of transactionally rolling back rejected records.
-        # So we just pass the session class instead of an open session.
-        process_oils(DBSession)
+    # The imported records need to be committed before the oils are
+    # processed since the process_oils() workers read them with their own
+    # database connections.
+    # We commit the oils in batches so we just pass the session class
+    # instead of an open session.
+    oils_start = time.time()
+    process_oils(DBSession, processes)
+    print 'oils processed in {0:.1f}s.'.format(time.time() - oils_start)
 
+    with transaction.manager:
         session = DBSession()
         process_categories(session)
 
+    print 'database built in {0:.1f}s.'.format(time.time() - start)
+
 
-def make_db(oillib_file=None, db_file=None):
+def make_db(oillib_file=None, db_file=None, processes=None):
     '''
     Entry point for console_script installed by setup
     '''
@@ -90,7 +105,7 @@ def make_db(oillib_file=None, db_file=None):
                 'oillib.file': oillib_file}
     try:
         initialize_sql(settings)
-        load_database(settings)
+        load_database(settings, processes)
     except:
         print "FAILED TO CREATED OIL LIBRARY DATABASE \n"
         raise
@@ -11,13 +11,17 @@ object used to initialize and OilProps object
 Not sure at present if this needs to be serializable?
 '''
 import copy
+from collections import OrderedDict
 from itertools import groupby, chain
 
-from repoze.lru import lru_cache
 import numpy as np
 
 import unit_conversion as uc
-from .utilities import get_density, get_viscosity
+from .utilities import (get_density,
+                        get_viscosity,
+                        get_pour_point,
+                        get_density_table,
+                        get_viscosity_table)
 from .models import Oil
 
 
@@ -28,6 +32,18 @@ sara_dtype = np.dtype([('type', 'S16'),
                        ('density', np.float64)])
 
 
+def _memo_key(value):
+    '''
+    hashable key for a property evaluation argument. Scalars key on their
+    value; lists, tuples and ndarrays key on their shape and contents
+    '''
+    if value is None or np.isscalar(value):
+        return value
+
+    value = np.asarray(value, dtype=float)
+    return (value.shape, value.tostring())
+
+
 class OilProps(object):
     '''
     Class which:
@@ -46,7 +62,13 @@ class OilProps(object):
 
     Viscosity:
 
+    Property evaluations (density, viscosity, vapor pressure) are memoized
+    per instance keyed on their temperature/pressure arguments. Unlike
+    lru_cache, this also works for ndarray inputs. Returned arrays are
+    read-only since they are shared by subsequent calls.
     '''
+    # max number of property evaluations kept in the memo
+    _memo_max = 16
 
     def __init__(self, oil_):
         '''
@@ -68,6 +90,13 @@ class OilProps(object):
         # the boiling points are in ascending order
         self._init_sara()
 
+        # pack the reference densities and viscosities once - they are
+        # used on every get_density()/get_viscosity() evaluation
+        self._density_table = get_density_table(self._r_oil)
+        self._kvis_table = get_viscosity_table(self._r_oil)
+        self._init_kvis_max()
+        self._memo = OrderedDict()
+
         # set molecular weights
         self.molecular_weight = None
         self._component_mw()
@@ -96,31 +125,87 @@ class OilProps(object):
 
         return val
 
-    @lru_cache(2)
+    def _memoized(self, name, func, *args):
+        '''
+        return func(*args), evaluated at most once for a given set of args
+        while it stays in the memo. The memo is bounded to _memo_max entries
+        and the least recently used evaluation is dropped first.
+        '''
+        key = (name,) + tuple(_memo_key(a) for a in args)
+
+        try:
+            val = self._memo.pop(key)
+        except KeyError:
+            val = func(*args)
+            if isinstance(val, np.ndarray):
+                val.setflags(write=False)
+
+            if len(self._memo) >= self._memo_max:
+                self._memo.popitem(last=False)
+
+        self._memo[key] = val
+        return val
+
     def get_density(self, temp=None, out=None):
         '''
         return density at a temperature
         do we want to do any unit conversions here?
-        todo: memoize function
+
+        If out is given, the result is written into it and the memo is
+        bypassed.
 
         :param temp: temperature in Kelvin. Could be an ndarray, list or scalar
         :type temp: scalar, list, tuple or ndarray - assumes it is in Kelvin
         '''
-        if temp:
-            return get_density(self._r_oil, temp, out)
-        else:
-            return uc.convert('density', 'API', 'kg/m^3', self.api)
+        if temp is None:
+            return self._memoized('api_density', uc.convert,
+                                  'density', 'API', 'kg/m^3', self.api)
+
+        if out is not None:
+            return get_density(self._r_oil, temp, out,
+                               ref_table=self._density_table)
+
+        return self._memoized('density', self._density_at, temp)
+
+    def _density_at(self, temp):
+        return get_density(self._r_oil, temp, ref_table=self._density_table)
 
-    @lru_cache(2)
     def get_viscosity(self, temp=288.15, out=None):
         '''
         return viscosity at a temperature, default is viscosity at 15degC
-        todo: memoize function
+
+        If out is given, the result is written into it and the memo is
+        bypassed.
 
         :param temp: temperature in Kelvin. Could be an ndarray, list or scalar
         :type temp: scalar, list, tuple or ndarray - assumes it is in Kelvin
         '''
-        return get_viscosity(self._r_oil, temp, out)
+        if out is not None:
+            return get_viscosity(self._r_oil, temp, out,
+                                 ref_table=self._kvis_table,
+                                 pour_point=self._pour_point,
+                                 v_max=self._kvis_max)
+
+        return self._memoized('viscosity', self._viscosity_at, temp)
+
+    def _viscosity_at(self, temp):
+        return get_viscosity(self._r_oil, temp, ref_table=self._kvis_table,
+                             pour_point=self._pour_point,
+                             v_max=self._kvis_max)
+
+    def _init_kvis_max(self):
+        '''
+        the pour point and the viscosity at the pour point, which
+        get_viscosity() clips to below the pour point. Like the reference
+        tables, they are looked up once instead of on every evaluation
+        '''
+        self._pour_point = get_pour_point(self._r_oil)
+        self._kvis_max = None
+
+        if self._r_oil.kvis:
+            self._kvis_max = get_viscosity(self._r_oil, self._pour_point,
+                                           clip_to_vmax=False,
+                                           ref_table=self._kvis_table)
 
     @property
     def bulltime(self):
@@ -191,13 +276,15 @@ class OilProps(object):
     def component_density(self):
         return self._sara['density']
 
-    @lru_cache(2)
     def vapor_pressure(self, temp, atmos_pressure=101325.0):
         '''
         water_temp and boiling point units are Kelvin
         returns the vapor_pressure in SI units (Pascals)
-        todo: memoize function
         '''
+        return self._memoized('vapor_pressure', self._vapor_pressure,
+                              temp, atmos_pressure)
+
+    def _vapor_pressure(self, temp, atmos_pressure):
         D_Zb = 0.97
         R_cal = 1.987  # calories
 
@@ -231,6 +318,10 @@ class OilProps(object):
         cannot just do self.__dict__ == other.__dict__ since
         '''
         for key, val in self.__dict__.iteritems():
+            if key == '_memo':
+                # cached evaluations, derived from the other attributes
+                continue
+
             o_val = other.__dict__[key]
             if isinstance(val, np.ndarray):
                 if np.any(val != o_val):
@@ -281,6 +372,9 @@ class OilProps(object):
             after initialization, the two objects should be equal
             '''
             for attr in c_op.__dict__:
+                if attr == '_memo':
+                    continue
+
                 if getattr(self, attr) != getattr(c_op, attr):
                     setattr(c_op, attr,
                             copy.deepcopy(getattr(self, attr), memo))
@@ -9,10 +9,13 @@ np = numpy
 import pytest
 from pytest import raises
 
+import transaction
+
 import unit_conversion as uc
 
-from oil_library import get_oil_props, get_oil
-from oil_library.utilities import get_density
+from oil_library import get_oil_props, get_oil, get_oil_catalog
+from oil_library.utilities import (get_density, get_viscosity,
+                                   get_pour_point)
 
 from sqlalchemy.orm.exc import NoResultFound
 
@@ -48,6 +51,73 @@ def test_get_oil_props(search, isNone):
         op = get_oil_props(search)
         assert op is not None
 
+
+def test_oil_catalog():
+    '''
+    get_oil() returns a new Oil object built from the cached data for
+    repeated calls and the catalog index agrees with the database records
+    '''
+    name = 'LUCKENBACH FUEL OIL'
+    oil = get_oil(name)
+    assert get_oil(name) is not oil
+    assert get_oil(name).tojson() == oil.tojson()
+
+    # changes to one caller's oil do not change the cached data
+    oil.api = -1.
+    assert get_oil(name).api != -1.
+
+    catalog = get_oil_catalog()
+    rec = catalog.get_record(name)
+    assert rec.name == name
+    assert np.isclose(rec.api, get_oil(name).api)
+    assert catalog.get_record('test') is None
+
+    found = catalog.query(api_min=rec.api, api_max=rec.api)
+    assert rec in found
+    assert all(r.api == rec.api for r in found)
+
+    assert rec in catalog.query(name='luckenbach')
+
+    for r in catalog.query(category='Crude', api_max=30.):
+        assert 'Crude' in r.categories
+        assert r.api <= 30.
+
+
+def test_oil_catalog_after_commit():
+    '''
+    the Oil objects are still usable after the transaction that loaded
+    them ends
+    '''
+    name = 'LUCKENBACH FUEL OIL'
+    get_oil_catalog().clear()
+
+    oil = get_oil(name)
+    transaction.commit()
+
+    for o in (oil, get_oil(name)):
+        assert o.api > 0
+        assert len(o.densities) > 0
+        assert all(d.kg_m_3 > 0 for d in o.densities)
+        assert o.imported is not None
+
+
+def test_oil_props_tojson_from_catalog():
+    '''
+    serializing OilProps for an oil from the database works every time, also
+    after the transaction that loaded it ends
+    '''
+    name = 'LUCKENBACH FUEL OIL'
+    get_oil_catalog().clear()
+
+    op = get_oil_props(name)
+    json_ = op.tojson()
+    transaction.commit()
+
+    assert get_oil_props(name).tojson() == json_
+    assert op.tojson() == json_
+    assert get_oil_props(name) == op
+
+
 # just double check values for _sample_oil are entered correctly
 
 oil_density_units = [
@@ -117,6 +187,45 @@ class TestProperties:
         assert np.allclose(self.op.mass_fraction.sum(), 1.0)
 
 
+def test_property_memo():
+    '''
+    property evaluations are memoized for scalar and array temperatures and
+    match the un-memoized utility functions
+    '''
+    op = get_oil_props(u'ALASKA NORTH SLOPE (MIDDLE PIPELINE)')
+    temps = np.array([270., 280., 288.15, 300.])
+
+    dens = op.get_density(temps)
+    assert op.get_density(temps) is dens
+    assert op.get_density(temps.tolist()) is dens
+    assert np.allclose(dens, get_density(op._r_oil, temps))
+    with raises(ValueError):
+        dens[0] = 0.
+
+    out = np.zeros_like(temps)
+    assert op.get_density(temps, out) is out
+    assert np.all(out == dens)
+
+    assert op.get_viscosity(temps) is op.get_viscosity(temps)
+    assert op.get_viscosity(288.15) == op.get_viscosity()
+
+    # the pour point and its viscosity are looked up once, and clip the
+    # same way as the utility function
+    temps = np.array([get_pour_point(op._r_oil) - 10., 288.15, 300.])
+    assert np.all(op.get_viscosity(temps) ==
+                  get_viscosity(op._r_oil, temps))
+    assert op.get_viscosity(temps)[0] == op._kvis_max
+
+    vp = op.vapor_pressure(288.15)
+    assert op.vapor_pressure(288.15) is vp
+    assert op.vapor_pressure(288.15, 100000.) is not vp
+
+    for t in np.linspace(270., 300., op._memo_max + 1):
+        op.get_density(t)
+
+    assert len(op._memo) == op._memo_max
+
+
 def test_eq():
     op = get_oil_props('ARABIAN MEDIUM, PHILLIPS')
     op1 = get_oil_props('ARABIAN MEDIUM, PHILLIPS')
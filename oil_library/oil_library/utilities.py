@@ -6,7 +6,7 @@ from math import log
 import numpy as np
 
 
-def get_density(oil, temp, out=None):
+def get_density(oil, temp, out=None, ref_table=None):
     '''
     Given an oil object and temperatures at which density is desired, this
     returns the density at temp. User can provide an array of temps. This
@@ -15,58 +15,54 @@ def get_density(oil, temp, out=None):
     Following numpy convention, if out is provided, the function writes the
     result into it, and returns a reference to out. out must be the same
     shape as temp
+
+    ref_table is an optional packed reference table as returned by
+    get_density_table(). Callers that evaluate the density repeatedly can
+    build it once instead of re-reading the oil.densities records every call
     '''
-    if hasattr(oil, '_r_oil'):
-        oil = oil._r_oil
+    if ref_table is None:
+        ref_table = get_density_table(oil)
 
     # convert to numpy array if it isn't already one
     temp = np.asarray(temp, dtype=float)
     # make 0-d array into 1-D array
     temp = (temp, temp.reshape(-1))[temp.shape == ()]
 
-    # convert ref_temp and ref_densities to numpy array
-    ref_temp = np.asarray([d.ref_temp_k for d in oil.densities], dtype=float)
-    d_ref = np.asarray([d.kg_m_3 for d in oil.densities], dtype=float)
-
-    # Change shape to row or column vector for reference temps and densities
-    # and also define the axis over which we'll look for argmin()
-    if len(temp.shape) == 1 or temp.shape[0] == 1:
-        inv_shape = (len(ref_temp), -1)
-        axis = 0
-    else:
-        inv_shape = (-1,)
-        ref_temp = ref_temp.reshape(len(ref_temp), -1)
-        d_ref = d_ref.reshape(len(d_ref), -1)
-        axis = 1
-
-    # Now, use following to create a matrix:
-    #    np.abs(temp - ref_temp.reshape(inv_shape))
-    #
-    # look for argmin in each row (or column) depending on shape of 'temp'
-    # This is index where abs(ref_temp[near_idx[ix]] - temp[ix]) is minimum
-    near_idx = np.abs(temp - ref_temp.reshape(inv_shape)).argmin(axis)
+    ref_temp, d_ref = _nearest_reference(temp, ref_table)
 
     k_p1 = 0.008
 
     if out is None:
         out = np.zeros_like(temp)
 
-    out[:] = d_ref[near_idx] / (1 - k_p1 * (ref_temp[near_idx] - temp))
+    out[:] = d_ref / (1 - k_p1 * (ref_temp - temp))
 
     return (out, out[0])[len(out) == 1]
 
 
-def get_viscosity(oil, temp, out=None, clip_to_vmax=True):
+def get_viscosity(oil, temp, out=None, clip_to_vmax=True, ref_table=None,
+                  pour_point=None, v_max=None):
     '''
         The Oil object has a list of kinematic viscosities at empirically
         measured temperatures.  We need to use the ones closest to our
         current temperature and calculate our viscosity from it.
         - oil always contains at least one element in the oil.kvis list
+
+        ref_table is an optional packed reference table as returned by
+        get_viscosity_table()
+
+        pour_point and v_max are optional precomputed values for the
+        clip_to_vmax step, as returned by get_pour_point() and
+        get_viscosity(oil, pour_point, clip_to_vmax=False). If they are not
+        given, they are looked up on the oil every call
     '''
     if not oil.kvis:
         # looks like we have one record - 1255, that does not have kvis
         return None
 
+    if ref_table is None:
+        ref_table = get_viscosity_table(oil)
+
     k_v2 = 5000.0
 
     # convert to numpy array if it isn't already one
@@ -74,11 +70,66 @@ def get_viscosity(oil, temp, out=None, clip_to_vmax=True):
     # make 0-d array into 1-D array
     temp = (temp, temp.reshape(-1))[temp.shape == ()]
 
-    # convert ref_temp and ref_densities to numpy array
-    ref_temp = np.asarray([v.ref_temp_k for v in oil.kvis], dtype=float)
-    v_ref = np.asarray([v.m_2_s for v in oil.kvis], dtype=float)
+    ref_temp, v_ref = _nearest_reference(temp, ref_table)
+
+    if out is None:
+        out = np.zeros_like(temp)
+
+    # now the actual computation
+    out[:] = v_ref * np.exp(k_v2 / temp - k_v2 / ref_temp)
+
+    if clip_to_vmax:
+        if pour_point is None:
+            pour_point = get_pour_point(oil)
+
+        if v_max is None:
+            v_max = get_viscosity(oil, pour_point, clip_to_vmax=False,
+                                  ref_table=ref_table)
+
+        out[np.where(temp < pour_point)] = v_max
+
+    return (out, out[0])[len(out) == 1]
+
+
+# packed (ref_temp, value) table of reference measurements
+ref_table_dtype = np.dtype([('ref_temp', np.float64),
+                            ('value', np.float64)])
+
+
+def get_density_table(oil):
+    '''
+    pack the oil's reference densities into a ref_table_dtype array:
+    (ref_temp_k, kg_m_3)
+    '''
+    if hasattr(oil, '_r_oil'):
+        oil = oil._r_oil
+
+    return np.asarray([(d.ref_temp_k, d.kg_m_3) for d in oil.densities],
+                      dtype=ref_table_dtype)
+
+
+def get_viscosity_table(oil):
+    '''
+    pack the oil's reference kinematic viscosities into a ref_table_dtype
+    array: (ref_temp_k, m_2_s)
+    '''
+    if hasattr(oil, '_r_oil'):
+        oil = oil._r_oil
+
+    return np.asarray([(v.ref_temp_k, v.m_2_s) for v in oil.kvis],
+                      dtype=ref_table_dtype)
+
+
+def _nearest_reference(temp, ref_table):
+    '''
+    For each temperature in temp, find the reference measurement measured
+    at the nearest temperature. Returns the (ref_temp, value) arrays that
+    line up with temp.
+    '''
+    ref_temp = ref_table['ref_temp']
+    ref_val = ref_table['value']
 
-    # Change shape to row or column vector for reference temps and densities
+    # Change shape to row or column vector for reference temps and values
     # and also define the axis over which we'll look for argmin()
     if len(temp.shape) == 1 or temp.shape[0] == 1:
         inv_shape = (len(ref_temp), -1)
@@ -86,7 +137,7 @@ def get_viscosity(oil, temp, out=None, clip_to_vmax=True):
     else:
         inv_shape = (-1,)
         ref_temp = ref_temp.reshape(len(ref_temp), -1)
-        v_ref = v_ref.reshape(len(v_ref), -1)
+        ref_val = ref_val.reshape(len(ref_val), -1)
         axis = 1
 
     # Now, use following to create a matrix:
@@ -96,19 +147,7 @@ def get_viscosity(oil, temp, out=None, clip_to_vmax=True):
     # This is index where abs(ref_temp[near_idx[ix]] - temp[ix]) is minimum
     near_idx = np.abs(temp - ref_temp.reshape(inv_shape)).argmin(axis)
 
-    if out is None:
-        out = np.zeros_like(temp)
-
-    # now the actual computation
-    out[:] = v_ref[near_idx] * np.exp(k_v2 / temp - k_v2 / ref_temp[near_idx])
-
-    if clip_to_vmax:
-        pour_point = get_pour_point(oil)
-        v_max = get_viscosity(oil, pour_point, clip_to_vmax=False)
-
-        out[np.where(temp < pour_point)] = v_max
-
-    return (out, out[0])[len(out) == 1]
+    return ref_temp[near_idx], ref_val[near_idx]
 
 
 def get_pour_point(oil):
@@ -243,6 +243,14 @@ _default_values = {'positions': ((3,), world_point_type, 'positions',
                                         0.),
                    'age': ((), np.int32, 'age', 0),
 
+                   # grid cell the LE was found in last step by the gridded
+                   # movers, -1 if not known. One per kind of grid so a
+                   # current and a wind grid don't reset each other's
+                   'current_cell_index': ((), np.int32, 'current_cell_index',
+                                          -1),
+                   'ice_cell_index': ((), np.int32, 'ice_cell_index', -1),
+                   'wind_cell_index': ((), np.int32, 'wind_cell_index', -1),
+
                    # WEATHERING DATA
                    # following used to compute spreading (LE thickness)
                    # bulk_init_volume initial volume of blob of oil - the sum
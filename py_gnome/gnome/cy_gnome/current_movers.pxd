@@ -40,7 +40,7 @@ cdef extern from "CATSMover_c.h":
 
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status,
-                       LEType spillType, long spillID)
+                       LEType spillType, long spillID) nogil
         void  SetTimeDep(OSSMTimeValue_c *ossm)
         LongPointHdl  GetPointsHdl()
         WORLDPOINTH  GetWorldPointsHdl()
@@ -71,7 +71,7 @@ cdef extern from "ComponentMover_c.h":
         void            SetRefPosition(WorldPoint3D p)
         WorldPoint3D    GetRefPosition()
 
-        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID)
+        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID) nogil
         void  SetTimeFile(OSSMTimeValue_c *ossm)    
 
 
@@ -94,7 +94,7 @@ cdef extern from "GridCurrentMover_c.h":
 
         GridCurrentMover_c ()
         WorldPoint3D    GetMove(Seconds&,Seconds&,Seconds&,Seconds&, long, long, LERec *, LETYPE)
-        OSErr             get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID)
+        OSErr             get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID, int32_t* cell_index) nogil
         void             SetTimeGrid(TimeGridVel_c *newTimeGrid)
         OSErr           TextRead(char *path,char *topFilePath)
         OSErr           ExportTopology(char *topFilePath)
@@ -4,10 +4,13 @@ cimport numpy as cnp
 import numpy as np
 from libc.string cimport memcpy
 
+from libc.stdint cimport int32_t
+
 from type_defs cimport *
 from utils cimport _GetHandleSize
 from movers cimport Mover_c
 from current_movers cimport GridCurrentMover_c, CurrentMover_c
+from grids cimport TimeGridVel_c
 
 from gnome import basic_types
 from gnome.cy_gnome.cy_mover cimport CyCurrentMoverBase
@@ -190,13 +193,56 @@ cdef class CyGridCurrentMover(CyCurrentMoverBase):
     def get_offset_time(self):
         return self.grid_current.GetTimeShift()
 
+    def prefetch_time_data(self):
+        """
+        Read the time after the loaded interval into a spare buffer so the
+        next prepare_for_model_step() doesn't wait on the file. Releases the
+        GIL while reading, so it can run on a background thread, but it must
+        not run at the same time as any other call into lib_gnome except
+        get_move().
+
+        :returns: error code, 0 if no error
+        """
+        cdef OSErr err = 0
+        cdef char errmsg[256]
+        cdef TimeGridVel_c *time_grid = self.grid_current.timeGrid
+
+        if time_grid != NULL:
+            with nogil:
+                err = time_grid.PrefetchNextTime(errmsg)
+
+        return err
+
+    property prefetch_hits:
+        """
+        number of times read ahead by prefetch_time_data() before they were
+        needed
+        """
+        def __get__(self):
+            if self.grid_current.timeGrid == NULL:
+                return 0
+
+            return self.grid_current.timeGrid.fNumPrefetchHits
+
+    property prefetch_stalls:
+        """
+        number of times that had to be read from the file when they were
+        needed
+        """
+        def __get__(self):
+            if self.grid_current.timeGrid == NULL:
+                return 0
+
+            return self.grid_current.timeGrid.fNumPrefetchStalls
+
     def get_move(self,
                  model_time,
                  step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[short] LE_status,
-                 LEType spill_type):
+                 LEType spill_type,
+                 cnp.ndarray[cnp.int32_t] cell_index=None):
         """
         .. function:: get_move(self,
                  model_time,
@@ -204,7 +250,8 @@ cdef class CyGridCurrentMover(CyCurrentMoverBase):
                  np.ndarray[WorldPoint3D, ndim=1] ref_points,
                  np.ndarray[WorldPoint3D, ndim=1] delta,
                  np.ndarray[np.npy_int16] LE_status,
-                 LE_type)
+                 LE_type,
+                 np.ndarray[np.int32] cell_index=None)
 
         Invokes the underlying C++ GridCurrentMover_c.get_move(...)
 
@@ -218,16 +265,30 @@ cdef class CyGridCurrentMover(CyCurrentMoverBase):
                                                     particles in water
         :param spill_type: LEType defining whether spill is forecast
                            or uncertain
+        :param cell_index: optional grid cell of each particle found in the
+            last step, used to start the cell search. Updated in place, -1
+            if not known
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)
-
-        err = self.grid_current.get_move(N, model_time, step_len,
-                                         &ref_points[0],
-                                         &delta[0],
-                                         &LE_status[0],
-                                         spill_type, 0)
+        cdef int N = len(ref_points)
+        cdef unsigned long c_model_time = model_time
+        cdef unsigned long c_step_len = step_len
+        cdef WorldPoint3D *c_ref = &ref_points[0]
+        cdef WorldPoint3D *c_delta = &delta[0]
+        cdef short *c_status = <short *>&LE_status[0]
+        cdef int32_t *c_cell_index = NULL
+
+        if cell_index is not None:
+            c_cell_index = &cell_index[0]
+
+        # modifies delta in place. The C++ mover does not touch any python
+        # objects so release the GIL while it runs
+        with nogil:
+            err = self.grid_current.get_move(N, c_model_time, c_step_len,
+                                             c_ref, c_delta,
+                                             c_status, spill_type, 0,
+                                             c_cell_index)
 
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points '
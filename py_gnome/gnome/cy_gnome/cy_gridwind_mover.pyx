@@ -2,8 +2,11 @@ cimport numpy as cnp
 import numpy as np
 import os
 
+from libc.stdint cimport int32_t
+
 from type_defs cimport *
 from movers cimport GridWindMover_c, WindMover_c, Mover_c
+from grids cimport TimeGridVel_c
 
 from cy_mover cimport CyWindMoverBase
 
@@ -119,6 +122,48 @@ cdef class CyGridWindMover(CyWindMoverBase):
     def offset_time(self, time_offset):
         self.grid_wind.SetTimeShift(time_offset)
 
+    def prefetch_time_data(self):
+        """
+        Read the time after the loaded interval into a spare buffer so the
+        next prepare_for_model_step() doesn't wait on the file. Releases the
+        GIL while reading, so it can run on a background thread, but it must
+        not run at the same time as any other call into lib_gnome except
+        get_move().
+
+        :returns: error code, 0 if no error
+        """
+        cdef OSErr err = 0
+        cdef char errmsg[256]
+        cdef TimeGridVel_c *time_grid = self.grid_wind.timeGrid
+
+        if time_grid != NULL:
+            with nogil:
+                err = time_grid.PrefetchNextTime(errmsg)
+
+        return err
+
+    property prefetch_hits:
+        """
+        number of times read ahead by prefetch_time_data() before they were
+        needed
+        """
+        def __get__(self):
+            if self.grid_wind.timeGrid == NULL:
+                return 0
+
+            return self.grid_wind.timeGrid.fNumPrefetchHits
+
+    property prefetch_stalls:
+        """
+        number of times that had to be read from the file when they were
+        needed
+        """
+        def __get__(self):
+            if self.grid_wind.timeGrid == NULL:
+                return 0
+
+            return self.grid_wind.timeGrid.fNumPrefetchStalls
+
     def get_move(self,
                  model_time,
                  step_len,
@@ -126,7 +171,8 @@ cdef class CyGridWindMover(CyWindMoverBase):
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[cnp.npy_double] windages,
                  cnp.ndarray[cnp.npy_int16] LE_status,
-                 LEType spill_type):
+                 LEType spill_type,
+                 cnp.ndarray[cnp.int32_t] cell_index=None):
         """
         .. function:: get_move(self,
                  model_time,
@@ -135,7 +181,8 @@ cdef class CyGridWindMover(CyWindMoverBase):
                  np.ndarray[WorldPoint3D, ndim=1] delta,
                  np.ndarray[np.npy_double] windages,
                  np.ndarray[np.npy_int16] LE_status,
-                 LE_type)
+                 LE_type,
+                 np.ndarray[np.int32] cell_index=None)
 
         Invokes the underlying C++ GridWindMover_c.get_move(...)
 
@@ -151,14 +198,31 @@ cdef class CyGridWindMover(CyWindMoverBase):
             particles in water
         :param spill_type: LEType defining whether spill is forecast or
             uncertain
+        :param cell_index: optional grid cell of each particle found in the
+            last step, used to start the cell search. Updated in place, -1
+            if not known
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)
-
-        err = self.grid_wind.get_move(N, model_time, step_len, &ref_points[0],
-                            &delta[0], &windages[0], <short *>&LE_status[0],
-                            spill_type, 0)
+        cdef int N = len(ref_points)
+        cdef unsigned long c_model_time = model_time
+        cdef unsigned long c_step_len = step_len
+        cdef WorldPoint3D *c_ref = &ref_points[0]
+        cdef WorldPoint3D *c_delta = &delta[0]
+        cdef double *c_windages = &windages[0]
+        cdef short *c_status = <short *>&LE_status[0]
+        cdef int32_t *c_cell_index = NULL
+
+        if cell_index is not None:
+            c_cell_index = &cell_index[0]
+
+        # modifies delta in place. The C++ mover does not touch any python
+        # objects so release the GIL while it runs
+        with nogil:
+            err = self.grid_wind.get_move(N, c_model_time, c_step_len,
+                                          c_ref, c_delta, c_windages,
+                                          c_status, spill_type, 0,
+                                          c_cell_index)
         if err == 1:
             raise ValueError("Make sure numpy arrays for ref_points and"
                              " delta are defined")
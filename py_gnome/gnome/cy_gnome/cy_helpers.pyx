@@ -46,7 +46,8 @@ def rand():
     """
     Calls the C stdlib.rand() function
 
-    Only implemented for testing that the srand was set correctly
+    Used for testing that the srand was set correctly and by the movers that
+    seed per LE random streams from the C generator
     """
     return stdlib.rand()
 
@@ -107,7 +107,9 @@ cdef class CyRandomVerticalMover(cy_mover.CyMover):
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[short] LE_status,
-                 LEType spill_type):
+                 LEType spill_type,
+                 long le_offset=0,
+                 unsigned long seed=0):
         """
         .. function:: get_move(self,
                  model_time,
@@ -116,7 +118,9 @@ cdef class CyRandomVerticalMover(cy_mover.CyMover):
                  np.ndarray[WorldPoint3D, ndim=1] delta,
                  np.ndarray[np.npy_int16] LE_status,
                  LE_type,
-                 spill_ID)
+                 spill_ID,
+                 le_offset=0,
+                 seed=0)
 
         Invokes the underlying C++ Random_c.get_move(...)
 
@@ -128,14 +132,28 @@ cdef class CyRandomVerticalMover(cy_mover.CyMover):
         :type delta: numpy array of WorldPoint3D
         :param le_status: status of each particle - movement is only on particles in water
         :param spill_type: LEType defining whether spill is forecast or uncertain 
+        :param le_offset: index of ref_points[0] in the spill container's
+            arrays, used with seed
+        :param seed: if non-zero, each LE draws from its own random stream
+            seeded by (seed, le_offset + i) rather than from the C rand(), so
+            chunks of the arrays can be moved on different threads
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)  # set a data type?
-
-        err = self.rand.get_move(N, model_time, step_len,
-                                 &ref_points[0], &delta[0], &LE_status[0],
-                                 spill_type, 0)
+        cdef int N = len(ref_points)
+        cdef unsigned long c_model_time = model_time
+        cdef unsigned long c_step_len = step_len
+        cdef WorldPoint3D *c_ref = &ref_points[0]
+        cdef WorldPoint3D *c_delta = &delta[0]
+        cdef short *c_status = <short *>&LE_status[0]
+
+        # modifies delta in place. The C++ mover does not touch any python
+        # objects so release the GIL while it runs
+        with nogil:
+            err = self.rand.get_move(N, c_model_time, c_step_len,
+                                     c_ref, c_delta,
+                                     c_status, spill_type, 0,
+                                     le_offset, seed)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points, delta '
                              'are defined')
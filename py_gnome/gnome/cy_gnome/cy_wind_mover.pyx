@@ -145,16 +145,20 @@ cdef class CyWindMover(CyWindMoverBase):
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)  # set a data type?
-
-        # modifies delta in place
-        err = self.wind.get_move(N, model_time, step_len,
-                                  &ref_points[0],
-                                  &delta[0],
-                                  &windages[0],
-                                  &LE_status[0],
-                                  spill_type,
-                                  0)
+        cdef int N = len(ref_points)
+        cdef unsigned long c_model_time = model_time
+        cdef unsigned long c_step_len = step_len
+        cdef WorldPoint3D *c_ref = &ref_points[0]
+        cdef WorldPoint3D *c_delta = &delta[0]
+        cdef double *c_windages = &windages[0]
+        cdef short *c_status = <short *>&LE_status[0]
+
+        # modifies delta in place. The C++ mover does not touch any python
+        # objects so release the GIL while it runs
+        with nogil:
+            err = self.wind.get_move(N, c_model_time, c_step_len,
+                                     c_ref, c_delta, c_windages,
+                                     c_status, spill_type, 0)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points, delta '
                              'and windages are defined')
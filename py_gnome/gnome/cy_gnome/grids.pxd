@@ -47,9 +47,13 @@ cdef extern from "TimeGridVel_c.h":
         # void                 ClearLoadedData(LoadedData * dataPtr)
         # void                 DisposeAllLoadedData()
         #======================================================================
+        long        fNumPrefetchHits
+        long        fNumPrefetchStalls
+
         OSErr       TextRead(char *path, char *topFilePath)
         OSErr       ReadInputFileNames(char *fileNamesPath)
         OSErr       SetInterval(char *errmsg, const Seconds& model_time)
+        OSErr       PrefetchNextTime(char *errmsg) nogil
         VelocityRec GetScaledPatValue(Seconds& time, WorldPoint3D p)
 
     cdef cppclass TimeGridWindRect_c(TimeGridVel_c):
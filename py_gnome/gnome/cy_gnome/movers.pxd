@@ -31,7 +31,8 @@ cdef extern from "Random_c.h":
         Random_c() except +
         double fDiffusionCoefficient
         double fUncertaintyFactor
-        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID)        
+        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID) nogil
+        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID, long le_offset, unsigned long seed) nogil
 
 cdef extern from "RandomVertical_c.h":
     cdef cppclass RandomVertical_c(Mover_c):
@@ -39,7 +40,8 @@ cdef extern from "RandomVertical_c.h":
         double fVerticalDiffusionCoefficient
         double fVerticalBottomDiffusionCoefficient
         double fMixedLayerDepth
-        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID)        
+        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID) nogil
+        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spillID, long le_offset, unsigned long seed) nogil
 
 cdef extern from "RiseVelocity_c.h":
     OSErr get_rise_velocity(int n, double *rise_vel, double *le_density, double *le_drop_size, double water_vis, double water_density)
@@ -52,7 +54,7 @@ cdef extern from "RiseVelocity_c.h":
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta,
                        double* rise_velocity,
-                       short* LE_status, LEType spillType, long spillID)        
+                       short* LE_status, LEType spillType, long spillID) nogil
 
 cdef extern from "WindMover_c.h":
     cdef cppclass WindMover_c(Mover_c):
@@ -64,7 +66,7 @@ cdef extern from "WindMover_c.h":
         double fSpeedScale
         double fAngleScale
 
-        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, double* windages, short* LE_status, LEType spillType, long spill_ID)
+        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, double* windages, short* LE_status, LEType spillType, long spill_ID) nogil
         void SetTimeDep(OSSMTimeValue_c *ossm)
         OSErr GetTimeValue(Seconds &time, VelocityRec *vel)
 
@@ -80,6 +82,7 @@ cdef extern from "GridWindMover_c.h":
 
         GridWindMover_c ()
         WorldPoint3D    GetMove(Seconds&,Seconds&,Seconds&,Seconds&, long, long, LERec *, LETYPE)
+        OSErr get_move(int n, unsigned long model_time, unsigned long step_len, WorldPoint3D* ref, WorldPoint3D* delta, double* windages, short* LE_status, LEType spillType, long spill_ID, int32_t* cell_index) nogil
         void 		    SetTimeGrid(TimeGridVel_c *newTimeGrid)
         OSErr           TextRead(char *path,char *topFilePath)
         OSErr          ExportTopology(char *topFilePath)
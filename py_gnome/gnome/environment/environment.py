@@ -3,6 +3,7 @@ module contains objects that contain weather related data. For example,
 the Wind object defines the Wind conditions for the spill
 """
 import copy
+from functools import wraps
 
 from colander import SchemaNode, Float, MappingSchema, drop, String, OneOf
 import unit_conversion as uc
@@ -16,6 +17,50 @@ from gnome import constants
 from .. import _valid_units
 
 
+def memoized_query(func):
+    '''
+    Decorator for the query methods of Environment objects, eg:
+    Wind.get_value(time) or Water.get(attr, unit).
+
+    Results are memoized on the instance, keyed on the method name and its
+    arguments, so the weatherers asking for the same (time, units) in a
+    substep share a single lookup. The memo is dropped whenever the object's
+    _memo_state() changes - see Environment.__setattr__ and
+    Environment._invalidate_memo(). Arguments that are not hashable, like
+    numpy arrays of times, are not memoized.
+    '''
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        key = (name,) + args
+        if kwargs:
+            key += tuple(sorted(kwargs.iteritems()))
+
+        state = self._memo_state()
+        memo = self.__dict__.get('_memo')
+        if memo is None:
+            memo = self.__dict__['_memo'] = {}
+
+        try:
+            entry = memo.get(key)
+        except TypeError:
+            # unhashable arguments
+            return func(self, *args, **kwargs)
+
+        if entry is not None and entry[0] == state:
+            return entry[1]
+
+        value = func(self, *args, **kwargs)
+        if len(memo) >= self._memo_max:
+            memo.clear()
+
+        memo[key] = (state, value)
+        return value
+
+    return wrapper
+
+
 class Environment(object):
     """
     A base class for all classes in environment module
@@ -32,6 +77,11 @@ class Environment(object):
     # reference environment objects
     _ref_as = 'environment'
 
+    # names of referenced environment objects whose state is part of the
+    # state of memoized queries, eg: Waves depends on 'wind' and 'water'
+    _memo_depends = ()
+    _memo_max = 64
+
     def __init__(self, name=None, make_default_refs=True):
         '''
         base class for environment objects
@@ -43,6 +93,38 @@ class Environment(object):
 
         self.make_default_refs = make_default_refs
 
+    def __setattr__(self, name, value):
+        '''
+        any change to a public or private attribute invalidates the results
+        memoized by @memoized_query
+        '''
+        if not name.startswith('_memo'):
+            self._invalidate_memo()
+
+        super(Environment, self).__setattr__(name, value)
+
+    def _invalidate_memo(self):
+        '''
+        Drop memoized query results. Attribute assignment does this
+        automatically; call it after changing state that is not an attribute,
+        like the timeseries held by the cython ossm object.
+        '''
+        self.__dict__['_memo_version'] = self.__dict__.get('_memo_version',
+                                                           0) + 1
+        self.__dict__['_memo'] = {}
+
+    def _memo_state(self):
+        '''
+        state that memoized results must match to be reused: the version of
+        this object and of the objects it depends on
+        '''
+        state = (self.__dict__.get('_memo_version', 0),)
+        for attr in self._memo_depends:
+            ref = getattr(self, attr, None)
+            state += (id(ref), getattr(ref, '_memo_version', 0))
+
+        return state
+
     def prepare_for_model_run(self, model_time):
         """
         Override this method if a derived environment class needs to perform any
@@ -189,6 +271,15 @@ class Water(Environment, serializable.Serializable):
 
     __str__ = __repr__
 
+    def _memo_state(self):
+        '''
+        Water.get() also depends on the units dict, which can be modified
+        in place
+        '''
+        return (super(Water, self)._memo_state() +
+                tuple(sorted(self._units.iteritems())))
+
+    @memoized_query
     def get(self, attr, unit=None):
         '''
         return value in desired unit. If None, then return the value in SI
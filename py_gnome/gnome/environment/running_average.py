@@ -254,6 +254,7 @@ class RunningAverage(Environment, Serializable):
         # here should set the timeseries since the CyOSSMTime
         # should already exist
         self.ossm.timeseries = moving_timeseries
+        self._invalidate_memo()
         # self.ossm = CyOSSMTime(timeseries=moving_timeseries)
 
     def get_value(self, time):
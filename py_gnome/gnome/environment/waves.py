@@ -11,15 +11,16 @@ Uses the same approach as ADIOS 2
 
 """
 from __future__ import division
-from math import sqrt
 
 import copy
 
+import numpy as np
+
 from gnome import constants
 from gnome.utilities import serializable
 from gnome.utilities.serializable import Field
 from gnome.persist import base_schema
-from .environment import Environment
+from .environment import Environment, memoized_query
 from wind import WindSchema
 from .environment import WaterSchema
 from gnome.exceptions import ReferencedObjectNotSet
@@ -27,6 +28,14 @@ from gnome.exceptions import ReferencedObjectNotSet
 g = constants.gravity  # the gravitational constant.
 
 
+def _scalar_or_array(a):
+    '''
+    The wave computations work on numpy arrays; return a scalar if the input
+    to them was a scalar
+    '''
+    return a[()] if a.ndim == 0 else a
+
+
 class WavesSchema(base_schema.ObjType):
     'Colander Schema for Conditions object'
     name = 'Waves'
@@ -48,6 +57,8 @@ class Waves(Environment, serializable.Serializable):
 
     _state['name'].test_for_eq = False
 
+    _memo_depends = ('wind', 'water')
+
     def __init__(self, wind=None, water=None, **kwargs):
         """
         wind and water must be set before running the model; however, these
@@ -88,13 +99,16 @@ class Waves(Environment, serializable.Serializable):
     #     self.fetch = self.water.fetch
     #     self.density = self.water.density
 
+    @memoized_query
     def get_value(self, time):
         """
         return the rms wave height, peak period and percent wave breaking
         at a given time. Does not currently support location-variable waves.
 
         :param time: the time you want the wave data for 
-        :type time: datetime.datetime object
+        :type time: datetime.datetime object or a sequence of datetime
+            objects. For a sequence, each value returned is an array with
+            one value per time.
 
         :returns: wave_height, peak_period, whitecap_fraction, dissipation_energy
 
@@ -108,10 +122,13 @@ class Waves(Environment, serializable.Serializable):
         wave_height = self.water.wave_height
 
         if wave_height is None:
-            U = self.wind.get_value(time)[0]  # only need velocity
+            U = self.get_wind_speed(time)
             H = self.compute_H(U)
         else:  # user specified a wave height
             H = wave_height
+            if np.ndim(time) > 0:
+                H = np.full((len(time),), wave_height, dtype=np.float64)
+
             U = self.comp_psuedo_wind(H)
         Wf = self.comp_whitecap_fraction(U)
         T = self.comp_period(U)
@@ -120,6 +137,7 @@ class Waves(Environment, serializable.Serializable):
 
         return H, T, Wf, De
 
+    @memoized_query
     def get_emulsification_wind(self, time):
         """
         Return the right wind for the wave climate
@@ -137,13 +155,31 @@ class Waves(Environment, serializable.Serializable):
         fixme: I'm not sure this is right -- if we stick with the wave energy given
         by the user for dispersion, why not for emulsification?
 
+        Like get_value(), time can be a sequence of datetime objects
         """
         wave_height = self.water.wave_height
-        U = self.wind.get_value(time)[0]  # only need velocity
+        U = self.get_wind_speed(time)
         if wave_height is None:
             return U
         else:  # user specified a wave height
-            return max( U, self.comp_psuedo_wind(wave_height) )
+            return _scalar_or_array(np.maximum(U,
+                                               self.comp_psuedo_wind(wave_height)))
+
+    def get_wind_speed(self, time):
+        """
+        wind speed in m/s at time, or at each time in a sequence of datetime
+        objects. A sequence is interpolated in a single call to the wind's
+        timeseries if it supports it, like Wind.get_wind_data()
+        """
+        if np.ndim(time) == 0:
+            return self.wind.get_value(time)[0]  # only need velocity
+
+        if hasattr(self.wind, 'get_wind_data'):
+            data = self.wind.get_wind_data(time, 'm/s', 'r-theta')
+            return data['value'][:, 0]
+        else:
+            return np.array([self.wind.get_value(t)[0] for t in time],
+                            dtype=np.float64)
 
 
     # def get_pseudo_wind(self, time):
@@ -162,27 +198,29 @@ class Waves(Environment, serializable.Serializable):
         compute the wave height
 
         :param U: wind speed
-        :type U: floating point number in m/s units
+        :type U: floating point number or numpy array in m/s units
 
         :returns Hrms: RMS wave height in meters
         """
+        U = np.asarray(U, dtype=np.float64)
         fetch = self.water.fetch
         ## wind stress factor
         ## Transition at U = 4.433049525859078 for linear scale with wind speed.
         ##   4.433049525859078 is where the solutions match
-        ws = 0.71*U**1.23 if U < 4.433049525859078 else U # wind stress factor
+        ws = np.where(U < 4.433049525859078, 0.71*U**1.23, U) # wind stress factor
 
         # 2268*ws**2 is limit of fetch limited case.
-        if (fetch is not None) and (fetch < 2268*ws**2):  # fetch limited case
-            H = 0.0016*sqrt(fetch/g)*ws
-        else:  # fetch unlimited
-            H = 0.243*ws*ws/g
+        H = 0.243*ws*ws/g  # fetch unlimited
+        if fetch is not None:
+            H = np.where(fetch < 2268*ws**2,
+                         0.0016*np.sqrt(fetch/g)*ws,  # fetch limited case
+                         H)
 
         Hrms = 0.707*H
 
         # arbitrary limit at 30 m -- about the largest waves recorded
         # fixme -- this really depends on water depth -- should take that into account?
-        return Hrms if Hrms < 30.0 else 30.0
+        return _scalar_or_array(np.minimum(Hrms, 30.0))
 
     def comp_psuedo_wind(self, H):
         """
@@ -192,14 +230,15 @@ class Waves(Environment, serializable.Serializable):
 
         Unlimited fetch is assumed: this is the reverse of compute_H
 
-        :param H: given wave height.
+        :param H: given wave height - a scalar or numpy array
         """
+        H = np.asarray(H, dtype=np.float64)
 
         ##U_h = 2.0286*g*sqrt(H/g) # Bill's version
-        U_h = sqrt(g * H / 0.243)
-        if U_h < 4.433049525859078:  # check if low wind case
-            U_h = (U_h/0.71)**0.813008
-        return U_h
+        U_h = np.sqrt(g * H / 0.243)
+        # check if low wind case
+        U_h = np.where(U_h < 4.433049525859078, (U_h/0.71)**0.813008, U_h)
+        return _scalar_or_array(U_h)
 
     def comp_whitecap_fraction(self, U):
         """
@@ -221,19 +260,19 @@ class Waves(Environment, serializable.Serializable):
         ## Monahan(JPO, 1971) time constant characterizing exponential whitecap decay.
         ## The saltwater value for   is 3.85 sec while the freshwater value is 2.54 sec.
         #  interpolate with salinity:
+        U = np.asarray(U, dtype=np.float64)
         Tm = 0.03742857*self.water.salinity + 2.54
 
-        if U < 4.0: # m/s
-            ## linear fit from 0 to the 4m/s value from Ding and Farmer
-            ## maybe should be a exponential / quadratic fit?
-            ## or zero less than 3, then a sharp increase to 4m/s?
-            fw = (0.0125*U) / Tm
-        else:
-            #fw = (0.01*U + 0.01) / Tm  # Ding and Farmer (JPO 1994)
-            # old ADIOS had a .5 factor - not sure why but we'll keep it for now
-            fw = .5*(0.01*U + 0.01) / Tm  # Ding and Farmer (JPO 1994) 
+        ## below 4 m/s: linear fit from 0 to the 4m/s value from Ding and Farmer
+        ## maybe should be a exponential / quadratic fit?
+        ## or zero less than 3, then a sharp increase to 4m/s?
+        #fw = (0.01*U + 0.01) / Tm  # Ding and Farmer (JPO 1994)
+        # old ADIOS had a .5 factor - not sure why but we'll keep it for now
+        fw = np.where(U < 4.0,  # m/s
+                      (0.0125*U) / Tm,
+                      .5*(0.01*U + 0.01) / Tm)  # Ding and Farmer (JPO 1994)
 
-        return fw if fw <= 1.0 else 1.0  # only with U > 200m/s!
+        return _scalar_or_array(np.minimum(fw, 1.0))  # only with U > 200m/s!
 
     def comp_period(self, U):
         """
@@ -242,17 +281,19 @@ class Waves(Environment, serializable.Serializable):
         # wind stress factor
         ## fixme: check for discontinuity at large fetch..
         ##        Is this s bit low??? 32 m/s -> T=15.7 s
+        U = np.asarray(U, dtype=np.float64)
         wave_height = self.water.wave_height
         fetch = self.water.wave_height
         if wave_height is None:
             ws = U * 0.71 * U**1.23  ## fixme -- linear for large windspeed?
-            if (fetch is None) or (fetch >= 2268*ws**2):  # fetch unlimited
-                T = 0.83*ws
-            else:
-                T = 0.06238*(fetch*ws)**0.3333333333  # eq 3-34 (SPM?)
+            T = 0.83*ws  # fetch unlimited
+            if fetch is not None:
+                T = np.where(fetch >= 2268*ws**2,
+                             T,
+                             0.06238*(fetch*ws)**0.3333333333)  # eq 3-34 (SPM?)
         else:  # user-specified wave height
-            T = 7.508*sqrt(wave_height)
-        return T
+            T = np.full(U.shape, 7.508*np.sqrt(wave_height))
+        return _scalar_or_array(T)
 
     def disp_wave_energy(self, H):
         """
@@ -27,7 +27,7 @@ from gnome.persist.extend_colander import (DefaultTupleSchema,
                                            DatetimeValue2dArraySchema)
 from gnome.persist import validators, base_schema
 
-from .environment import Environment
+from .environment import Environment, memoized_query
 from gnome.utilities.timeseries import Timeseries
 from gnome.cy_gnome.cy_ossm_time import ossm_wind_units
 from .. import _valid_units
@@ -403,9 +403,11 @@ class Wind(serializable.Serializable, Timeseries, Environment):
                                                      'meter per second')
 
             super(Wind, self).set_timeseries(wind_data, format)
+            self._invalidate_memo()
         else:
             raise ValueError('Bad timeseries as input')
 
+    @memoized_query
     def get_value(self, time):
         '''
         Return the value at specified time and location. Wind timeseries are
@@ -417,7 +419,8 @@ class Wind(serializable.Serializable, Timeseries, Environment):
         :param time: the time(s) you want the data for
         :type time: datetime object or sequence of datetime objects.
 
-        .. note:: It invokes get_wind_data(..) function
+        .. note:: It invokes get_wind_data(..) function. Results are memoized
+            so repeated queries for the same time are only interpolated once
         '''
         data = self.get_wind_data(time, 'm/s', 'r-theta')
         return tuple(data[0]['value'])
@@ -45,8 +45,7 @@ from gnome.utilities import projections
 from gnome.basic_types import oil_status, world_point_type
 from gnome.cy_gnome.cy_land_check import check_land
 
-from gnome.utilities.geometry.cy_point_in_polygon import (points_in_poly,
-                                                          point_in_poly)
+from gnome.utilities.geometry.cy_point_in_polygon import points_in_poly
 from gnome.utilities.geometry.polygons import PolygonSet
 
 
@@ -428,6 +427,39 @@ class RasterMap(GnomeMap):
         """
         return self._on_land_pixel(self.projection.to_pixel(coord)[0])
 
+    def _map_bounds_pixel_mask(self):
+        """
+        returns a boolean raster the same shape as the bitmap that is True
+        for the pixel coords within map_bounds.
+
+        It is computed with points_in_poly() over blocks of rows of the
+        raster, so only a block of pixel coords is held at a time, and cached
+        until map_bounds changes.
+        """
+        key = self.map_bounds.tostring()
+
+        if getattr(self, '_bounds_mask_key', None) != key:
+            (num_rows, num_cols) = self.bitmap.shape[:2]
+            cols = np.arange(num_cols, dtype=np.float64)
+            block = max(1, 65536 // num_cols)
+
+            mask = np.zeros((num_rows, num_cols), dtype=np.bool)
+            for start in range(0, num_rows, block):
+                stop = min(start + block, num_rows)
+
+                pixels = np.zeros(((stop - start) * num_cols, 3),
+                                  dtype=np.float64)
+                pixels[:, 0] = np.repeat(np.arange(start, stop), num_cols)
+                pixels[:, 1] = np.tile(cols, stop - start)
+
+                mask[start:stop] = points_in_poly(self.map_bounds,
+                                                  pixels).reshape(-1, num_cols)
+
+            self._bounds_mask = mask
+            self._bounds_mask_key = key
+
+        return self._bounds_mask
+
     def _on_land_pixel_array(self, coords):
         """
         determines which LEs are on lond
@@ -435,15 +467,30 @@ class RasterMap(GnomeMap):
         :param coords:  Nx2 numpy int array of pixel coords matching the bitmap
         :type coords:  Nx2 numpy int array of pixel coords matching the bitmap
 
-        returns: a (N,) array of bools - true for particles that are on land
+        returns: a (N,) array - 1 for particles that are on land, 0 otherwise.
+            Pixels outside the land raster or map_bounds are not on land.
+
+        .. note:: vectorized - a lookup of all the points in the bitmap and
+            the cached map_bounds raster mask.
         """
-        mask = map(point_in_poly, [self.map_bounds] * len(coords), coords)
-        racpy = np.copy(coords)[mask]
-        mskgph = self.bitmap[racpy[:, 0], racpy[:, 1]]
-        chrmgph = np.array([0] * len(coords))
-        chrmgph[np.array(mask)] = mskgph
+        coords = np.asarray(coords).reshape(-1, 2)
+        rows = coords[:, 0]
+        cols = coords[:, 1]
+
+        shape = self.bitmap.shape
+        in_raster = ((rows >= 0) & (rows < shape[0]) &
+                     (cols >= 0) & (cols < shape[1]))
+
+        rows = rows[in_raster]
+        cols = cols[in_raster]
+
+        land = self.bitmap[rows, cols] & self.land_flag
+        land[~self._map_bounds_pixel_mask()[rows, cols]] = 0
+
+        on_land = np.zeros((len(coords),), dtype=self.bitmap.dtype)
+        on_land[in_raster] = land
 
-        return chrmgph
+        return on_land
 
     def _in_water_pixel(self, coord):
         try:
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 import copy
 import inspect
 import zipfile
+from itertools import groupby
 
 import numpy as np
 
@@ -17,6 +18,7 @@ import gnome.utilities.cache
 from gnome.utilities.time_utils import round_time
 from gnome.utilities.orderedcollection import OrderedCollection
 from gnome.utilities.serializable import Serializable, Field
+from gnome.utilities.thread_pool import get_thread_pool
 
 from gnome.basic_types import oil_status, fate
 from gnome.spill_container import SpillContainerPair
@@ -25,7 +27,9 @@ from gnome.movers import Mover
 from gnome.weatherers import (weatherer_sort,
                               Weatherer,
                               WeatheringData,
+                              WeatheringForcing,
                               FayGravityViscous)
+from gnome.weatherers.cleanup import CleanUpBase, CleanupScheduler
 from gnome.outputters import Outputter, NetCDFOutput, WeatheringOutput
 from gnome.persist import (extend_colander,
                            validators,
@@ -254,6 +258,17 @@ class Model(Serializable):
         # default is to zip save file
         self.zipsave = True
 
+        # run consecutive weatherers that support it on the same gathered
+        # surface data - see weather_elements()
+        self.fuse_weathering = False
+
+        # move the forecast and uncertain spill containers on separate
+        # threads if the movers support it - see move_elements()
+        self.concurrent_spills = False
+
+        # marks LEs for all cleanup weatherers - see setup_model_run()
+        self._cleanup_scheduler = CleanupScheduler()
+
         # model creates references to weatherers/environment if
         # make_default_refs is True
         self.make_default_refs = True
@@ -626,6 +641,12 @@ class Model(Serializable):
                 self._time_step = 900
             self._reset_num_time_steps()
 
+        self._build_weathering_forcing()
+
+        for w in self.weatherers:
+            if isinstance(w, CleanUpBase):
+                w.cleanup_scheduler = self._cleanup_scheduler
+
         for sc in self.spills.items():
             sc.prepare_for_model_run(array_types)
 
@@ -639,6 +660,54 @@ class Model(Serializable):
         self.logger.debug("{0._pid} setup_model_run complete for: "
                           "{0.name}".format(self))
 
+    def _build_weathering_forcing(self):
+        '''
+        Precompute the wind, waves and water forcing of the weatherers for
+        every weathering substep of the run. Weatherers that reference the
+        same environment objects share a WeatheringForcing table.
+        '''
+        tables = {}
+        times = None
+
+        for w in self.weatherers:
+            w.forcing = None
+            refs = tuple(getattr(w, attr, None)
+                         for attr in ('wind', 'waves', 'water'))
+
+            if not w.on or refs == (None, None, None):
+                continue
+
+            if times is None:
+                times = self._weathering_substep_times()
+
+            key = tuple(id(obj) for obj in refs)
+            if key not in tables:
+                try:
+                    tables[key] = WeatheringForcing(times, *refs)
+                except ValueError, err:
+                    # for instance wind data does not span the run - the
+                    # weatherers will query the objects at each substep
+                    self.logger.debug("{0._pid} no forcing table for {1}: "
+                                      "{2}".format(self, w.name, err))
+                    tables[key] = None
+
+            w.forcing = tables[key]
+
+    def _weathering_substep_times(self):
+        '''
+        :return: list of the datetimes of all weathering substeps of the run
+        '''
+        times = []
+        if self._num_time_steps is None:
+            return times
+
+        for step in range(self._num_time_steps - 1):
+            model_time = (self._start_time +
+                          timedelta(seconds=step * self._time_step))
+            times.extend(t for t, _ in self._split_into_substeps(model_time))
+
+        return times
+
     def setup_time_step(self):
         '''
         sets up everything for the current time_step:
@@ -648,6 +717,10 @@ class Model(Serializable):
             for sc in self.spills.items():
                 m.prepare_for_model_step(sc, self.time_step, self.model_time)
 
+        # cleanup operations that start in this step share the cumulative
+        # mass of the surface LEs
+        self._cleanup_scheduler.reset()
+
         for w in self.weatherers:
             for sc in self.spills.items():
                 # maybe we will setup a super-sampling step here???
@@ -666,31 +739,66 @@ class Model(Serializable):
          - sets new_position array for each spill
          - calls the beaching code to beach the elements that need beaching.
          - sets the new position
+
+        If concurrent_spills is True and every mover has
+        _threadsafe_get_move set, the movers for the forecast and uncertain
+        spill containers run on separate threads - the cython movers release
+        the GIL. The map operations stay on this thread, so the results are
+        the same as moving the containers one after the other.
         '''
-        for sc in self.spills.items():
-            if sc.num_released > 0:  # can this check be removed?
+        spills = [sc for sc in self.spills.items() if sc.num_released > 0]
+
+        if not self._move_spills_concurrently(spills):
+            for sc in spills:
+                self._start_move(sc)
+                self._accumulate_moves(sc, self.movers)
+                self._finish_move(sc)
+
+            return
+
+        for sc in spills:
+            self._start_move(sc)
 
-                # possibly refloat elements
-                self.map.refloat_elements(sc, self.time_step)
+        # movers keep the data for the current call on the instance, so the
+        # uncertain container is moved with shallow copies of the movers. The
+        # copies share the underlying cython movers
+        movers = [list(self.movers)]
+        movers.extend([copy.copy(m) for m in self.movers] for sc in spills[1:])
 
-                # reset next_positions
-                (sc['next_positions'])[:] = sc['positions']
+        get_thread_pool(len(spills), 'spills').map(
+            lambda args: self._accumulate_moves(*args), zip(spills, movers))
 
-                # loop through the movers
-                for m in self.movers:
-                    delta = m.get_move(sc, self.time_step, self.model_time)
-                    sc['next_positions'] += delta
+        for sc in spills:
+            self._finish_move(sc)
 
-                self.map.beach_elements(sc)
+    def _move_spills_concurrently(self, spills):
+        return (self.concurrent_spills and len(spills) > 1 and
+                all(m._threadsafe_get_move for m in self.movers))
 
-                # let model mark these particles to be removed
-                tbr_mask = sc['status_codes'] == oil_status.off_maps
-                sc['status_codes'][tbr_mask] = oil_status.to_be_removed
+    def _start_move(self, sc):
+        # possibly refloat elements
+        self.map.refloat_elements(sc, self.time_step)
 
-                self._update_fate_status(sc)
+        # reset next_positions
+        (sc['next_positions'])[:] = sc['positions']
 
-                # the final move to the new positions
-                (sc['positions'])[:] = sc['next_positions']
+    def _accumulate_moves(self, sc, movers):
+        # loop through the movers
+        for m in movers:
+            m.accumulate_move(sc, self.time_step, self.model_time,
+                              sc['next_positions'])
+
+    def _finish_move(self, sc):
+        self.map.beach_elements(sc)
+
+        # let model mark these particles to be removed
+        tbr_mask = sc['status_codes'] == oil_status.off_maps
+        sc['status_codes'][tbr_mask] = oil_status.to_be_removed
+
+        self._update_fate_status(sc)
+
+        # the final move to the new positions
+        (sc['positions'])[:] = sc['next_positions']
 
     def _update_fate_status(self, sc):
         '''
@@ -702,7 +810,11 @@ class Model(Serializable):
         '''
         if 'fate_status' in sc:
             non_w_mask = sc['status_codes'] == oil_status.on_land
-            sc['fate_status'][non_w_mask] = fate.non_weather
+            changed = np.where(np.logical_and(non_w_mask,
+                                              sc['fate_status'] !=
+                                              fate.non_weather))[0]
+            if len(changed) > 0:
+                sc.set_fate_status(changed, fate.non_weather)
 
     def weather_elements(self):
         '''
@@ -718,24 +830,45 @@ class Model(Serializable):
           'super-sample' the model time step so that it will be replaced
           with many smaller time steps.  We'll have to see if this pans
           out in practice.
+        - If fuse_weathering is True, consecutive weatherers that only work
+          on 'surface_weather' data (Weatherer._fusable) share the data
+          gathered by the first one; it is copied back to the spill container
+          once after the last one. The weatherers still run in the same
+          order, so results are unchanged.
 
         '''
         if len(self.weatherers) == 0:
             # if no weatherers then mass_components array may not be defined
             return
 
+        substeps = self._split_into_substeps()
         for sc in self.spills.items():
             # elements may have beached to update fate_status
 
             sc.reset_fate_dataview()
 
-            for w in self.weatherers:
-                for model_time, time_step in self._split_into_substeps():
-                    # change 'mass_components' in weatherer
-                    w.weather_elements(sc, time_step, model_time)
+            for fused, weatherers in groupby(self.weatherers,
+                                             self._is_fused_weatherer):
+                if fused:
+                    with sc.deferred_fatedataview_sync('surface_weather'):
+                        self._run_weatherers(sc, weatherers, substeps)
+                else:
+                    self._run_weatherers(sc, weatherers, substeps)
 
-    def _split_into_substeps(self):
+    def _is_fused_weatherer(self, weatherer):
+        return self.fuse_weathering and weatherer._fusable
+
+    def _run_weatherers(self, sc, weatherers, substeps):
+        for w in weatherers:
+            for model_time, time_step in substeps:
+                # change 'mass_components' in weatherer
+                w.weather_elements(sc, time_step, model_time)
+
+    def _split_into_substeps(self, model_time=None):
         '''
+        :param model_time=None: start of the time step to split. Defaults to
+            current model_time
+
         :return: sequence of (datetime, timestep)
          (Note: we divide evenly on second boundaries.
                    Thus, there will likely be a remainder
@@ -754,7 +887,10 @@ class Model(Serializable):
             # collect the remaining slice
             res.append((sum(res[-1]), time_step % sub_step))
 
-        res = [(self.model_time + timedelta(seconds=idx), delta)
+        if model_time is None:
+            model_time = self.model_time
+
+        res = [(model_time + timedelta(seconds=idx), delta)
                for idx, delta in res]
 
         return res
@@ -161,6 +161,10 @@ class CatsMover(CurrentMoversBase, serializable.Serializable):
                                          save_reference=True)])
     _schema = CatsMoverSchema
 
+    # forecast LEs only read the pattern and the tide value, which is looked
+    # up once in prepare_for_model_step - moves can be done on threads
+    _threadsafe_get_move = True
+
     def __init__(self, filename, tide=None, uncertain_duration=48,
                  **kwargs):
         """
@@ -405,6 +409,13 @@ class GridCurrentMover(CurrentMoversBase, serializable.Serializable):
                                          save=True, read=True, isdatafile=True,
                                          test_for_eq=False)])
     _schema = GridCurrentMoverSchema
+    _cell_index_array = 'current_cell_index'
+    _prefetches_time_data = True
+
+    # forecast LEs only read the current at the step's time interval, and the
+    # grid cell search keeps its hint per thread - moves can be done on
+    # threads
+    _threadsafe_get_move = True
 
     def __init__(self, filename,
                  topology_file=None,
@@ -522,6 +533,11 @@ class GridCurrentMover(CurrentMoversBase, serializable.Serializable):
                                                     'num_method',
                                                     val))
 
+    # times of gridded data read ahead by the prefetch before they were
+    # needed, and times that had to be read when they were needed
+    prefetch_hits = property(lambda self: self.mover.prefetch_hits)
+    prefetch_stalls = property(lambda self: self.mover.prefetch_stalls)
+
     def get_grid_data(self):
         """
             The main function for getting grid data from the mover
@@ -621,6 +637,7 @@ class IceMover(CurrentMoversBase, serializable.Serializable):
                                          save=True, read=True, isdatafile=True,
                                          test_for_eq=False)])
     _schema = IceMoverSchema
+    _cell_index_array = 'ice_cell_index'
 
     def __init__(self, filename,
                  topology_file=None,
@@ -837,6 +854,11 @@ class CurrentCycleMover(GridCurrentMover, serializable.Serializable):
                                          save_reference=True)])
     _schema = CurrentCycleMoverSchema
 
+    # the tide's ShioTimeValue recomputes its table of values in
+    # GetTimeValue when the time is out of its range, so get_move isn't
+    # thread safe
+    _threadsafe_get_move = False
+
     def __init__(self,
                  filename,
                  topology_file=None,
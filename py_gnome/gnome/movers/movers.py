@@ -1,4 +1,5 @@
 import copy
+import threading
 from datetime import timedelta
 
 import numpy
@@ -16,9 +17,17 @@ from gnome.basic_types import (world_point,
 
 from gnome.utilities import inf_datetime
 from gnome.utilities import time_utils, serializable
+from gnome.utilities.thread_pool import get_thread_pool
+from gnome.cy_gnome import cy_helpers
 from gnome.cy_gnome.cy_rise_velocity_mover import CyRiseVelocityMover
 from gnome import AddLogger
 
+# lib_gnome's handle allocation and file reading are not thread safe. Time
+# data prefetched on a background thread holds this lock while it reads, and
+# the CyMover calls that may read files or allocate handles wait for it.
+# get_move() does neither so it runs without the lock.
+_lib_gnome_lock = threading.RLock()
+
 
 class ProcessSchema(MappingSchema):
     '''
@@ -134,6 +143,14 @@ class Process(AddLogger):
 
 
 class Mover(Process):
+    # True if get_move() only reads the mover's shared state, the delta of an
+    # LE only depends on the LE's own data for forecast spills and the random
+    # generator is only used for uncertain spills. The forecast LEs can then
+    # be split into chunks moved on separate threads (CyMover.num_threads)
+    # and the forecast and uncertain spill containers can be moved at the
+    # same time (Model.concurrent_spills)
+    _threadsafe_get_move = False
+
     def get_move(self, sc, time_step, model_time_datetime):
         """
         Compute the move in (long,lat,z) space. It returns the delta move
@@ -157,8 +174,40 @@ class Mover(Process):
 
         return delta
 
+    def accumulate_move(self, sc, time_step, model_time_datetime, out):
+        """
+        Add the move of each element over the time step to 'out' in place.
+        The Model passes sc['next_positions'] for 'out'.
+
+        The default adds the delta returned by get_move(). Movers can
+        override it to avoid allocating a new delta array on every step.
+
+        :param sc: an instance of gnome.spill_container.SpillContainer class
+        :param time_step: time step in seconds
+        :param model_time_datetime: current model time as datetime object
+        :param out: (number_elements X 3) array of world_point_type
+        """
+        out += self.get_move(sc, time_step, model_time_datetime)
+
 
 class CyMover(Mover):
+    # don't bother with threads for fewer LEs than this per thread
+    _min_chunk_size = 10000
+
+    # True if the cython mover's get_move() takes le_offset and seed, and then
+    # draws the random numbers of each LE from a stream seeded by
+    # (seed, LE index) instead of the C rand(). The forecast LEs can then be
+    # moved in chunks on separate threads, and the result doesn't depend on
+    # the number of threads
+    _random_streams = False
+
+    # name of the data array that keeps the grid cell each LE was found in
+    # last step, which the gridded movers use to start the cell search
+    _cell_index_array = None
+
+    # True if the cython mover reads gridded data a time at a time and can
+    # prefetch the next one (prefetch_time_data)
+    _prefetches_time_data = False
 
     def __init__(self, **kwargs):
         """
@@ -188,11 +237,27 @@ class CyMover(Mover):
         # either a 1, or 2 depending on whether spill is certain or not
         self.spill_type = 0
 
+        # number of threads used by get_move() for forecast LEs. Only used
+        # if the cython mover supports it
+        self.num_threads = 1
+        self._stream_seed = None
+
+        # read the next time of gridded data on a background thread while the
+        # elements are moved. Only used if the cython mover supports it
+        self.prefetch_time_data = False
+        self._prefetch = None
+
+        if self._cell_index_array is not None:
+            self.array_types.add(self._cell_index_array)
+
     def prepare_for_model_run(self):
         """
         Calls the contained cython mover's prepare_for_model_run()
         """
-        self.mover.prepare_for_model_run()
+        self._wait_for_prefetch()
+
+        with _lib_gnome_lock:
+            self.mover.prepare_for_model_run()
 
     def prepare_for_model_step(self, sc, time_step, model_time_datetime):
         """
@@ -219,7 +284,10 @@ class CyMover(Mover):
                 uncertain_spill_size = np.array((sc.num_released, ),
                                                 dtype=np.int32)
 
-            self.mover.prepare_for_model_step(
+            self._wait_for_prefetch()
+
+            with _lib_gnome_lock:
+                self.mover.prepare_for_model_step(
                         self.datetime_to_seconds(model_time_datetime),
                         time_step, uncertain_spill_count, uncertain_spill_size)
 
@@ -239,20 +307,136 @@ class CyMover(Mover):
         # that have been released
 
         if self.active and len(self.positions) > 0:
-            self.mover.get_move(self.model_time, time_step,
-                                self.positions, self.delta,
-                                self.status_codes, self.spill_type)
+            self._move_elements(sc, time_step)
 
         return self.delta.view(dtype=world_point_type).reshape((-1,
                 len(world_point)))
 
-    def prepare_data_for_get_move(self, sc, model_time_datetime):
+    def accumulate_move(self, sc, time_step, model_time_datetime, out):
+        """
+        Same as adding the result of get_move() to 'out', but the cython
+        mover computes the delta into the SpillContainer's scratch buffer
+        (sc.delta_buffer()) so no array is allocated. Nothing is added if the
+        mover is not active.
+
+        :param out: (number_elements X 3) array of world_point_type
+        """
+        self.prepare_data_for_get_move(sc, model_time_datetime,
+                                       sc.delta_buffer())
+
+        if self.active and len(self.positions) > 0:
+            self._move_elements(sc, time_step)
+            out += self.delta.view(dtype=world_point_type).reshape((-1,
+                len(world_point)))
+
+    def _move_elements(self, sc, time_step):
+        """
+        fill self.delta. If num_threads > 1, the cython mover supports it and
+        the spill is a forecast spill, the LEs are split into contiguous
+        chunks moved concurrently; since each LE's delta only depends on its
+        own data, the result is the same as a single call.
+
+        For movers with _random_streams, one seed is drawn from the C rand()
+        for the step, so gnome.utilities.rand.seed() still makes the run
+        repeatable, and each LE draws from its own stream.
+        """
+        self._start_prefetch()
+
+        num_les = len(self.positions)
+        num_threads = min(self.num_threads, num_les // self._min_chunk_size)
+
+        if (num_threads <= 1 or
+                not (self._threadsafe_get_move or self._random_streams) or
+                self.spill_type != spill_type.forecast):
+            self._get_move(sc, time_step)
+            return
+
+        bounds = np.linspace(0, num_les, num_threads + 1).astype(int)
+        chunks = [slice(start, stop)
+                  for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        if self._random_streams:
+            # 0 means no stream to the C++ get_move
+            self._stream_seed = cy_helpers.rand() + 1
+
+        try:
+            get_thread_pool(num_threads).map(lambda le:
+                                             self._get_move(sc, time_step, le),
+                                             chunks)
+        finally:
+            self._stream_seed = None
+
+    def _start_prefetch(self):
+        """
+        if prefetch_time_data is set, start reading the next time of gridded
+        data on a background thread. It runs while the elements are moved
+        and weathered and is waited for in model_step_is_done(), so it
+        doesn't overlap with writing output files.
+        """
+        if (self.prefetch_time_data and self._prefetches_time_data and
+                self._prefetch is None):
+            self._prefetch = (get_thread_pool(1, 'time_data')
+                              .apply_async(self._prefetch_next_time))
+
+    def _prefetch_next_time(self):
+        with _lib_gnome_lock:
+            return self.mover.prefetch_time_data()
+
+    def _wait_for_prefetch(self):
+        """
+        wait for the prefetch started by _start_prefetch() to finish. If it
+        failed, the time is read again when it is needed, which reports the
+        error
+        """
+        if self._prefetch is not None:
+            prefetch, self._prefetch = self._prefetch, None
+
+            if prefetch.get() != 0:
+                self.logger.warning('{0}: reading the next time of data '
+                                    'ahead failed'.format(self.name))
+
+    def _get_move(self, sc, time_step, le=slice(None)):
+        """
+        call the cython mover's get_move(), which fills self.delta. Override
+        this if the cython mover has a different get_move signature
+
+        :param le: slice of the LEs to move
+        """
+        if self._stream_seed is not None:
+            self.mover.get_move(self.model_time, time_step,
+                                self.positions[le], self.delta[le],
+                                self.status_codes[le], self.spill_type,
+                                le.start or 0, self._stream_seed)
+        elif self._cell_index_array is None:
+            self.mover.get_move(self.model_time, time_step,
+                                self.positions[le], self.delta[le],
+                                self.status_codes[le], self.spill_type)
+        else:
+            self.mover.get_move(self.model_time, time_step,
+                                self.positions[le], self.delta[le],
+                                self.status_codes[le], self.spill_type,
+                                self._cell_index(sc, le))
+
+    def _cell_index(self, sc, le=slice(None)):
+        """
+        return the cell index of the LEs to move, or None if the mover
+        doesn't use one or the spill container doesn't have the array
+        """
+        if self._cell_index_array is None or self._cell_index_array not in sc:
+            return None
+
+        return sc[self._cell_index_array][le]
+
+    def prepare_data_for_get_move(self, sc, model_time_datetime, delta=None):
         """
         organizes the spill object into inputs for calling with Cython
         wrapper's get_move(...)
 
         :param sc: an instance of gnome.spill_container.SpillContainer class
         :param model_time_datetime: current model time as datetime object
+        :param delta: optional (number_elements X 3) array of
+            world_point_type the cython mover writes the delta into. If None,
+            a new array is allocated.
         """
         self.model_time = self.datetime_to_seconds(model_time_datetime)
 
@@ -274,8 +458,12 @@ class CyMover(Mover):
         self.positions = \
             self.positions.view(dtype=world_point).reshape(
                                                     (len(self.positions),))
-        self.delta = np.zeros(len(self.positions),
-                              dtype=world_point)
+        if delta is None:
+            self.delta = np.zeros(len(self.positions),
+                                  dtype=world_point)
+        else:
+            self.delta = \
+                delta.view(dtype=world_point).reshape((len(self.positions),))
 
     def model_step_is_done(self, sc=None):
         """
@@ -283,6 +471,8 @@ class CyMover(Mover):
         in a time step, and is intended to perform any necessary clean-up
         operations. Subclassed movers can override this method.
         """
+        self._wait_for_prefetch()
+
         if sc is not None:
             if sc.uncertain:
                 if self.active:
@@ -292,10 +482,13 @@ class CyMover(Mover):
                         raise ValueError('The spill container does not have'
                                          ' the required data array\n'
                                          + err.message)
-                    self.mover.model_step_is_done(self.status_codes)
+                    with _lib_gnome_lock:
+                        self.mover.model_step_is_done(self.status_codes)
             else:
                 if self.active:
-                    self.mover.model_step_is_done()
+                    with _lib_gnome_lock:
+                        self.mover.model_step_is_done()
         else:
             if self.active:
-                self.mover.model_step_is_done()
+                with _lib_gnome_lock:
+                    self.mover.model_step_is_done()
@@ -30,6 +30,11 @@ class RandomMover(CyMover, Serializable):
               save=['diffusion_coef', 'uncertain_factor'])
     _schema = RandomMoverSchema
 
+    # the forecast LEs can be moved on threads, each with its own random
+    # stream. It still uses the C rand() when not threaded, so the spills
+    # can't be moved concurrently
+    _random_streams = True
+
     def __init__(self, **kwargs):
         """
         Uses super to invoke base class __init__ method.
@@ -94,6 +99,9 @@ class RandomVerticalMover(CyMover, Serializable):
                       'mixed_layer_depth'])
     _schema = RandomVerticalMoverSchema
 
+    # see RandomMover
+    _random_streams = True
+
     def __init__(self, **kwargs):
         """
         Uses super to invoke base class __init__ method.
@@ -6,7 +6,6 @@ from gnome.persist.base_schema import ObjType
 from gnome.utilities import serializable
 from gnome.movers import CyMover, ProcessSchema
 from gnome.cy_gnome.cy_rise_velocity_mover import CyRiseVelocityMover
-from gnome.basic_types import world_point, world_point_type
 
 
 class RiseVelocityMoverSchema(ObjType, ProcessSchema):
@@ -28,6 +27,10 @@ class RiseVelocityMover(CyMover, serializable.Serializable):
     #_state.add(update=['water_viscosity'], save=['water_viscosity'])
     _schema = RiseVelocityMoverSchema
 
+    # the delta only depends on the LE's rise velocity - moves can be done
+    # on threads
+    _threadsafe_get_move = True
+
     def __init__(
         self,
        # water_density=1020,
@@ -76,33 +79,20 @@ class RiseVelocityMover(CyMover, serializable.Serializable):
         return ('RiseVelocityMover(active_start={0}, active_stop={1},'
                 ' on={2})').format(self.active_start, self.active_stop, self.on)
 
-    def get_move(
-        self,
-        sc,
-        time_step,
-        model_time_datetime,
-        ):
+    def _get_move(self, sc, time_step, le=slice(None)):
         """
         Override base class functionality because mover has a different
         get_move signature
 
         :param sc: an instance of the gnome.SpillContainer class
         :param time_step: time step in seconds
-        :param model_time_datetime: current time of the model as a date time
-            object
+        :param le: slice of the LEs to move
         """
-
-        self.prepare_data_for_get_move(sc, model_time_datetime)
-
-        if self.active and len(self.positions) > 0:
-            self.mover.get_move(self.model_time,
-                time_step,
-                self.positions,
-                self.delta,
-                sc['rise_vel'],
-                self.status_codes,
-                self.spill_type,
-                )
-
-        return self.delta.view(dtype=world_point_type).reshape((-1,
-                len(world_point)))
+        self.mover.get_move(self.model_time,
+            time_step,
+            self.positions[le],
+            self.delta[le],
+            sc['rise_vel'][le],
+            self.status_codes[le],
+            self.spill_type,
+            )
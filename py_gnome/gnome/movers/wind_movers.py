@@ -12,8 +12,6 @@ np = numpy
 from colander import (SchemaNode, String, Float, drop)
 
 from gnome.basic_types import (ts_format,
-                               world_point,
-                               world_point_type,
                                datetime_value_2d)
 
 from gnome.utilities import serializable, rand
@@ -146,26 +144,26 @@ class WindMoversBase(CyMover):
                                      sc['windage_persist'],
                                      time_step)
 
-    def get_move(self, sc, time_step, model_time_datetime):
+    def _get_move(self, sc, time_step, le=slice(None)):
         """
         Override base class functionality because mover has a different
         get_move signature
 
         :param sc: an instance of the gnome.SpillContainer class
         :param time_step: time step in seconds
-        :param model_time_datetime: current time of the model as a date time
-                                    object
+        :param le: slice of the LEs to move
         """
-        self.prepare_data_for_get_move(sc, model_time_datetime)
-
-        if self.active and len(self.positions) > 0:
+        if self._cell_index_array is None:
             self.mover.get_move(self.model_time, time_step,
-                                self.positions, self.delta,
-                                sc['windages'],
-                                self.status_codes, self.spill_type)
-
-        return (self.delta.view(dtype=world_point_type)
-                .reshape((-1, len(world_point))))
+                                self.positions[le], self.delta[le],
+                                sc['windages'][le],
+                                self.status_codes[le], self.spill_type)
+        else:
+            self.mover.get_move(self.model_time, time_step,
+                                self.positions[le], self.delta[le],
+                                sc['windages'][le],
+                                self.status_codes[le], self.spill_type,
+                                self._cell_index(sc, le))
 
     def _state_as_str(self):
         '''
@@ -195,6 +193,9 @@ class WindMover(WindMoversBase, serializable.Serializable):
                                         save_reference=True))
     _schema = WindMoverSchema
 
+    # forecast LEs only read the wind - moves can be done on threads
+    _threadsafe_get_move = True
+
     def __init__(self, wind=None, **kwargs):
         """
         Uses super to call CyMover base class __init__
@@ -345,6 +346,8 @@ class GridWindMover(WindMoversBase, serializable.Serializable):
                     read=True, isdatafile=True, test_for_eq=False)])
 
     _schema = GridWindMoverSchema
+    _cell_index_array = 'wind_cell_index'
+    _prefetches_time_data = True
 
     def __init__(self, wind_file, topology_file=None,
                  extrapolate=False, time_offset=0,
@@ -405,6 +408,11 @@ class GridWindMover(WindMoversBase, serializable.Serializable):
                                                      'extrapolate',
                                                      val))
 
+    # times of gridded data read ahead by the prefetch before they were
+    # needed, and times that had to be read when they were needed
+    prefetch_hits = property(lambda self: self.mover.prefetch_hits)
+    prefetch_stalls = property(lambda self: self.mover.prefetch_stalls)
+
     time_offset = property(lambda self: self.mover.time_offset / 3600.,
                            lambda self, val: setattr(self.mover,
                                                      'time_offset',
@@ -3,25 +3,297 @@ pp = PrettyPrinter(indent=2)
 
 import sys
 import os
+import re
+import itertools
 import psutil
 import time
+import shutil
+import tempfile
+import threading
 import traceback
 import logging
+import atexit
 
+import cPickle
 from cPickle import loads, dumps
+from cStringIO import StringIO
 import uuid
 
 import multiprocessing
 mp = multiprocessing
 
+import numpy as np
 
 import zmq
 from zmq.eventloop import ioloop, zmqstream
 
 from gnome import GnomeId
+from gnome.persist import load
+from gnome.exceptions import GnomeRuntimeError
 from gnome.environment import Wind
 from gnome.outputters import WeatheringOutput
 
+# numpy arrays in a response that are at least this big are passed through
+# a shared memory file instead of being pickled into the ZMQ message
+SHARED_MIN_NBYTES = 64 * 1024
+
+# array offsets in the shared memory file are aligned to this many bytes
+_SHARED_ALIGN = 64
+
+# shared memory files that could not be unlinked because their arrays were
+# still mapped (Windows doesn't allow it). They are retried every time
+# loads_shared() closes its files and once more at exit.
+_pending_unlinks = set()
+_pending_unlinks_lock = threading.Lock()
+
+
+def shared_memory_dir(default='.'):
+    '''
+    return the directory used for shared memory files - /dev/shm (RAM backed)
+    if available, else default
+    '''
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    else:
+        return default
+
+
+class _SharedArrayWriter(object):
+    '''
+    persistent_id hook for cPickle.Pickler. Large numpy arrays are written to
+    a file in the shared memory dir and only a small reference
+    (filename, offset, dtype, shape) is pickled.
+    '''
+    def __init__(self, filename, min_nbytes=SHARED_MIN_NBYTES):
+        self.filename = filename
+        self.min_nbytes = min_nbytes
+        self._fh = None
+        self._offset = 0
+
+    def persistent_id(self, obj):
+        if (type(obj) not in (np.ndarray, np.memmap) or
+                obj.dtype.hasobject or
+                obj.nbytes < self.min_nbytes):
+            return None
+
+        if self._fh is None:
+            self._fh = open(self.filename, 'wb')
+
+        # pad so every array starts on an aligned offset
+        pad = -self._offset % _SHARED_ALIGN
+        self._fh.write('\0' * pad)
+        self._offset += pad
+
+        offset = self._offset
+        np.ascontiguousarray(obj).tofile(self._fh)
+        self._offset += obj.nbytes
+
+        return ('ndarray', self.filename, offset, obj.dtype.str, obj.shape)
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class _SharedArrayReader(object):
+    '''
+    persistent_load hook for cPickle.Unpickler - the inverse of
+    _SharedArrayWriter. Arrays are views into a memory map of the shared
+    file so they are not copied. The files are unlinked by close(); the
+    memory stays valid until the arrays are garbage collected. Where the
+    files can't be unlinked while mapped, see _unlink_shared().
+    '''
+    def __init__(self):
+        self._maps = {}
+
+    def persistent_load(self, pid):
+        kind, filename, offset, dtype, shape = pid
+        if kind != 'ndarray':
+            raise cPickle.UnpicklingError('unknown persistent id: {0}'
+                                          .format(kind))
+
+        if filename not in self._maps:
+            self._maps[filename] = np.memmap(filename, dtype=np.uint8,
+                                             mode='r')
+
+        dtype = np.dtype(dtype)
+        nbytes = dtype.itemsize * int(np.prod(shape))
+
+        return (self._maps[filename][offset:offset + nbytes]
+                .view(dtype).reshape(shape))
+
+    def close(self):
+        _unlink_shared(self._maps.keys())
+
+        self._maps = {}
+
+
+def _unlink_shared(filenames=()):
+    '''
+    unlink the shared memory files, and retry the ones that failed before.
+    The files that still can't be unlinked are kept for the next call.
+    '''
+    with _pending_unlinks_lock:
+        filenames = set(filenames) | _pending_unlinks
+        _pending_unlinks.clear()
+
+    failed = set()
+    for filename in filenames:
+        try:
+            os.unlink(filename)
+        except OSError:
+            if os.path.exists(filename):
+                failed.add(filename)
+
+    with _pending_unlinks_lock:
+        _pending_unlinks.update(failed)
+
+    return failed
+
+
+def _clean_up_shared():
+    failed = _unlink_shared()
+    if failed:
+        logging.getLogger(__name__).warning('could not remove shared memory '
+                                            'files: {0}'
+                                            .format(', '.join(sorted(failed))))
+
+atexit.register(_clean_up_shared)
+
+
+def dumps_shared(obj, filename, min_nbytes=SHARED_MIN_NBYTES):
+    '''
+    pickle obj - numpy arrays of at least min_nbytes are written to filename
+    instead of being pickled. Use loads_shared() to unpickle the result.
+    filename is only created if obj contains a large array.
+    '''
+    buf = StringIO()
+    writer = _SharedArrayWriter(filename, min_nbytes)
+
+    pickler = cPickle.Pickler(buf, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = writer.persistent_id
+
+    try:
+        pickler.dump(obj)
+    finally:
+        writer.close()
+
+    return buf.getvalue()
+
+
+def loads_shared(msg):
+    'inverse of dumps_shared() - shared memory files are removed'
+    reader = _SharedArrayReader()
+
+    unpickler = cPickle.Unpickler(StringIO(msg))
+    unpickler.persistent_load = reader.persistent_load
+
+    try:
+        return unpickler.load()
+    finally:
+        reader.close()
+
+
+def poll_replies(tasks, busy, resend=None):
+    '''
+    yield (idx, result) for the REQ sockets tasks[idx], idx in busy, in the
+    order their replies arrive.  The replies are unpickled with
+    loads_shared().  If given, resend(idx, result) is called after each
+    reply; if it sends another request on the task and returns True, polling
+    continues on that task.
+
+    If the caller stops iterating, the outstanding replies are received
+    and dropped so the REQ sockets can be used again.  They are still
+    passed through loads_shared() so their shared memory files are removed.
+    '''
+    poller = zmq.Poller()
+    waiting = {}
+    for idx in busy:
+        poller.register(tasks[idx], zmq.POLLIN)
+        waiting[tasks[idx]] = idx
+
+    try:
+        while waiting:
+            for sock, _ in poller.poll():
+                idx = waiting[sock]
+                res = loads_shared(sock.recv())
+
+                if resend is None or not resend(idx, res):
+                    poller.unregister(sock)
+                    del waiting[sock]
+
+                yield idx, res
+    finally:
+        for sock in waiting:
+            try:
+                loads_shared(sock.recv())
+            except Exception:
+                # keep draining the other sockets
+                pass
+
+
+_path_item = re.compile(r'^(\w+)(?:\[([^\]]+)\])?$')
+
+
+def set_model_attribute(model, path, value):
+    '''
+    set the attribute of an object contained in the model. path is a
+    dotted list of attributes, an attribute that is a collection can be
+    indexed by position, object id or class name. For example:
+
+        'movers[0].diffusion_coef'
+        'environment[Water].temperature'
+        'spills[0].element_type.initializers[0].windage_range'
+    '''
+    obj = model
+    names = path.split('.')
+
+    for ix, name in enumerate(names):
+        match = _path_item.match(name)
+        if match is None:
+            raise ValueError('invalid attribute path: {0}'.format(path))
+
+        attr, key = match.groups()
+
+        if ix == len(names) - 1:
+            if key is not None:
+                raise ValueError('attribute path must end with an '
+                                 'attribute: {0}'.format(path))
+
+            setattr(obj, attr, value)
+            return
+
+        obj = getattr(obj, attr)
+
+        if key is not None:
+            if key.isdigit():
+                obj = obj[int(key)]
+            else:
+                found = [o for o in obj
+                         if getattr(o, 'id', None) == key or
+                         o.__class__.__name__ == key]
+                if not found:
+                    raise ValueError('{0} not found in {1}'
+                                     .format(key, path))
+                obj = found[0]
+
+
+def parameter_grid(params):
+    '''
+    return the list of all combinations of the parameter values, each one a
+    dict of {path: value} that can be given to ModelEnsemble. For example:
+
+        parameter_grid({'movers[0].diffusion_coef': [1e5, 2e5],
+                        'environment[Water].temperature': [280., 300.]})
+
+    gives 4 perturbations.
+    '''
+    paths = sorted(params)
+
+    return [dict(zip(paths, values))
+            for values in itertools.product(*[params[p] for p in paths])]
+
 
 class ModelConsumer(mp.Process):
     '''
@@ -39,16 +311,22 @@ class ModelConsumer(mp.Process):
              )
         - Attempt to perform the registered command.  Registered commands
           are defined as private methods of this class.
-        - Returns the results in a results queue
+        - Returns the results in a results queue.  Large numpy arrays in
+          the results are passed through a shared memory file
+          (see dumps_shared()) so only a small header is sent over ZMQ.
 
     '''
     def __init__(self, task_port, model,
-                 ipc_folder='.'):
+                 ipc_folder='.',
+                 shared_min_nbytes=SHARED_MIN_NBYTES):
         mp.Process.__init__(self)
 
         self.task_port = task_port
         self.model = model
         self.ipc_folder = ipc_folder
+        self.shared_min_nbytes = shared_min_nbytes
+        self.shared_dir = shared_memory_dir(ipc_folder)
+        self._num_responses = 0
 
     def run(self):
         print '{0}: starting...'.format(self.name)
@@ -102,12 +380,66 @@ class ModelConsumer(mp.Process):
         else:
             try:
                 res = getattr(self, '_' + cmd[0])(**cmd[1])
-                self.stream.send_unicode(dumps(res))
+                self.stream.send(self._dumps(res))
             except:
                 exc_type, exc_value, exc_traceback = sys.exc_info()
                 fmt = traceback.format_exception(exc_type, exc_value,
                                                  exc_traceback)
-                self.stream.send_unicode(dumps(fmt))
+                self.stream.send(self._dumps(fmt))
+
+    def _dumps(self, res):
+        # a new file for every response - the previous one may still be
+        # in use by the broadcaster
+        self._num_responses += 1
+        filename = os.path.join(self.shared_dir,
+                                'Data-{0}-{1}'.format(self.task_port,
+                                                      self._num_responses))
+
+        return dumps_shared(res, filename, self.shared_min_nbytes)
+
+    def _load_model(self, saveloc):
+        '''
+            replace the model with one loaded from a save file.  Used by
+            ModelWorkerPool to reuse the process for a new model.
+        '''
+        self.model = load(saveloc)
+        return self.model is not None
+
+    def _unload_model(self):
+        self.model = None
+
+    def _run_perturbation(self, saveloc, values):
+        '''
+            load a fresh copy of the model, set the perturbed attribute
+            values and run it to the end.  Only the mass balance of the
+            forecast spills is returned: {'time': [...], name: ndarray}
+            where each ndarray has one value per step (nan if the name was
+            not in the mass balance for that step).
+        '''
+        self._load_model(saveloc)
+
+        for path, value in values.iteritems():
+            set_model_attribute(self.model, path, value)
+
+        self.model._cache.enabled = False
+        for o in list(self.model.outputters):
+            del self.model.outputters[o.id]
+
+        times = []
+        rows = []
+        for _output in self.model:
+            sc = self.model.spills.items()[0]
+            times.append(sc.current_time_stamp)
+            rows.append(dict(sc.mass_balance))
+
+        self.model = None
+
+        res = {'time': times}
+        for name in set(n for r in rows for n in r):
+            res[name] = np.array([r.get(name, np.nan) for r in rows],
+                                 dtype=np.float64)
+
+        return res
 
     def _rewind(self):
         return self.model.rewind()
@@ -124,6 +456,10 @@ class ModelConsumer(mp.Process):
     def _num_time_steps(self):
         return self.model.num_time_steps
 
+    def _num_remaining_steps(self):
+        # current_time_step is -1 before the model is stepped
+        return self.model.num_time_steps - 1 - self.model.current_time_step
+
     def _full_run(self, rewind=True):
         return self.model.full_run(rewind=rewind)
 
@@ -189,6 +525,128 @@ class ModelConsumer(mp.Process):
             del self.model.outputters[dl.id]
 
 
+class ModelWorkerPool(object):
+    '''
+        A long lived pool of model consumer processes that can be reused
+        by many ModelBroadcasters, so a broadcaster does not need to fork
+        and set up a new process for every model variation.
+
+        The workers start without a model.  Models are shipped to them as
+        a save file (see load_model()).  The pool is sized to the number of
+        cores by default; acquire() starts more workers if all of them are
+        in use.
+    '''
+    def __init__(self, num_workers=None,
+                 ipc_folder='.',
+                 shared_min_nbytes=SHARED_MIN_NBYTES):
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+
+        self.ipc_folder = ipc_folder
+        self.shared_min_nbytes = shared_min_nbytes
+        self.context = zmq.Context()
+        self.consumers = []
+        self.tasks = []
+
+        self._free = []
+        self._lock = threading.Lock()
+
+        self._spawn(num_workers)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __del__(self):
+        self.stop()
+
+    @property
+    def num_free(self):
+        return len(self._free)
+
+    def _spawn(self, num_workers):
+        for _i in range(num_workers):
+            port = uuid.uuid4()
+
+            model_consumer = ModelConsumer(port, None, self.ipc_folder,
+                                           self.shared_min_nbytes)
+            model_consumer.start()
+
+            task = self.context.socket(zmq.REQ)
+            task.connect('ipc://{0}/Task-{1}'.format(self.ipc_folder, port))
+
+            self._free.append(len(self.tasks))
+            self.consumers.append(model_consumer)
+            self.tasks.append(task)
+
+    def acquire(self, num_workers):
+        '''
+            reserve num_workers workers and return their indices into
+            self.tasks.  More workers are started if not enough are free.
+        '''
+        with self._lock:
+            if len(self._free) < num_workers:
+                self._spawn(num_workers - len(self._free))
+
+            workers = self._free[:num_workers]
+            self._free = self._free[num_workers:]
+
+        return workers
+
+    def release(self, workers):
+        '''
+            drop the models held by workers and return them to the pool
+        '''
+        self.cmd('unload_model', {}, workers)
+
+        with self._lock:
+            self._free.extend(workers)
+
+    def load_model(self, model, workers):
+        '''
+            ship the model to the workers.  The model is saved once and
+            every worker loads its own copy from the save file.
+        '''
+        save_dir = tempfile.mkdtemp(dir=self.ipc_folder)
+
+        try:
+            model.save(save_dir, name='Model.zip')
+            if model.zipsave:
+                saveloc = os.path.join(save_dir, 'Model.zip')
+            else:
+                saveloc = save_dir
+
+            res = self.cmd('load_model', dict(saveloc=saveloc), workers)
+        finally:
+            shutil.rmtree(save_dir)
+
+        if not all([r is True for r in res]):
+            raise GnomeRuntimeError('failed to load model in worker: {0}'
+                                    .format(res))
+
+    def cmd(self, command, args, workers):
+        '''
+            send command to the workers in parallel and return their
+            results in the same order
+        '''
+        request = dumps((command, args))
+
+        [self.tasks[idx].send(request) for idx in workers]
+        return [loads_shared(self.tasks[idx].recv()) for idx in workers]
+
+    def stop(self):
+        [t.send(dumps(None)) for t in self.tasks]
+        [t.close() for t in self.tasks]
+
+        for c in self.consumers:
+            c.join()
+
+        self.context.destroy()
+
+        self.consumers = []
+        self.tasks = []
+        self._free = []
+
+
 class ModelBroadcaster(GnomeId):
     '''
         Here is where we spawn an array of model consumer processes
@@ -196,31 +654,45 @@ class ModelBroadcaster(GnomeId):
 
         More specifically, the model variations we are interested in are
         uncertainty variations.
+
+        If a ModelWorkerPool is given, the model variations run on workers
+        borrowed from the pool instead of newly spawned processes.  The
+        workers are returned to the pool by stop().
     '''
     def __init__(self, model,
                  wind_speed_uncertainties,
                  spill_amount_uncertainties,
-                 ipc_folder='.'):
+                 ipc_folder='.',
+                 shared_min_nbytes=SHARED_MIN_NBYTES,
+                 pool=None):
         self.model = model
         self.ipc_folder = ipc_folder
+        self.shared_min_nbytes = shared_min_nbytes
+        self.pool = pool
         self.context = None
         self.consumers = []
         self.tasks = []
+        self.workers = []
         self.lookup = {}
+        self.keys = {}
 
         self._get_available_ports(wind_speed_uncertainties,
                                   spill_amount_uncertainties)
-        self._spawn_consumers()
-        self._spawn_tasks()
 
+        if pool is None:
+            self._spawn_consumers()
+            self._spawn_tasks()
+        else:
+            self._acquire_workers()
+
+        setup = {}
         for wsu in wind_speed_uncertainties:
             for sau in spill_amount_uncertainties:
-                self._set_uncertainty(wsu, sau)
+                idx = self.lookup[(wsu, sau)]
+                setup[idx] = (self._uncertainty_cmds(wsu, sau) +
+                              self._output_cmds())
 
-        for i in range(len(self.tasks)):
-            self._set_new_cache_dir(i)
-            self._disable_cache(i)
-            self._set_weathering_output_only(i)
+        self._setup_consumers(setup)
 
     def __del__(self):
         self.stop()
@@ -237,12 +709,28 @@ class ModelBroadcaster(GnomeId):
                 self.lookup[(wsu, sau)] = idx
                 idx += 1
 
+        self.keys = dict((v, k) for k, v in self.lookup.iteritems())
+
     def _spawn_consumers(self):
         for p in self.task_ports:
-            model_consumer = ModelConsumer(p, self.model, self.ipc_folder)
+            model_consumer = ModelConsumer(p, self.model, self.ipc_folder,
+                                           self.shared_min_nbytes)
             model_consumer.start()
             self.consumers.append(model_consumer)
 
+    def _acquire_workers(self):
+        self.workers = self.pool.acquire(len(self.task_ports))
+        self.tasks = [self.pool.tasks[idx] for idx in self.workers]
+
+        try:
+            self.pool.load_model(self.model, self.workers)
+        except:
+            # give the workers back so the pool does not lose them
+            self.pool.release(self.workers)
+            self.workers = []
+            self.tasks = []
+            raise
+
     def _spawn_tasks(self):
         self.context = zmq.Context()
 
@@ -257,57 +745,244 @@ class ModelBroadcaster(GnomeId):
 
         if idx is not None:
             self.tasks[idx].send(request)
-            return loads(self.tasks[idx].recv())
+            return loads_shared(self.tasks[idx].recv())
         elif key is not None:
             idx = self.lookup[key]
             self.tasks[idx].send(request)
-            return loads(self.tasks[idx].recv())
+            return loads_shared(self.tasks[idx].recv())
         else:
             if in_parallel:
                 [t.send(request) for t in self.tasks]
-                return [loads(t.recv()) for t in self.tasks]
+                return [loads_shared(t.recv()) for t in self.tasks]
             else:
                 out = []
                 for t in self.tasks:
                     t.send(request)
-                    out.append(loads(t.recv()))
+                    out.append(loads_shared(t.recv()))
                 return out
 
+    def cmd_iter(self, command, args):
+        '''
+        Send the command to all consumers, then yield (key, result) as each
+        consumer responds - a slow consumer does not hold up collecting the
+        results of the others.
+        '''
+        request = dumps((command, args))
+        [t.send(request) for t in self.tasks]
+
+        for idx, res in self._poll(range(len(self.tasks))):
+            yield self.keys[idx], res
+
+    def full_run_iter(self, rewind=True):
+        '''
+        Run all the consumer models to the end, yielding
+        (key, step_num, result) as soon as any consumer finishes a step. The
+        consumer is sent its next step before its result is yielded so it
+        keeps working while the caller handles the result.
+
+        If a consumer returns an error (a formatted traceback) instead of the
+        step output, step_num is None and that consumer is not stepped any
+        further.
+
+        :param rewind=True: whether to rewind the models first -- if False,
+            the models are run from their current step to the end
+        '''
+        if rewind:
+            self.cmd('rewind', {})
+
+        remaining = self.cmd('num_remaining_steps', {})
+        request = dumps(('step', {}))
+
+        def step(idx, res=None):
+            # a consumer that errored is left alone
+            if remaining[idx] > 0 and not isinstance(res, list):
+                remaining[idx] -= 1
+                self.tasks[idx].send(request)
+                return True
+
+            return False
+
+        busy = [idx for idx in range(len(self.tasks)) if step(idx)]
+
+        for idx, res in self._poll(busy, step):
+            if isinstance(res, dict):
+                step_num = res.get('step_num')
+            else:
+                step_num = None
+
+            yield self.keys[idx], step_num, res
+
+    def _poll(self, busy, resend=None):
+        return poll_replies(self.tasks, busy, resend)
+
     def stop(self):
-        [t.send(dumps(None)) for t in self.tasks]
-        [t.close() for t in self.tasks]
+        if self.pool is not None:
+            # the processes belong to the pool - just give them back
+            if self.workers:
+                self.pool.release(self.workers)
+        else:
+            [t.send(dumps(None)) for t in self.tasks]
+            [t.close() for t in self.tasks]
 
-        for c in self.consumers:
-            c.join()
-        print 'joined all consumers!!!'
+            for c in self.consumers:
+                c.join()
+            print 'joined all consumers!!!'
 
-        self.context.destroy()
+            self.context.destroy()
 
         self.consumers = []
         self.tasks = []
+        self.workers = []
         self.lookup = {}
+        self.keys = {}
+
+    def _setup_consumers(self, setup):
+        '''
+        send each consumer idx its list of (command, args) in setup[idx].
+        The consumers work through their lists at the same time - the next
+        command is sent to a consumer as soon as it replies to the last one,
+        instead of waiting on each consumer in turn.
+        '''
+        pending = dict((idx, list(cmds)) for idx, cmds in setup.iteritems())
+
+        def send_next(idx, res=None):
+            if pending[idx]:
+                self.tasks[idx].send(dumps(pending[idx].pop(0)))
+                return True
+
+            return False
+
+        busy = [idx for idx in pending if send_next(idx)]
 
-    def _set_uncertainty(self,
-                         wind_speed_uncertainty,
-                         spill_amount_uncertainty):
+        for _idx, _res in self._poll(busy, send_next):
+            pass
+
+    def _uncertainty_cmds(self,
+                          wind_speed_uncertainty,
+                          spill_amount_uncertainty):
         # py_gnome spill container uncertainty is not used here
         # so we turn it off always
-        idx = self.lookup[(wind_speed_uncertainty, spill_amount_uncertainty)]
+        return [('set_spill_container_uncertainty', dict(uncertain=False)),
+                ('set_wind_speed_uncertainty',
+                 dict(up_or_down=wind_speed_uncertainty)),
+                ('set_spill_amount_uncertainty',
+                 dict(up_or_down=spill_amount_uncertainty))]
+
+    def _output_cmds(self):
+        # a new cache dir per consumer with the cache disabled, and only
+        # the weathering output
+        return [('set_cache_dir', {}),
+                ('set_cache_enabled', dict(enabled=False)),
+                ('set_weathering_output_only', {})]
+
+
+class ModelEnsemble(object):
+    '''
+        Runs copies of a model with arbitrary perturbations of any of its
+        attributes across a ModelWorkerPool, and reduces the results.
+
+        Each perturbation is a dict of {attribute path: value} - see
+        set_model_attribute() for the path format and parameter_grid() to
+        build a grid of perturbations.  The workers return only the mass
+        balance for each step, not the particle data.
+    '''
+    def __init__(self, model, perturbations, pool=None):
+        self.model = model
+        self.perturbations = list(perturbations)
+        self.pool = pool
+        self.results = []
+
+    def run(self):
+        '''
+            run all the perturbations and return the list of results in the
+            same order as self.perturbations.  If no pool was given, a
+            temporary one sized to the number of cores is used.
+        '''
+        pool = self.pool
+        if pool is None:
+            pool = ModelWorkerPool(min(len(self.perturbations),
+                                       mp.cpu_count()))
+
+        workers = pool.acquire(min(len(self.perturbations), len(pool)))
+        save_dir = tempfile.mkdtemp(dir=pool.ipc_folder)
 
-        self.cmd('set_spill_container_uncertainty',
-                 dict(uncertain=False), idx=idx)
+        try:
+            self.model.save(save_dir, name='Model.zip')
+            if self.model.zipsave:
+                saveloc = os.path.join(save_dir, 'Model.zip')
+            else:
+                saveloc = save_dir
+
+            self.results = self._run_jobs(pool, workers, saveloc)
+        finally:
+            shutil.rmtree(save_dir)
+            pool.release(workers)
+
+            if self.pool is None:
+                pool.stop()
+
+        errors = [(p, r) for p, r in zip(self.perturbations, self.results)
+                  if not isinstance(r, dict)]
+        if errors:
+            raise GnomeRuntimeError('perturbations failed: {0}'
+                                    .format(errors))
+
+        return self.results
+
+    def _run_jobs(self, pool, workers, saveloc):
+        # hand the next perturbation to each worker as soon as it is done
+        jobs = iter(enumerate(self.perturbations))
+        results = [None] * len(self.perturbations)
 
-        self.cmd('set_wind_speed_uncertainty',
-                 dict(up_or_down=wind_speed_uncertainty), idx=idx)
+        # the next job is sent before the reply for the previous one is
+        # yielded so keep the jobs sent to each worker in order
+        running = dict((idx, []) for idx in workers)
 
-        self.cmd('set_spill_amount_uncertainty',
-                 dict(up_or_down=spill_amount_uncertainty), idx=idx)
+        def send_next(idx, res=None):
+            for job, values in jobs:
+                pool.tasks[idx].send(dumps(('run_perturbation',
+                                            dict(saveloc=saveloc,
+                                                 values=values))))
+                running[idx].append(job)
+                return True
 
-    def _set_new_cache_dir(self, idx):
-        self.cmd('set_cache_dir', {}, idx=idx)
+            return False
 
-    def _disable_cache(self, idx):
-        self.cmd('set_cache_enabled', dict(enabled=False), idx=idx)
+        busy = [idx for idx in workers if send_next(idx)]
 
-    def _set_weathering_output_only(self, idx):
-        self.cmd('set_weathering_output_only', {}, idx=idx)
+        for idx, res in poll_replies(pool.tasks, busy, send_next):
+            results[running[idx].pop(0)] = res
+
+        return results
+
+    def mass_balance_percentiles(self, q=(5, 50, 95)):
+        '''
+            reduce the ensemble results to percentiles of each mass balance
+            quantity at each step:
+
+                {'time': [...], name: ndarray of shape (len(q), num_steps)}
+
+            steps where a member has no value for a name (nan) are left out
+            of the percentiles for that step.  All the members must have been
+            run over the same times.
+        '''
+        if not self.results:
+            raise GnomeRuntimeError('ensemble has not been run')
+
+        times = self.results[0]['time']
+        for p, r in zip(self.perturbations, self.results):
+            if list(r['time']) != list(times):
+                raise GnomeRuntimeError('perturbation {0} has {1} steps, '
+                                        'expected the {2} steps of the first '
+                                        'member at the same times'
+                                        .format(p, len(r['time']),
+                                                len(times)))
+
+        names = set(n for r in self.results for n in r if n != 'time')
+
+        out = {'time': times}
+        for name in names:
+            stack = np.vstack([r[name] for r in self.results if name in r])
+            out[name] = np.nanpercentile(stack, q, axis=0)
+
+        return out
@@ -8,11 +8,13 @@ set of arrays. The spills themselves provide some of the arrays themselves
 """
 import os
 from collections import namedtuple
+from contextlib import contextmanager
 
 import numpy as np
 
 from gnome.basic_types import fate as bt_fate
 from gnome.basic_types import oil_status
+from gnome.basic_types import world_point_type
 import gnome.array_types as gat
 from gnome.array_types import (positions,
                                next_positions,
@@ -53,8 +55,17 @@ class FateDataView(AddLogger):
 
     def __init__(self, substance_id):
         self.reset()
+        self.reset_index()
         self.substance_id = substance_id
 
+        # fates for which update_sc() is deferred - see
+        # SpillContainer.deferred_fatedataview_sync()
+        self._deferred = set()
+
+        # copies of the 'fate_status' and 'mass' arrays taken when the view
+        # of a fate aliased the SC arrays: {fate: [arrays]}
+        self._aliased = {}
+
     def reset(self):
         self.surface_weather = {}
         self.subsurf_weather = {}
@@ -67,41 +78,123 @@ class FateDataView(AddLogger):
         # properties of old LEs and properties of newly released LEs
         self.all = {}
 
-    def _get_fate_mask(self, sc, fate):
+    def reset_index(self):
         '''
-        get fate_status mask over SC - only include LEs with 'mass' > 0.0
+        drop the index of LE positions kept for each fate. It is rebuilt from
+        the SC arrays when next needed
         '''
-        if fate == 'all':
-            # look at all fate data
-            w_mask = np.asarray([True] * len(sc))
-        else:
-            w_mask = (sc['fate_status'] & getattr(bt_fate, fate) ==
-                      getattr(bt_fate, fate))
+        self._index = {}
+        self._indexed_len = 0
+
+    def _get_fate_mask(self, sc, fate, positions=slice(None)):
+        '''
+        get fate_status mask over the LEs of SC at 'positions' - only include
+        LEs of this substance with 'mass' > 0.0
+
+        :param positions: slice or index array of LEs. Default is all LEs
+        '''
+        w_mask = sc['mass'][positions] > 0.0
+
+        if fate != 'all':
+            flag = getattr(bt_fate, fate)
+            w_mask &= sc['fate_status'][positions] & flag == flag
+
+        if 'substance' in sc:
+            w_mask &= sc['substance'][positions] == self.substance_id
 
-        w_mask = np.logical_and(w_mask, sc['mass'] > 0.0)
         return w_mask
 
-    def _set_data(self, sc, array_types, fate_mask, fate):
+    def _get_fate_index(self, sc, fate):
+        '''
+        Return the sorted positions in SC of the LEs for 'fate' - same as
+        np.where(self._get_fate_mask(sc, fate))[0]
+
+        The index for each fate is kept up to date incrementally: LEs released
+        since it was last used are appended to it, removed LEs are dropped by
+        _remove_from_index() and LEs that changed fate_status or mass are moved
+        by _update_index().
         '''
-        fate_mask is the data already masked for the desired 'fate' option
+        num_les = len(sc)
+
+        if num_les < self._indexed_len:
+            # LEs removed without going through _remove_from_index()
+            self.reset_index()
+
+        elif num_les > self._indexed_len:
+            # released LEs are appended to the SC arrays
+            start = self._indexed_len
+            for f, index in self._index.iteritems():
+                new = np.where(self._get_fate_mask(sc, f,
+                                                   slice(start, None)))[0]
+                self._index[f] = np.concatenate((index, new + start))
+
+        self._indexed_len = num_les
+
+        index = self._index.get(fate)
+        if index is None:
+            index = np.where(self._get_fate_mask(sc, fate))[0]
+            self._index[fate] = index
+
+        return index
+
+    def _update_index(self, sc, positions):
         '''
-        # return all data associated with substance
-        if 'substance' in sc:
-            fate_mask = np.logical_and(sc['substance'] == self.substance_id,
-                                       fate_mask)
+        'fate_status' or 'mass' changed for LEs at 'positions' - move these LEs
+        to the index of the fate they now belong to
+        '''
+        if len(positions) == 0:
+            return
+
+        for f, index in self._index.iteritems():
+            index = np.setdiff1d(index, positions, assume_unique=True)
+            add = positions[self._get_fate_mask(sc, f, positions)]
+            self._index[f] = np.union1d(index, add)
 
-        if np.all(fate_mask):
+    def _remove_from_index(self, keep):
+        '''
+        SC removed the LEs where 'keep' is False and compacted its arrays -
+        remap the index of each fate to the new positions
+        '''
+        if len(keep) != self._indexed_len:
+            self.reset_index()
+            return
+
+        new_pos = np.cumsum(keep) - 1
+        for f, index in self._index.iteritems():
+            self._index[f] = new_pos[index[keep[index]]]
+
+        self._indexed_len = int(new_pos[-1] + 1) if len(keep) > 0 else 0
+
+    def _set_data(self, sc, array_types, index, fate):
+        '''
+        index contains the positions of LEs of this substance for the desired
+        'fate' option
+        '''
+        if len(index) == len(sc):
             # no need to make a copy of array
             setattr(self, fate, sc._data_arrays)
+
+            if fate == 'all':
+                # update_sc() compares with these to find the LEs that
+                # changed fate_status or mass
+                self._aliased[fate] = self._fate_arrays(sc, copy=True)
         else:
             dict_to_update = getattr(self, fate)
             for at in array_types:
                 array = sc._array_name(at)
                 if array not in dict_to_update:
-                    dict_to_update[array] = sc[array][fate_mask]
+                    dict_to_update[array] = sc[array][index]
 
             setattr(self, fate, dict_to_update)
 
+    def _fate_arrays(self, sc, copy=False):
+        'the arrays the fate index depends on'
+        arrays = [sc[name] for name in ('fate_status', 'mass') if name in sc]
+        if copy:
+            arrays = [a.copy() for a in arrays]
+
+        return arrays
+
     def get_data(self, sc, array_types, fate='surface_weather'):
         '''
         Get data that matches 'susbstance_id'. Also, since this is weathering
@@ -112,8 +205,16 @@ class FateDataView(AddLogger):
         '''
         # always add 'id' to array_types
         array_types.update({'id'})
+
+        data = getattr(self, fate)
+        if (len(data) > 0 and data is not sc._data_arrays and
+                all(sc._array_name(at) in data for at in array_types)):
+            # a previous weatherer already gathered these arrays in this step
+            # and the view was not reset since, so the fate mask is unchanged
+            return data
+
         self._set_data(sc, array_types,
-                       self._get_fate_mask(sc, fate),
+                       self._get_fate_index(sc, fate),
                        fate)
         return getattr(self, fate)
 
@@ -128,20 +229,42 @@ class FateDataView(AddLogger):
 
         .. note:: the 'id' of each LE corresponds with the index into SC array
             however, if LEs are removed, then this will not be the case. Do not
-            rely on this indexing. Instead, get the mask again - the assumption
-            is that the fate_mask should be the same between getting the data
+            rely on this indexing. Instead, get the fate index again - the
+            assumption is that it should be the same between getting the data
             and resync'ing the original arrays in the SC
         '''
         d_to_sync = getattr(self, fate)
 
         if d_to_sync is sc._data_arrays:
+            # weatherer worked on SC arrays directly. Find the LEs that no
+            # longer belong to the fate
+            if fate == 'all':
+                # compare with the arrays from when the view was set up
+                before = self._aliased.pop(fate, None)
+                after = self._fate_arrays(sc)
+                if (before is None or len(before) != len(after) or
+                        any(len(b) != len(a) for b, a in zip(before, after))):
+                    self.reset_index()
+                    return
+
+                changed = np.zeros((len(sc),), dtype=bool)
+                for b, a in zip(before, after):
+                    changed |= b != a
+
+                self._update_index(sc, np.where(changed)[0])
+            else:
+                index = self._get_fate_index(sc, fate)
+                self._update_index(sc, index[~self._get_fate_mask(sc, fate,
+                                                                  index)])
             return
 
-        w_mask = self._get_fate_mask(sc, fate)
+        if (fate in self._deferred and
+                not ('mass' in d_to_sync and
+                     np.any(np.isclose(d_to_sync['mass'], 0)))):
+            # keep working on the copy; the view would not be reset
+            return
 
-        if 'substance' in sc:
-            w_mask = np.logical_and(sc['substance'] == self.substance_id,
-                                    w_mask)
+        index = self._get_fate_index(sc, fate)
 
         # if fate_status of LEs was updated, then reset data attribute. This is
         # because the data in the attribute is no longer valid. For instance,
@@ -150,18 +273,25 @@ class FateDataView(AddLogger):
         # contained in the 'surface_weather' dict - easisest to reset the dict
         # and let it be recreated when the next weatherer asks for data.
         reset_view = False
-        if ('fate_status' in d_to_sync and
-            np.any(sc['fate_status'][w_mask] != d_to_sync['fate_status'])):
-                reset_view = True
-        elif ('mass' in d_to_sync and
-              np.any(np.isclose(d_to_sync['mass'], 0))):
+        changed = np.zeros((len(index),), dtype=bool)
+        if 'fate_status' in d_to_sync:
+            changed = sc['fate_status'][index] != d_to_sync['fate_status']
+            reset_view = np.any(changed)
+
+        if not reset_view and ('mass' in d_to_sync and
+                               np.any(np.isclose(d_to_sync['mass'], 0))):
             # probably need a threshold close to 0.0 as opposed to equality
             reset_view = True
             self.logger.debug(self._pid + "found LEs with 'mass' equal to 0. "
                               "reset_view")
 
         for key, val in d_to_sync.iteritems():
-            sc[key][w_mask] = val
+            sc[key][index] = val
+
+        if 'mass' in d_to_sync:
+            changed |= d_to_sync['mass'] <= 0.0
+
+        self._update_index(sc, index[changed])
 
         if reset_view:
             setattr(self, fate, {})
@@ -170,13 +300,16 @@ class FateDataView(AddLogger):
         '''
         reset all arrays that contain LE with 'id' = ix
         '''
+        # LEs were inserted in the SC arrays
+        self.reset_index()
+
         for fate in self._dicts_:
             data = getattr(self, fate)
             if len(data) > 0:
                 idx = np.where(data['id'] == ix)[0]
                 if len(idx) > 0:
                     self._set_data(sc, data.keys(),
-                                   self._get_fate_mask(sc, fate),
+                                   self._get_fate_index(sc, fate),
                                    fate)
 
 
@@ -292,14 +425,14 @@ class SpillContainerData(object):
         val_is_dict = []
         for key, val in self.__dict__.iteritems():
             'compare dict not including _data_arrays'
-            if isinstance(val, dict):
-                val_is_dict.append(key)
-            elif key == '_substances_spills' or key == '_fate_data_list':
+            if key in ('_substances_spills', '_fate_data_list', '_buffers'):
                 '''
                 this is just another view of the data - no need to write extra
                 code to check equality for this
                 '''
                 pass
+            elif isinstance(val, dict):
+                val_is_dict.append(key)
             elif val != other.__dict__[key]:
                 return False
 
@@ -342,6 +475,22 @@ class SpillContainerData(object):
         except StopIteration:
             return 0
 
+    def writeable(self, data_name):
+        '''
+        Return a writeable version of the data array. Data loaded from the
+        cache may be a read-only array shared with other consumers of the
+        same step - in this case a private copy is made the first time it is
+        requested. The copy replaces the shared array in this container only.
+
+        :param data_name: the name of the array to be returned
+        '''
+        array = self._data_arrays[data_name]
+        if not array.flags.writeable:
+            array = array.copy()
+            self._data_arrays[data_name] = array
+
+        return array
+
     @property
     def num_released(self):
         """
@@ -374,7 +523,16 @@ class SpillContainer(AddLogger, SpillContainerData):
 
     positions = spill_container['positions'] : returns a (num_LEs, 3) array of
     world_point_types
+
+    Internally, each data array is a view of the first num_released elements
+    of a larger preallocated buffer. The buffers grow by doubling their
+    capacity so releasing elements is amortized O(1) per element, and LEs
+    marked to_be_removed are compacted in place instead of reallocating every
+    array.
     """
+    # smallest number of elements allocated for a buffer when it grows
+    _min_capacity = 256
+
     def __init__(self, uncertain=False):
         super(SpillContainer, self).__init__(uncertain=uncertain)
         self.spills = OrderedCollection(dtype=gnome.spill.Spill)
@@ -389,6 +547,10 @@ class SpillContainer(AddLogger, SpillContainerData):
         created by the user.
         """
         super(SpillContainer, self).__setitem__(data_name, array)
+        if data_name in ('fate_status', 'mass', 'substance'):
+            for view in getattr(self, '_fate_data_list', []):
+                view.reset_index()
+
         if data_name not in self._array_types:
             shape = self._data_arrays[data_name].shape[1:]
             dtype = self._data_arrays[data_name].dtype.type
@@ -441,6 +603,46 @@ class SpillContainer(AddLogger, SpillContainerData):
         for viewer in self._fate_data_list:
             viewer.reset()
 
+    def set_fate_status(self, positions, status):
+        '''
+        set 'fate_status' of LEs at 'positions' to 'status'. Use this instead
+        of setting the array directly so the fate index of each FateDataView
+        is updated.
+
+        :param positions: index array of LEs
+        :param status: one of basic_types.fate
+        '''
+        self['fate_status'][positions] = status
+
+        if self._substances_spills is not None:
+            for view in self._fate_data_list:
+                view._update_index(self, positions)
+
+    @contextmanager
+    def deferred_fatedataview_sync(self, fate='surface_weather'):
+        '''
+        Context manager used by the Model to fuse weatherers: within it,
+        update_from_fatedataview() for 'fate' does not copy the data back
+        to the SC arrays, so successive weatherers work on the same gathered
+        arrays. They are synced once on exit.
+
+        The data is synced early if an LE's mass goes to 0 since the view must
+        then be reset. The weatherers run within this context must only use
+        'fate' data and must not change 'fate_status'.
+        '''
+        if self._substances_spills is None:
+            self._set_substancespills()
+
+        for view in self._fate_data_list:
+            view._deferred.add(fate)
+
+        try:
+            yield
+        finally:
+            for view in self._fate_data_list:
+                view._deferred.discard(fate)
+                view.update_sc(self, fate)
+
     def _set_substancespills(self):
         '''
         _substances could change when spills are added/deleted
@@ -627,7 +829,55 @@ class SpillContainer(AddLogger, SpillContainerData):
                                             initial_value=tuple([0] * self._oil_comp_array_len))
             else:
                 a_append = atype.initialize(num_released)
-            self._data_arrays[name] = np.r_[self._data_arrays[name], a_append]
+
+            num_used = len(self._data_arrays[name])
+            num_needed = num_used + num_released
+            buf = self._reserve_buffer(name, num_needed)
+            buf[num_used:num_needed] = a_append
+            self._data_arrays[name] = buf[:num_needed]
+
+    def _reserve_buffer(self, name, num_needed):
+        '''
+        return the buffer backing the data array 'name' with room for at least
+        num_needed elements. The current contents of the data array are
+        preserved. If the buffer must grow, its capacity is doubled so
+        repeated releases only copy the existing data O(log N) times.
+
+        If the data array is not a view of its buffer (for instance it was
+        replaced by __setitem__ or split_element), the buffer is reseeded from
+        the data array.
+        '''
+        arr = self._data_arrays[name]
+        buf = self._buffers.get(name)
+
+        if buf is None or arr.base is not buf:
+            buf = arr
+
+        if len(buf) < num_needed:
+            capacity = max(num_needed, 2 * len(buf), self._min_capacity)
+            new_buf = np.empty((capacity,) + arr.shape[1:], dtype=arr.dtype)
+            new_buf[:len(arr)] = arr
+            buf = new_buf
+
+        self._buffers[name] = buf
+        return buf
+
+    def delta_buffer(self):
+        '''
+        return a scratch (number_elements X 3) array of world_point_type.
+        Movers use it in accumulate_move() to compute their delta without
+        allocating a new array. It is shared by all movers and reused every
+        step, so its contents are undefined when it is returned.
+        '''
+        buf = self._buffers.get('_delta')
+        if buf is None or len(buf) < len(self):
+            capacity = max(len(self),
+                           2 * len(buf) if buf is not None else 0,
+                           self._min_capacity)
+            buf = np.empty((capacity, 3), dtype=world_point_type)
+            self._buffers['_delta'] = buf
+
+        return buf[:len(self)]
 
     def _set_substance_array(self, subs_idx, num_rel_by_substance):
         '''
@@ -856,6 +1106,9 @@ class SpillContainer(AddLogger, SpillContainerData):
         and prepare_for_model_run to define all data arrays.
         At this time the arrays are empty.
         """
+        # drop the preallocated buffers - array shapes may have changed
+        self._buffers = {}
+
         for name, atype in self._array_types.iteritems():
             # Initialize data_arrays with 0 elements
             if atype.shape is None:
@@ -985,9 +1238,26 @@ class SpillContainer(AddLogger, SpillContainerData):
                                  oil_status.to_be_removed)[0]
 
         if len(to_be_removed) > 0:
+            # compact the buffers in place - elements before the first removed
+            # LE do not move
+            keep = np.ones((len(self),), dtype=bool)
+            keep[to_be_removed] = False
+            first = to_be_removed[0]
+            num_keep = len(keep) - len(to_be_removed)
+
             for key in self._array_types.keys():
-                self._data_arrays[key] = np.delete(self[key], to_be_removed,
-                                                   axis=0)
+                arr = self._data_arrays[key]
+                buf = self._buffers.get(key)
+
+                if buf is not None and arr.base is buf:
+                    buf[first:num_keep] = arr[first:][keep[first:]]
+                    self._data_arrays[key] = buf[:num_keep]
+                else:
+                    self._data_arrays[key] = np.delete(arr, to_be_removed,
+                                                       axis=0)
+
+            for view in self._fate_data_list:
+                view._remove_from_index(keep)
 
     def __str__(self):
         return ('gnome.spill_container.SpillContainer\n'
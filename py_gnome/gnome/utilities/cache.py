@@ -9,7 +9,10 @@ import os
 import warnings
 import tempfile
 import shutil
-import copy
+import threading
+import weakref
+import Queue
+from collections import OrderedDict
 from multiprocessing import Lock
 
 import numpy
@@ -61,6 +64,107 @@ def clean_up_cache(dir_name=_cache_dir):
 import atexit
 atexit.register(clean_up_cache)
 
+# background writers still alive - flushed at exit, before the cache dirs
+# are cleaned up (atexit functions are called in reverse order)
+_writers = weakref.WeakSet()
+
+
+def _stop_writers():
+    for writer in list(_writers):
+        writer.stop()
+
+atexit.register(_stop_writers)
+
+
+def _snapshot(array):
+    '''
+    return a read-only copy of array
+    '''
+    snap = np.array(array, copy=True)
+    snap.flags.writeable = False
+
+    return snap
+
+
+class _WriteBehind(object):
+    '''
+    Writes the cached step files on a background thread so disk I/O is not
+    on the critical path of Model.step(). The queue is bounded so a slow
+    file system cannot accumulate an unbounded number of steps in memory -
+    put() blocks once max_queue steps are waiting to be written.
+
+    Each queued item is a function call identified by a key so callers can
+    check whether a given step is still waiting to be written. The arguments
+    given to put() must not be modified afterwards - ElementCache only gives
+    it read-only snapshots.
+    '''
+    def __init__(self, max_queue=4):
+        self._queue = Queue.Queue(maxsize=max_queue)
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._errors = []
+
+        self._thread = threading.Thread(target=self._run,
+                                        name='ElementCacheWriter')
+        self._thread.daemon = True
+        self._thread.start()
+
+        _writers.add(self)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+
+                key, func, args = item
+                func(*args)
+            except Exception, excp:
+                self._errors.append(excp)
+            finally:
+                if item is not None:
+                    with self._pending_lock:
+                        self._pending.discard(item[0])
+
+                self._queue.task_done()
+
+    def put(self, key, func, *args):
+        'queue func(*args) to be called on the writer thread'
+        with self._pending_lock:
+            self._pending.add(key)
+
+        self._queue.put((key, func, args))
+
+    def is_pending(self, key):
+        'True if item identified by key is queued or being written'
+        with self._pending_lock:
+            return key in self._pending
+
+    def flush(self):
+        '''
+        block until all queued files are written. Raise CacheError if any of
+        the writes failed.
+        '''
+        self._queue.join()
+
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise CacheError('failed to write cache file(s): {0}'
+                             .format(errors))
+
+    def stop(self):
+        'flush the queue and stop the thread'
+        if not self._thread.is_alive():
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            _writers.discard(self)
+
 
 class ElementCache(object):
     """
@@ -73,7 +177,8 @@ class ElementCache(object):
           the _cache_dir at the whim of the GC.
           We may want to manage this differently.
     """
-    def __init__(self, cache_dir=None, enabled=True):
+    def __init__(self, cache_dir=None, enabled=True, async_write=False,
+                 max_recent_bytes=0):
         """
         initialize a new cache object
 
@@ -81,20 +186,34 @@ class ElementCache(object):
                                should be stored.
                                If not provided, a temp dir will be created by
                                the python tempfile module
+        :param async_write=False: if True, write the step files to disk on a
+                                  background thread. See async_write property
+        :param max_recent_bytes=0: size in bytes of the in-memory cache of
+                                   recent steps. The most recently saved step
+                                   is always kept in memory, even if it is
+                                   larger than max_recent_bytes.
         """
+        self._writer = None
         self.create_new_dir(cache_dir)
 
-        # dict to hold recent data so we don't need to pull from the
-        # file system
-        self.recent = {}
+        # LRU of recent steps so we don't need to pull from the file system:
+        #    {step_num: [data, u_data]}
+        # least recently used step is first
+        self.max_recent_bytes = max_recent_bytes
+        self._reset_recent()
 
         # flag for whether to enable disk cache
         self.enabled = enabled
 
         self.lock = Lock()
 
+        self.async_write = async_write
+
     def __del__(self):
         'Clear out the cache when this object is deleted'
+        if self._writer is not None:
+            self._writer.stop()
+
         with self.lock:
             if os.path.isdir(self._cache_dir):
                 shutil.rmtree(self._cache_dir)
@@ -114,7 +233,60 @@ class ElementCache(object):
             return os.path.join(self._cache_dir,
                                 'step_%06i.npz' % step_num)
 
+    @property
+    def async_write(self):
+        '''
+        If True, step files are written by a background thread with a bounded
+        queue. Pending writes are flushed on rewind(), when load_timestep()
+        needs a step that is not written yet, and at interpreter exit.
+        '''
+        return self._writer is not None
+
+    @async_write.setter
+    def async_write(self, value):
+        if value and self._writer is None:
+            self._writer = _WriteBehind()
+        elif not value and self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+
+    def flush(self):
+        'block until all pending writes to disk are done'
+        if self._writer is not None:
+            self._writer.flush()
+
+    def _write(self, step_num, uncertain, data):
+        if self._writer is not None:
+            self._writer.put((step_num, uncertain),
+                             self._write_step, step_num, uncertain, data)
+        else:
+            self._write_step(step_num, uncertain, data)
+
+    def _wait_for(self, step_num, uncertain):
+        'flush pending writes if step has not been written yet'
+        if (self._writer is not None and
+                self._writer.is_pending((step_num, uncertain))):
+            self._writer.flush()
+
+    def _write_step(self, step_num, uncertain, data):
+        '''
+        write data for one step to disk - derived classes can override this
+        and _read_step to store the data in a different format
+        '''
+        np.savez(self._make_filename(step_num, uncertain), **data)
+
+    def _read_step(self, step_num, uncertain):
+        '''
+        return dict of arrays written by _write_step()
+
+        :raises IOError: if step is not on disk
+        '''
+        return dict(np.load(self._make_filename(step_num, uncertain)))
+
     def create_new_dir(self, cache_dir=None):
+        # pending writes go to the old directory
+        self.flush()
+
         if cache_dir is None:
             self._cache_dir = tempfile.mkdtemp(dir=_cache_dir)
         else:
@@ -129,66 +301,85 @@ class ElementCache(object):
         :param spill_container: the spill container at this step
         """
         for sc in spill_container_pair.items():
-            data = copy.deepcopy(sc.data_arrays)
+            # one copy per step - this snapshot is shared read-only by every
+            # load_timestep() call for this step
+            data = dict((name, _snapshot(array))
+                        for name, array in sc.data_arrays.iteritems())
 
             self._set_weathering_data(sc, data)
 
             if sc.current_time_stamp:
-                data['current_time_stamp'] = np.array(sc.current_time_stamp)
+                data['current_time_stamp'] = \
+                    _snapshot(np.array(sc.current_time_stamp))
 
             # # note: this assumes that the certain SC will be first!
 
             if sc.uncertain:
-                self.recent[step_num][1] = data
+                self._add_recent(step_num, self.recent[step_num][0], data)
             else:
-                # this creates a new dict, so only one step is saved
-                self.recent = {step_num: [data, None]}
+                # only the step being saved is protected from eviction
+                self._last_saved = step_num
+                self._add_recent(step_num, data, None)
 
             # write the data if enabled
-            # could be threaded -- data is a copy, so doesn't need to be
-            #                      re-used by anything
+            # may be threaded -- data is a read-only copy, so doesn't need
+            #                    to be re-used by anything
             if self.enabled:
-                filename = self._make_filename(step_num, sc.uncertain)
-                np.savez(filename, **data)
+                self._write(step_num, sc.uncertain, data)
 
     def load_timestep(self, step_num):
         """
         Returns a SpillContainer with the data arrays cached on disk
 
         :param step_num: the step number you want to load.
+
+        .. note:: data arrays for a step that is still held in memory are
+            read-only snapshots shared by every caller. Use
+            SpillContainerData.writeable() to get a private copy of an array
+            that needs to be modified.
         """
         # look first in in-memory cache.
         try:
-            # make a copy because we pop out the current_time_stamp
-            # make these changes to the copy so the self.recent does not change
-
-            (data_arrays, u_data_arrays) = copy.deepcopy(self.recent[step_num])
-
-            # copy.deepcopy(self.recent[step_num]) converts
-            # 'current_time_stamp' to datetime object
-            # To be consistent with np.load() operation below,
-            # make this an array.
-            if 'current_time_stamp' in data_arrays:
-                data_arrays['current_time_stamp'] = \
-                    np.array(data_arrays['current_time_stamp'])
-                if u_data_arrays:
-                    u_data_arrays['current_time_stamp'] = \
-                        np.array(u_data_arrays['current_time_stamp'])
+            (data_arrays, u_data_arrays) = self.recent.pop(step_num)
+
+            # most recently used goes to the end
+            self.recent[step_num] = [data_arrays, u_data_arrays]
+            self.hits += 1
         except KeyError:
             # not in the recent dict: try to load from disk
+            self.misses += 1
+            self._wait_for(step_num, False)
+            self._wait_for(step_num, True)
+
             try:
-                data_arrays = \
-                    dict(np.load(self._make_filename(step_num)))
+                data_arrays = self._read_step(step_num, False)
             except IOError:
                 raise CacheError('step: {0} is not in the cache'
                                  .format(step_num))
 
             try:
-                u_data_arrays = \
-                    dict(np.load(self._make_filename(step_num, True)))
+                u_data_arrays = self._read_step(step_num, True)
             except IOError:
                 u_data_arrays = None
 
+            for data in (data_arrays, u_data_arrays):
+                if data is not None:
+                    for array in data.itervalues():
+                        array.flags.writeable = False
+
+            # only keep it if it fits - don't evict the last saved step
+            if (self._nbytes(data_arrays) + self._nbytes(u_data_arrays) +
+                    self._recent_nbytes.get(self._last_saved, 0) <=
+                    self.max_recent_bytes):
+                self._add_recent(step_num, data_arrays, u_data_arrays)
+
+        # make a shallow copy of the dicts because we pop out the
+        # current_time_stamp - the arrays themselves are read-only and
+        # shared so they do not need to be copied
+        data_arrays = dict(data_arrays)
+        if u_data_arrays is not None:
+            u_data_arrays = dict(u_data_arrays)
+
         # HOWEVER, loading numpy arrays
         #     data_arrays = dict(np.load(self._make_filename(step_num)))
         # converts current_time_stamp to numpy.ndarray objects
@@ -221,6 +412,47 @@ class ElementCache(object):
 
         return scp
 
+    def _reset_recent(self):
+        self.recent = OrderedDict()
+        self._recent_nbytes = {}
+        self.recent_nbytes = 0
+        self._last_saved = None
+
+        # number of load_timestep() calls served from memory/disk
+        self.hits = 0
+        self.misses = 0
+
+    def _nbytes(self, data):
+        if data is None:
+            return 0
+
+        return sum(array.nbytes for array in data.itervalues())
+
+    def _add_recent(self, step_num, data, u_data):
+        '''
+        add (or replace) step in the LRU of recent steps, then evict the
+        least recently used steps until the total size is within
+        max_recent_bytes. The step that was just added and the most recently
+        saved step are never evicted.
+        '''
+        if step_num in self.recent:
+            del self.recent[step_num]
+            self.recent_nbytes -= self._recent_nbytes.pop(step_num)
+
+        self.recent[step_num] = [data, u_data]
+        nbytes = self._nbytes(data) + self._nbytes(u_data)
+        self._recent_nbytes[step_num] = nbytes
+        self.recent_nbytes += nbytes
+
+        keep = (step_num, self._last_saved)
+        for old_step in self.recent.keys():
+            if self.recent_nbytes <= self.max_recent_bytes:
+                break
+
+            if old_step not in keep:
+                del self.recent[old_step]
+                self.recent_nbytes -= self._recent_nbytes.pop(old_step)
+
     def _set_weathering_data(self, sc, data):
         'add mass balance data to arrays'
         if sc.mass_balance:
@@ -252,9 +484,116 @@ class ElementCache(object):
     def rewind(self):
         'Rewinds the cache -- clearing out everything'
         # clean out the in-memory cache
-        self.recent = {}
+        self._reset_recent()
+
+        # let pending writes finish before deleting their directory
+        self.flush()
 
         # clean out the disk cache
         if os.path.isdir(self._cache_dir):
             shutil.rmtree(self._cache_dir)
         os.mkdir(self._cache_dir)
+
+
+class MemmapElementCache(ElementCache):
+    """
+    ElementCache that stores the element data in one append-only flat binary
+    file per data array (and per forecast/uncertain), instead of one .npz
+    file per step. This is the same ragged layout NetCDFOutput uses with
+    'particle_count': each step's elements are appended to the end of the
+    file and an in-memory index keeps the offset and number of elements for
+    every step.
+
+    Data arrays of steps read back from disk are read-only np.memmap slices
+    of these files, so random access to a step costs one open per array and
+    no decompression.
+
+    Data that is not per element ('current_time_stamp' and the mass balance)
+    is small so it is held in the index.
+    """
+    def _reset_index(self):
+        # {(step_num, uncertain): (num_elements, {name: offset}, meta_data)}
+        self._index = {}
+
+        # {(name, uncertain): [dtype, shape, num_elements_in_file]}
+        self._files = {}
+
+    def create_new_dir(self, cache_dir=None):
+        super(MemmapElementCache, self).create_new_dir(cache_dir)
+        self._reset_index()
+
+        return True
+
+    def _make_array_filename(self, name, uncertain=False):
+        """
+        Returns the name of the file containing data array 'name' for all
+        the steps
+        """
+        if uncertain:
+            return os.path.join(self._cache_dir, '%s_uncert.dat' % name)
+        else:
+            return os.path.join(self._cache_dir, '%s.dat' % name)
+
+    def _meta_names(self, data):
+        'names of the arrays in data that are not per element'
+        names = {'current_time_stamp', 'mass_balance'}
+        if 'mass_balance' in data:
+            names.update(data['mass_balance'])
+
+        return names
+
+    def _write_step(self, step_num, uncertain, data):
+        meta_names = self._meta_names(data)
+        meta = {}
+        offsets = {}
+        num_elements = 0
+
+        for name, array in data.iteritems():
+            if name in meta_names or array.dtype.hasobject:
+                meta[name] = array
+                continue
+
+            num_elements = len(array)
+            key = (name, uncertain)
+            if key not in self._files:
+                self._files[key] = [array.dtype, array.shape[1:], 0]
+
+            dtype, shape, length = self._files[key]
+            if dtype != array.dtype or shape != array.shape[1:]:
+                raise CacheError('data array {0} changed dtype or shape in '
+                                 'the middle of a run'.format(name))
+
+            with open(self._make_array_filename(name, uncertain), 'ab') as f:
+                np.ascontiguousarray(array).tofile(f)
+
+            offsets[name] = length
+            self._files[key][2] = length + len(array)
+
+        self._index[(step_num, uncertain)] = (num_elements, offsets, meta)
+
+    def _read_step(self, step_num, uncertain):
+        try:
+            num_elements, offsets, meta = self._index[(step_num, uncertain)]
+        except KeyError:
+            raise IOError('step: {0} is not in the cache'.format(step_num))
+
+        data = dict(meta)
+        for name, offset in offsets.iteritems():
+            dtype, shape, _ = self._files[(name, uncertain)]
+            if num_elements == 0:
+                # cannot memory map 0 bytes
+                data[name] = np.empty((0,) + shape, dtype=dtype)
+            else:
+                itemsize = dtype.itemsize * int(np.prod(shape))
+                data[name] = \
+                    np.memmap(self._make_array_filename(name, uncertain),
+                              dtype=dtype,
+                              mode='r',
+                              offset=offset * itemsize,
+                              shape=(num_elements,) + shape)
+
+        return data
+
+    def rewind(self):
+        super(MemmapElementCache, self).rewind()
+        self._reset_index()
@@ -0,0 +1,30 @@
+'''
+Thread pools shared within a process
+
+The cython movers release the GIL while the C++ code runs, so work split
+across threads can run concurrently. Creating a pool for every call is
+expensive, so the pools are created once and shared.
+'''
+import os
+from multiprocessing.pool import ThreadPool
+
+_thread_pools = {}
+
+
+def get_thread_pool(num_threads, name='default'):
+    '''
+    return a ThreadPool with num_threads workers.
+
+    :param num_threads: number of worker threads
+    :param name: pools with different names are different pools. Work that
+        runs on a pool's worker thread must not wait for work submitted to
+        the same pool, so nested uses need different names.
+
+    The pools are keyed by process id as well since the worker threads do not
+    survive a fork.
+    '''
+    key = (os.getpid(), name, num_threads)
+    if key not in _thread_pools:
+        _thread_pools[key] = ThreadPool(num_threads)
+
+    return _thread_pools[key]
@@ -1,4 +1,4 @@
-from core import Weatherer, HalfLifeWeatherer
+from core import Weatherer, HalfLifeWeatherer, WeatheringForcing
 from evaporation import Evaporation
 from emulsification import Emulsification
 from natural_dispersion import NaturalDispersion
@@ -91,11 +91,96 @@ class RemoveMass(object):
         self._set__timestep(time_step, model_time)
 
 
+class CleanupScheduler(object):
+    '''
+    Marks LEs for removal by the cleanup operations. The Model shares one
+    scheduler between all its cleanup weatherers and resets it at the start
+    of each time step.
+
+    For each spill container and substance, the positions of the
+    'surface_weather' LEs and the cumulative sum of their mass are computed
+    once per step. Each request then only needs a binary search in the
+    cumulative mass, and the LEs are marked in place with
+    SpillContainer.set_fate_status(). Requests are served in the order they
+    are made so the LEs are marked exactly as if every weatherer gathered
+    the 'surface_weather' data itself.
+    '''
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        '''
+        drop the state kept for the current step
+        '''
+        self._candidates = {}
+
+    def mark(self, sc, substance, new_status, mass_to_remove,
+             oilwater_mix=True):
+        '''
+        Mark the first 'surface_weather' LEs of substance whose cumulative
+        mass reaches mass_to_remove as 'new_status'. If oilwater_mix is True,
+        the mass of the oil/water mixture is used.
+
+        See CleanUpBase._update_LE_status_codes()
+
+        :returns: (positions, all_marked) - the positions of the marked LEs
+            in the spill container and True if there was not enough mass so
+            all the 'surface_weather' LEs were marked
+        '''
+        key = (id(sc), id(substance))
+        cand = self._candidates.get(key)
+
+        if cand is None or cand['num_les'] != len(sc):
+            view = sc._get_fatedataview(substance)
+            cand = {'num_les': len(sc),
+                    'view': view,
+                    'positions': view._get_fate_index(sc, 'surface_weather'),
+                    'cumsum': {}}
+            self._candidates[key] = cand
+
+        positions = cand['positions']
+        cumsum = cand['cumsum'].get(oilwater_mix)
+
+        if cumsum is None:
+            curr_mass = sc['mass'][positions]
+            if oilwater_mix:
+                curr_mass = curr_mass / (1 - sc['frac_water'][positions])
+
+            cumsum = np.cumsum(curr_mass)
+            cand['cumsum'][oilwater_mix] = cumsum
+
+        if len(cumsum) == 0 or mass_to_remove >= cumsum[-1]:
+            num = len(positions)
+            all_marked = True
+        else:
+            # first LE where the total mass to remove is reached or exceeded
+            num = np.searchsorted(cumsum, mass_to_remove) + 1
+            all_marked = False
+
+        marked = positions[:num]
+        sc.set_fate_status(marked, new_status)
+
+        # gathered data no longer matches the fate_status
+        cand['view'].reset()
+
+        if (new_status & bt_fate.surface_weather !=
+                bt_fate.surface_weather and num > 0):
+            # these LEs are not candidates for the next request
+            cand['positions'] = positions[num:]
+            cand['cumsum'] = {}
+
+        return marked, all_marked
+
+
 class CleanUpBase(RemoveMass, Weatherer):
     '''
     Just need to add a few internal methods for Skimmer + Burn common code
     Currently defined as a base class.
     '''
+    # CleanupScheduler shared by the cleanup weatherers, set by the Model for
+    # the run. If None, a scheduler is used for each request
+    cleanup_scheduler = None
+
     def __init__(self, **kwargs):
         '''
         add 'frac_water' to array_types and pass **kwargs to base class
@@ -172,36 +257,29 @@ class CleanUpBase(RemoveMass, Weatherer):
         Note: For ChemicalDispersion, the mass_to_remove is not the mass of the
             oil/water mixture, but the mass of the oil. Use the oilwater_mix
             flag to indicate this is the case.
+
+        The LEs are selected and marked by the cleanup_scheduler, which
+        shares the cumulative mass of the surface LEs between the cleanup
+        operations that start in the same step.
         '''
-        arrays = {'fate_status', 'mass', 'frac_water'}
-        data = sc.substancefatedata(substance, arrays, 'surface_weather')
-        curr_mass = data['mass']
+        scheduler = self.cleanup_scheduler
+        if scheduler is None:
+            scheduler = CleanupScheduler()
 
-        if oilwater_mix:
-            # create a mass array of oil/water mixture and use this when
-            # marking LEs for removal
-            curr_mass = curr_mass / (1 - data['frac_water'])
+        marked, all_marked = scheduler.mark(sc, substance, new_status,
+                                            mass_to_remove, oilwater_mix)
 
-        # (1 - frac_water) * mass_to_remove
-        if mass_to_remove >= curr_mass.sum():
-            data['fate_status'][:] = new_status
+        if all_marked:
             self.logger.warning('{0} insufficient mass released for cleanup'
                                 .format(self._pid))
             self.logger.warning('{0} marked ALL ({1}) LEs, total mass: {2}'
                                 .format(self._pid,
-                                        len(data['fate_status']),
-                                        data['mass'].sum()))
+                                        len(marked),
+                                        sc['mass'][marked].sum()))
         else:
-            # sum up mass until threshold is reached, find index where
-            # total_mass_removed is reached or exceeded
-            ix = np.where(np.cumsum(curr_mass) >= mass_to_remove)[0][0]
-            # change status for elements upto and including 'ix'
-            data['fate_status'][:ix + 1] = new_status
-
             self.logger.debug(self._pid + 'marked {0} LEs with mass: '
-                              '{1}'.format(ix, data['mass'][:ix].sum()))
-
-        sc.update_from_fatedataview(substance, 'surface_weather')
+                              '{1}'.format(len(marked) - 1,
+                                           sc['mass'][marked[:-1]].sum()))
 
     def _avg_frac_oil(self, data):
         '''
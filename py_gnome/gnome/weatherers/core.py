@@ -23,6 +23,89 @@ class WeathererSchema(ObjType, ProcessSchema):
     description = 'weatherer schema base class'
 
 
+class WeatheringForcing(object):
+    '''
+    Table of the scalar forcings that weatherers derive from their wind, waves
+    and water objects, precomputed for every weathering substep of a run.
+    The Model builds it in setup_model_run() and sets it as the 'forcing'
+    attribute of the weatherers.
+
+    The table is a numpy structured array with one row per substep time. It
+    is only used while the wind, waves and water objects are unchanged - if
+    one of them is modified during the run, lookup() returns None and the
+    weatherers query the environment objects directly.
+    '''
+    dtype = np.dtype([('time', 'datetime64[s]'),
+                      ('wind_speed', np.float64),
+                      ('emulsification_wind', np.float64),
+                      ('wave_height', np.float64),
+                      ('peak_period', np.float64),
+                      ('whitecap_fraction', np.float64),
+                      ('dissipation_energy', np.float64),
+                      ('water_temp', np.float64)])
+
+    def __init__(self, times, wind=None, waves=None, water=None):
+        '''
+        :param times: sequence of datetime objects - the substep times
+        :param wind: Wind object or None
+        :param waves: Waves object or None
+        :param water: Water object or None
+
+        Forcings for objects that are None are set to NaN
+        '''
+        self.wind = wind
+        self.waves = waves
+        self.water = water
+
+        self.data = np.zeros((len(times),), dtype=self.dtype)
+        for name in self.dtype.names[1:]:
+            self.data[name] = np.nan
+
+        self.data['time'] = times
+        self._index = dict((t, ix) for ix, t in enumerate(times))
+
+        if len(times) == 0:
+            pass
+        elif hasattr(wind, 'get_wind_data'):
+            self.data['wind_speed'] = \
+                wind.get_wind_data(times, 'm/s', 'r-theta')['value'][:, 0]
+        elif wind is not None:
+            self.data['wind_speed'] = [wind.get_value(t)[0] for t in times]
+
+        if len(times) > 0 and waves is not None:
+            (self.data['wave_height'],
+             self.data['peak_period'],
+             self.data['whitecap_fraction'],
+             self.data['dissipation_energy']) = waves.get_value(times)
+            self.data['emulsification_wind'] = \
+                waves.get_emulsification_wind(times)
+
+        if water is not None:
+            self.data['water_temp'] = water.get('temperature', 'K')
+
+        self._sources_state = self._get_sources_state()
+
+    def __len__(self):
+        return len(self.data)
+
+    def _get_sources_state(self):
+        return tuple(obj._memo_state() if hasattr(obj, '_memo_state')
+                     else None
+                     for obj in (self.wind, self.waves, self.water))
+
+    def lookup(self, model_time):
+        '''
+        return the row of the table for model_time or None if model_time is
+        not a substep time of the table or if the wind, waves or water
+        objects were modified since it was built
+        '''
+        ix = self._index.get(model_time)
+        if ix is None or self._get_sources_state() != self._sources_state:
+            return None
+
+        return self.data[ix]
+
+
 class Weatherer(Process):
     '''
     Base Weathering agent.  This is almost exactly like the base Mover
@@ -33,6 +116,14 @@ class Weatherer(Process):
     _state = copy.deepcopy(Process._state)
     _schema = WeathererSchema  # nothing new added so use this schema
 
+    # WeatheringForcing table set by the Model for the run. Not serialized
+    forcing = None
+
+    # True if weather_elements() only works on 'surface_weather' data and
+    # does not change 'fate_status' so Model can run it fused with adjacent
+    # weatherers - see Model.weather_elements()
+    _fusable = False
+
     def __init__(self, **kwargs):
         '''
         Base weatherer class; defines the API for all weatherers
@@ -89,6 +180,33 @@ class Weatherer(Process):
         '''
         pass
 
+    def _get_forcing(self, model_time, name):
+        '''
+        value of forcing 'name' at model_time from the precomputed forcing
+        table. Returns None if there is no table or it is not valid for
+        model_time; the caller then computes it from the environment objects
+        '''
+        values = self._get_forcing_row(model_time, name)
+        if values is None:
+            return None
+
+        return values[0]
+
+    def _get_forcing_row(self, model_time, *names):
+        '''
+        like _get_forcing() for several forcings at once - returns a tuple of
+        their values, all from the same row of the table, or None if any of
+        them is not available
+        '''
+        if self.forcing is None:
+            return None
+
+        row = self.forcing.lookup(model_time)
+        if row is None or any(np.isnan(row[name]) for name in names):
+            return None
+
+        return tuple(row[name] for name in names)
+
     def _halflife(self, M_0, factors, time):
         'Assumes our factors are half-life values'
         half = np.float64(0.5)
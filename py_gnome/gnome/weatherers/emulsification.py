@@ -23,6 +23,8 @@ from gnome.persist import class_from_objtype
 
 
 class Emulsification(Weatherer, Serializable):
+    _fusable = True
+
     _state = copy.deepcopy(Weatherer._state)
     _state += [Field('waves', save=True, update=True, save_reference=True)]
     _schema = WeathererSchema
@@ -180,7 +182,9 @@ class Emulsification(Weatherer, Serializable):
         '''
 
         ## higher of real or psuedo wind
-        wind_speed = self.waves.get_emulsification_wind(model_time)
+        wind_speed = self._get_forcing(model_time, 'emulsification_wind')
+        if wind_speed is None:
+            wind_speed = self.waves.get_emulsification_wind(model_time)
 
         # water uptake rate constant - get this from database
         K0Y = substance.get('k0y')
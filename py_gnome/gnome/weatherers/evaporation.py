@@ -17,6 +17,8 @@ from gnome.exceptions import ReferencedObjectNotSet
 
 
 class Evaporation(Weatherer, Serializable):
+    _fusable = True
+
     _state = copy.deepcopy(Weatherer._state)
     _state += [Field('water', save=True, update=True, save_reference=True),
                Field('wind', save=True, update=True, save_reference=True)]
@@ -71,17 +73,28 @@ class Evaporation(Weatherer, Serializable):
 
         .. note:: wind speed is at least 1 m/s.
         '''
-        wind_speed = max(1, self.wind.get_value(model_time)[0])
+        wind_speed = self._get_forcing(model_time, 'wind_speed')
+        if wind_speed is None:
+            wind_speed = self.wind.get_value(model_time)[0]
+
+        wind_speed = max(1, wind_speed)
         c_evap = 0.0025     # if wind_speed in m/s
         if wind_speed <= 10.0:
             return c_evap * wind_speed ** 0.78
         else:
             return 0.06 * c_evap * wind_speed ** 2
 
+    def _water_temp(self, model_time):
+        water_temp = self._get_forcing(model_time, 'water_temp')
+        if water_temp is None:
+            water_temp = self.water.get('temperature', 'K')
+
+        return water_temp
+
     def _set_evap_decay_constant(self, model_time, data, substance, time_step):
         # used to compute the evaporation decay constant
         K = self._mass_transport_coeff(model_time)
-        water_temp = self.water.get('temperature', 'K')
+        water_temp = self._water_temp(model_time)
 
         f_diff = 1.0
         if 'frac_water' in data:
@@ -240,7 +253,7 @@ class BlobEvaporation(Evaporation):
         # blobs released together
         # used to compute the evaporation decay constant
         K = self._mass_transport_coeff(model_time)
-        water_temp = self.water.get('temperature', 'K')
+        water_temp = self._water_temp(model_time)
 
         f_diff = 1.0
         if 'frac_water' in data:
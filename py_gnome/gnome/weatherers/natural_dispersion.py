@@ -24,6 +24,8 @@ from gnome.weatherers import Weatherer
 
 
 class NaturalDispersion(Weatherer, Serializable):
+    _fusable = True
+
     _state = copy.deepcopy(Weatherer._state)
     _state += [Field('water', save=True, update=True, save_reference=True),
                Field('waves', save=True, update=True, save_reference=True)]
@@ -87,9 +89,13 @@ class NaturalDispersion(Weatherer, Serializable):
             return
 
         # from the waves module
-        wave_height = self.waves.get_value(model_time)[0]
-        frac_breaking_waves = self.waves.get_value(model_time)[2]
-        disp_wave_energy = self.waves.get_value(model_time)[3]
+        row = self._get_forcing_row(model_time, 'wave_height',
+                                    'whitecap_fraction', 'dissipation_energy')
+        if row is not None:
+            (wave_height, frac_breaking_waves, disp_wave_energy) = row
+        else:
+            (wave_height, _, frac_breaking_waves,
+             disp_wave_energy) = self.waves.get_value(model_time)
 
         visc_w = self.waves.water.kinematic_viscosity
         rho_w = self.waves.water.density
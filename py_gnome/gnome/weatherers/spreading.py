@@ -5,7 +5,6 @@ Include the Langmuir process here as well
 import copy
 
 import numpy as np
-from repoze.lru import lru_cache
 from colander import SchemaNode, Float, drop
 
 from gnome.utilities.serializable import Serializable, Field
@@ -56,15 +55,14 @@ class FayGravityViscous(Weatherer, Serializable):
         self._init_relative_buoyancy = None
         self.thickness_limit = None
 
-    @lru_cache(4)
     def _gravity_spreading_t0(self,
                               water_viscosity,
                               relative_buoyancy,
                               blob_init_vol):
         '''
         time for the initial transient phase of spreading to complete. This
-        depends on blob volume, but is on the order of minutes. Cache upto 4
-        inputs - don't expect 4 or more spills in one scenario.
+        depends on blob volume, but is on the order of minutes.
+        blob_init_vol can be a scalar or a numpy array with one value per blob
         '''
         # time to reach a0
         t0 = ((self.spreading_const[1]/self.spreading_const[0]) ** 4.0 *
@@ -136,13 +134,18 @@ class FayGravityViscous(Weatherer, Serializable):
                     relative_buoyancy,
                     blob_init_volume,
                     area,
-                    age):
+                    age,
+                    spill_num=None):
         '''
         update area array in place, also return area array
         each blob is defined by its age. This updates the area of each blob,
         as such, use the mean relative_buoyancy for each blob. Still check
         and ensure relative buoyancy is > 0 for all LEs
 
+        All blobs are updated together with numpy operations - LEs are grouped
+        into blobs with np.unique(return_inverse=True) and the blob areas
+        summed with np.bincount()
+
         :param water_viscosity: viscosity of water
         :type water_viscosity: float
         :param relative_buoyancy: relative buoyancy of oil wrt water at release
@@ -169,6 +172,10 @@ class FayGravityViscous(Weatherer, Serializable):
             viscosity of oil. This is used by Langmuir since the process acts
             on particles after spreading completes.
         :type at_max_area: numpy array of bools
+        :param spill_num=None: optional numpy array the same size as area.
+            If given, LEs belong to the same blob if they have the same age
+            and spill_num, so LEs of all spills can be updated in one call.
+        :type spill_num: numpy array of ints
 
         :returns: (updated 'area' array, updated 'at_max_area' array).
             It also changes the input 'area' array and the 'at_max_area' bool
@@ -179,39 +186,54 @@ class FayGravityViscous(Weatherer, Serializable):
             msg = "use init_area for age == 0"
             raise ValueError(msg)
 
-        # update area for each blob of LEs
-        for b_age in np.unique(age):
-            # within each age blob_init_volume should also be the same
-            m_age = b_age == age
-            t0 = self._gravity_spreading_t0(water_viscosity,
-                                            relative_buoyancy,
-                                            blob_init_volume[m_age][0])
-
-            if b_age <= t0:
-                '''
-                only update initial area, A_0, if age is past the transient
-                phase. Expect this to be the case since t0 is on the order of
-                minutes; but do a check incase we want to experiment with
-                smaller timesteps.
-                '''
-                continue
+        if len(age) == 0:
+            return area
 
-            # now update area of old LEs - only update till max area is reached
-            max_area = blob_init_volume[m_age][0]/self.thickness_limit
-            if area[m_age].sum() < max_area:
-                # update area
-                blob_area = \
-                    self._update_blob_area(water_viscosity,
+        if spill_num is None:
+            blobs = age
+        else:
+            blobs = np.empty((len(age),), dtype=[('spill_num', spill_num.dtype),
+                                                 ('age', age.dtype)])
+            blobs['spill_num'] = spill_num
+            blobs['age'] = age
+
+        # blob_ix maps each LE to its blob; first is the first LE of each blob
+        # within each blob, age and blob_init_volume are the same
+        _, first, blob_ix = np.unique(blobs,
+                                      return_index=True,
+                                      return_inverse=True)
+        b_age = age[first]
+        b_init_vol = blob_init_volume[first]
+        num_les = np.bincount(blob_ix)
+
+        t0 = self._gravity_spreading_t0(water_viscosity,
+                                        relative_buoyancy,
+                                        b_init_vol)
+
+        # only update initial area, A_0, if age is past the transient
+        # phase. Expect this to be the case since t0 is on the order of
+        # minutes; but do a check incase we want to experiment with
+        # smaller timesteps.
+        # Also, only update area of old LEs till max area is reached
+        max_area = b_init_vol/self.thickness_limit
+        update = np.logical_and(b_age > t0,
+                                np.bincount(blob_ix, weights=area) < max_area)
+        if not np.any(update):
+            return area
+
+        blob_area = self._update_blob_area(water_viscosity,
                                            relative_buoyancy,
-                                           blob_init_volume[m_age][0],
-                                           age[m_age][0])
-                if blob_area >= max_area:
-                    area[m_age] = max_area/m_age.sum()
-                else:
-                    area[m_age] = blob_area/m_age.sum()
+                                           b_init_vol[update],
+                                           b_age[update])
+        new_area = np.zeros_like(max_area)
+        new_area[update] = (np.minimum(blob_area, max_area[update]) /
+                            num_les[update])
+
+        le_update = update[blob_ix]
+        area[le_update] = new_area[blob_ix[le_update]]
 
-                self.logger.debug(self._pid +
-                                  "\tarea after update: {0}".format(blob_area))
+        self.logger.debug(self._pid +
+                          "\tarea after update: {0}".format(blob_area))
 
         return area
 
@@ -329,15 +351,14 @@ class FayGravityViscous(Weatherer, Serializable):
             if len(data['fay_area']) == 0:
                 continue
 
-            for s_num in np.unique(data['spill_num']):
-                s_mask = data['spill_num'] == s_num
-                data['fay_area'][s_mask] = \
-                    self.update_area(water_kvis,
-                                     self._init_relative_buoyancy,
-                                     data['bulk_init_volume'][s_mask],
-                                     data['fay_area'][s_mask],
-                                     data['age'][s_mask] + time_step)
-                data['area'][s_mask] = data['fay_area'][s_mask]
+            # update all blobs of all spills together
+            self.update_area(water_kvis,
+                             self._init_relative_buoyancy,
+                             data['bulk_init_volume'],
+                             data['fay_area'],
+                             data['age'] + time_step,
+                             data['spill_num'])
+            data['area'][:] = data['fay_area']
 
         sc.update_from_fatedataview()
 
@@ -427,7 +448,11 @@ class Langmuir(Weatherer, Serializable):
         the bounds of (0.1, or 1.0), then limit it to:
             0.1 <= frac_cov <= 1.0
         '''
-        v_max = self.wind.get_value(model_time)[0] * 0.005
+        wind_speed = self._get_forcing(model_time, 'wind_speed')
+        if wind_speed is None:
+            wind_speed = self.wind.get_value(model_time)[0]
+
+        v_max = wind_speed * 0.005
         cr_k = \
             (v_max**2 * 4 * np.pi**2/(thickness * rel_buoy * gravity))**(1./3)
         frac_cov = 1./cr_k
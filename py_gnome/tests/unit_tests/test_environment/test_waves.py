@@ -261,3 +261,57 @@ def test_get_emulsification_wind_with_wave_height2():
     ## input wave height should not have overwhelmed wind speed
     assert w.get_emulsification_wind(start_time)  ==  10.0
 
+
+
+def test_get_value_memoized():
+    'results are reused until the wind or water objects change'
+    wind = constant_wind(5., 0)
+    water = Water()
+    w = Waves(wind, water)
+
+    val = w.get_value(start_time)
+    assert w.get_value(start_time) is val
+    assert w.wind.get_value(start_time) is wind.get_value(start_time)
+
+    # change to wind timeseries
+    wind.set_wind_data(np.array((start_time, (10, 0)),
+                                dtype=datetime_value_2d).reshape((1, )),
+                       'meter per second')
+    assert w.get_value(start_time)[0] > val[0]
+
+    # change to water attribute
+    water.wave_height = 1.0
+    assert w.get_value(start_time)[0] == 1.0
+
+    # change to water units, in place
+    temp = water.get('temperature', 'K')
+    water.set('temperature', 20, 'C')
+    assert water.get('temperature', 'K') != temp
+    water.units['temperature'] = 'K'
+    assert water.get('temperature', 'K') == 20
+
+
+@pytest.mark.parametrize("fetch", [None, 1e4])
+def test_get_value_array(fetch):
+    'an array of times gives the same values as calling for each time'
+    series = np.zeros((3, ), dtype=datetime_value_2d)
+    series['time'] = [start_time + datetime.timedelta(hours=h)
+                      for h in (0, 3, 6)]
+    series['value'] = [(2, 0), (5, 0), (15, 0)]
+    wind = Wind(timeseries=series, units='meter per second')
+    water = Water(fetch=fetch)
+    w = Waves(wind, water)
+
+    times = [start_time + datetime.timedelta(hours=h) for h in range(7)]
+    vals = w.get_value(times)
+
+    for i, t in enumerate(times):
+        assert np.allclose([v[i] for v in vals], w.get_value(t))
+
+    assert np.allclose(w.get_emulsification_wind(times),
+                       [w.get_emulsification_wind(t) for t in times])
+
+    water.wave_height = 1.0
+    vals = w.get_value(times)
+    assert np.all(vals[0] == 1.0)
+    assert np.allclose([v[3] for v in vals], w.get_value(times[3]))
@@ -206,6 +206,24 @@ class Test_RasterMap:
         print 'testing a water point:'
         assert not gmap.on_land((19.0, 11.0, 0.))
 
+    def test_on_land_pixel_array(self):
+        gmap = RasterMap(refloat_halflife=6, bitmap_array=self.raster,
+                         map_bounds=((0, 0), (0, 10), (15, 10), (15, 0)),
+                         projection=NoProjection())
+
+        coords = np.array(((10, 6), (7, 5), (19, 11), (0, 0),
+                           (12, 7), (-1, 5), (25, 3)), dtype=np.int32)
+        on_land = gmap._on_land_pixel_array(coords)
+
+        assert on_land.shape == (len(coords),)
+        assert np.all(on_land == (1, 1, 0, 0, 1, 0, 0))
+
+        # outside map_bounds is not on land even if the raster is land
+        gmap.map_bounds = np.array(((0, 0), (0, 10), (9, 10), (9, 0)),
+                                   dtype=np.float64)
+        on_land = gmap._on_land_pixel_array(coords)
+        assert np.all(on_land == (0, 1, 0, 0, 0, 0, 0))
+
     def test_spillable_area(self):
 
         # anywhere not on land is spillable...
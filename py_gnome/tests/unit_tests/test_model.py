@@ -33,7 +33,8 @@ from gnome.weatherers import (HalfLifeWeatherer,
                               ChemicalDispersion,
                               Burn,
                               Skimmer,
-                              Emulsification)
+                              Emulsification,
+                              NaturalDispersion)
 from gnome.outputters import Renderer, TrajectoryGeoJsonOutput
 
 from conftest import sample_model_weathering, testdata, test_oil
@@ -1054,6 +1055,66 @@ def test_staggered_spills_weathering(sample_model_fcn, delay):
     assert np.isclose(exp_total_mass, sc.mass_balance['amount_released'])
 
 
+def test_fuse_weathering(sample_model_fcn):
+    '''
+    running Evaporation, NaturalDispersion and Emulsification fused gives the
+    same results as running them one at a time
+    '''
+    model = sample_model_weathering(sample_model_fcn, test_oil)
+    model.map = gnome.map.GnomeMap()    # make it all water
+    model.weathering_substeps = 2
+    model.weatherers += [Evaporation(),
+                         NaturalDispersion(),
+                         Emulsification()]
+    model.set_make_default_refs(True)
+
+    results = []
+    for fuse in (False, True):
+        model.rewind()
+        model.fuse_weathering = fuse
+        model.full_run()
+
+        sc = model.spills.items()[0]
+        results.append((dict(sc.mass_balance),
+                        sc['mass_components'].copy(),
+                        sc['frac_water'].copy()))
+
+    (mb, mass_components, frac_water), fused = results
+    assert np.allclose(mass_components, fused[1])
+    assert np.allclose(frac_water, fused[2])
+    for key, val in mb.iteritems():
+        assert np.isclose(val, fused[0][key])
+
+
+def test_concurrent_spills():
+    '''
+    moving the forecast and uncertain spill containers on separate threads
+    gives the same results as moving them one after the other
+    '''
+    start_time = datetime(2012, 9, 15, 12, 0)
+    model = Model(start_time=start_time,
+                  time_step=timedelta(minutes=15), duration=timedelta(hours=3),
+                  uncertain=True)
+    model.movers += WindMover(constant_wind(5., 30.))
+    model.spills += point_line_release_spill(100, (0., 0., 0.), start_time,
+                                             end_position=(0.1, 0.1, 0.))
+
+    results = []
+    for concurrent in (False, True):
+        model.rewind()
+        model.concurrent_spills = concurrent
+        model.full_run()
+
+        results.append([sc['positions'].copy()
+                        for sc in model.spills.items()])
+
+    for positions, concurrent_positions in zip(*results):
+        assert np.all(positions == concurrent_positions)
+
+    model.movers += RandomMover()
+    assert not model._move_spills_concurrently(model.spills.items())
+
+
 @pytest.mark.parametrize(("s0", "s1"),
                          [(test_oil, test_oil),
                           (test_oil, "ARABIAN MEDIUM, EXXON")
@@ -8,6 +8,7 @@ import numpy as np
 
 from gnome import scripting
 from gnome.basic_types import datetime_value_2d
+from gnome.exceptions import GnomeRuntimeError
 
 from gnome.model import Model
 
@@ -21,7 +22,14 @@ from gnome.weatherers import Evaporation, ChemicalDispersion, Burn, Skimmer
 
 from gnome.outputters import WeatheringOutput, TrajectoryGeoJsonOutput
 
-from gnome.multi_model_broadcast import ModelBroadcaster
+import gnome.multi_model_broadcast as mmb
+from gnome.multi_model_broadcast import (ModelBroadcaster,
+                                         ModelWorkerPool,
+                                         ModelEnsemble,
+                                         parameter_grid,
+                                         set_model_attribute,
+                                         dumps_shared,
+                                         loads_shared)
 from conftest import testdata, test_oil
 
 from pprint import PrettyPrinter
@@ -228,6 +236,134 @@ def test_full_run():
     model_broadcaster.stop()
 
 
+def test_full_run_iter():
+    model = make_model()
+
+    model_broadcaster = ModelBroadcaster(model,
+                                         ('down', 'up'),
+                                         ('down', 'up'))
+    num_steps = model_broadcaster.cmd('num_time_steps', {})
+
+    res = list(model_broadcaster.full_run_iter())
+    assert len(res) == sum(num_steps)
+
+    for key in model_broadcaster.lookup:
+        steps = [step_num for k, step_num, _ in res if k == key]
+        # each consumer's steps are yielded in order
+        assert steps == range(num_steps[0])
+
+    # stopping early leaves the broadcaster usable
+    for r in model_broadcaster.cmd_iter('rewind', {}):
+        break
+    assert len(dict(model_broadcaster.cmd_iter('rewind', {}))) == 4
+
+    model_broadcaster.stop()
+
+
+def test_worker_pool():
+    model = make_model()
+    pool = ModelWorkerPool(num_workers=2)
+    assert len(pool) == 2
+
+    # pool grows when more workers are needed
+    model_broadcaster = ModelBroadcaster(model,
+                                         ('down', 'up'),
+                                         ('down', 'up'),
+                                         pool=pool)
+    assert len(pool) == 4
+    assert pool.num_free == 0
+
+    # every worker got its setup commands
+    assert model_broadcaster.cmd('get_cache_enabled', {}) == [False] * 4
+    assert len(set(model_broadcaster.cmd('get_cache_dir', {}))) == 4
+    assert not any(model_broadcaster.cmd('get_spill_container_uncertainty',
+                                         {}))
+
+    res = model_broadcaster.cmd('get_spill_amounts', {}, ('up', 'up'))
+    assert np.isclose(res[0], 1666.66666)
+
+    model_broadcaster.stop()
+    assert pool.num_free == 4
+
+    # same processes are reused for the next model
+    model_broadcaster = ModelBroadcaster(model,
+                                         ('down', 'up'),
+                                         ('normal',),
+                                         pool=pool)
+    assert len(pool) == 4
+    res = model_broadcaster.cmd('step', {})
+    assert len(res) == 2
+    model_broadcaster.stop()
+
+    pool.stop()
+
+
+def test_set_model_attribute():
+    model = make_model()
+
+    set_model_attribute(model, 'movers[0].diffusion_coef', 1000.)
+    assert model.movers[0].diffusion_coef == 1000.
+
+    set_model_attribute(model, 'environment[Water].temperature', 300.)
+    assert [e for e in model.environment
+            if isinstance(e, Water)][0].temperature == 300.
+
+    with raises(ValueError):
+        set_model_attribute(model, 'environment[NotThere].temperature', 1.)
+
+
+def test_parameter_grid():
+    grid = parameter_grid({'movers[0].diffusion_coef': [1e5, 2e5],
+                           'environment[Water].temperature': [280., 300.]})
+
+    assert len(grid) == 4
+    assert {'movers[0].diffusion_coef': 2e5,
+            'environment[Water].temperature': 280.} in grid
+
+
+def test_model_ensemble():
+    model = make_model()
+    model.duration = timedelta(hours=6)
+
+    pool = ModelWorkerPool(num_workers=2)
+    ensemble = ModelEnsemble(model,
+                             parameter_grid({'environment[Water].temperature':
+                                             [280., 290., 300.]}),
+                             pool=pool)
+    res = ensemble.run()
+    assert len(res) == 3
+    assert pool.num_free == 2
+
+    pct = ensemble.mass_balance_percentiles((5, 50, 95))
+    assert pct['evaporated'].shape == (3, len(pct['time']))
+    assert np.all(pct['evaporated'][0] <= pct['evaporated'][2])
+
+    pool.stop()
+
+
+def test_mass_balance_percentiles():
+    t0 = datetime(2015, 1, 1)
+    times = [t0 + timedelta(hours=h) for h in range(3)]
+
+    ensemble = ModelEnsemble(None, [{'a': 1}, {'a': 2}, {'a': 3}])
+    ensemble.results = [{'time': times,
+                         'evaporated': np.array([0., 1., 2.])},
+                        {'time': times,
+                         'evaporated': np.array([0., 3., np.nan])},
+                        {'time': times,
+                         'evaporated': np.array([0., 5., 4.])}]
+
+    pct = ensemble.mass_balance_percentiles((0, 50, 100))
+    assert pct['time'] == times
+    assert np.all(pct['evaporated'][1] == [0., 3., 3.])
+    assert not np.any(np.isnan(pct['evaporated']))
+
+    ensemble.results[2]['time'] = times[:2]
+    ensemble.results[2]['evaporated'] = np.array([0., 5.])
+    with raises(GnomeRuntimeError):
+        ensemble.mass_balance_percentiles()
+
+
 def test_cache_dirs():
     model = make_model()
 
@@ -283,6 +419,53 @@ def test_weathering_output_only():
     model_broadcaster.stop()
 
 
+def test_shared_memory_pickle(tmpdir):
+    filename = str(tmpdir.join('Data-test'))
+    big = np.arange(10000, dtype=np.float64).reshape(-1, 2)
+    small = np.arange(4)
+
+    msg = dumps_shared({'big': big, 'small': small, 'other': [1, 'a']},
+                       filename, min_nbytes=1024)
+
+    # only the small array goes in the message
+    assert len(msg) < big.nbytes
+    assert os.path.isfile(filename)
+
+    res = loads_shared(msg)
+    assert np.array_equal(res['big'], big)
+    assert np.array_equal(res['small'], small)
+    assert res['other'] == [1, 'a']
+
+    # file is removed once the message is loaded
+    assert not os.path.isfile(filename)
+
+
+def test_shared_memory_unlink_retry(tmpdir, monkeypatch):
+    '''
+    a shared memory file that can't be unlinked while its arrays are mapped
+    is kept and removed by a later loads_shared()
+    '''
+    filename = str(tmpdir.join('Data-test'))
+    big = np.arange(10000, dtype=np.float64)
+
+    def unlink_fails(path):
+        raise OSError('file in use')
+
+    monkeypatch.setattr(mmb.os, 'unlink', unlink_fails)
+    res = loads_shared(dumps_shared(big, filename, min_nbytes=1024))
+    monkeypatch.undo()
+
+    assert np.array_equal(res, big)
+    assert os.path.isfile(filename)
+    assert filename in mmb._pending_unlinks
+
+    del res
+    loads_shared(dumps_shared(None, filename))
+
+    assert not os.path.isfile(filename)
+    assert filename not in mmb._pending_unlinks
+
+
 if __name__ == '__main__':
     scripting.make_images_dir()
 
@@ -104,6 +104,23 @@ def test_certain_uncertain():
     assert np.all(delta[:, 2] == u_delta[:, 2])
 
 
+def test_loop_threads():
+    """
+    moving the forecast LEs on threads gives the same delta, with the tide
+    looked up once per step
+    """
+    pSpill = sample_sc_release(10, start_pos, rel_time)
+    cats = CatsMover(curr_file, tide=td)
+    delta = np.copy(_certain_loop(pSpill, cats))
+
+    cats.num_threads = 3
+    cats._min_chunk_size = 1
+    threaded = _certain_loop(pSpill, cats)
+
+    _assert_move(threaded)
+    assert np.all(threaded == delta)
+
+
 c_cats = CatsMover(curr_file)
 
 
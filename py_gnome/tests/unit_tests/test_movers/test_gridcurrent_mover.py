@@ -94,6 +94,82 @@ def test_certain_uncertain():
     assert np.all(delta[:, :2] == u_delta[:, :2])
 
 
+def test_cell_index():
+    """
+    the cell index array is filled in by get_move and starting the search
+    from it gives the same move as the full search
+    """
+    curr = GridCurrentMover(curr_file, topology_file)
+    assert 'current_cell_index' in curr.array_types
+
+    pSpill = sample_sc_release(num_le, start_pos, rel_time,
+                               arr_types=curr.array_types)
+    assert np.all(pSpill['current_cell_index'] == -1)
+
+    delta = _certain_loop(pSpill, curr)
+    assert np.all(pSpill['current_cell_index'] >= 0)
+
+    # second call starts from the cells found above
+    assert np.all(_certain_loop(pSpill, curr) == delta)
+
+
+def test_loop_threads():
+    """
+    moving the forecast LEs on threads gives the same delta and cell index
+    as a single call - the cell search hint is kept per thread
+    """
+    curr = GridCurrentMover(curr_file, topology_file)
+    pSpill = sample_sc_release(10, start_pos, rel_time,
+                               arr_types=curr.array_types)
+    delta = np.copy(_certain_loop(pSpill, curr))
+    cell_index = np.copy(pSpill['current_cell_index'])
+
+    pSpill['current_cell_index'][:] = -1
+    curr.num_threads = 3
+    curr._min_chunk_size = 1
+    threaded = _certain_loop(pSpill, curr)
+
+    assert np.all(threaded == delta)
+    assert np.all(pSpill['current_cell_index'] == cell_index)
+
+
+def test_prefetch_time_data():
+    """
+    reading the next time ahead gives the same moves and velocities over a
+    day of steps, and the times read ahead are used
+    """
+    num_steps = 24 * 3600 / time_step
+    runs = {}
+    for prefetch in (False, True):
+        pSpill = sample_sc_release(num_le, start_pos, rel_time)
+        curr = GridCurrentMover(curr_file, topology_file, extrapolate=True)
+        curr.prefetch_time_data = prefetch
+        curr.prepare_for_model_run()
+
+        deltas = []
+        vels = []
+        for step in range(num_steps):
+            step_time = model_time + datetime.timedelta(seconds=step *
+                                                        time_step)
+            curr.prepare_for_model_step(pSpill, time_step, step_time)
+            deltas.append(curr.get_move(pSpill, time_step, step_time).copy())
+            curr.model_step_is_done()
+
+            vels.append(curr.get_scaled_velocities(
+                time_utils.date_to_sec(step_time)))
+
+        runs[prefetch] = (curr, np.array(deltas), np.array(vels))
+
+    assert np.all(runs[True][1] == runs[False][1])
+    assert np.all(runs[True][2] == runs[False][2])
+
+    assert runs[False][0].prefetch_hits == 0
+    assert runs[True][0].prefetch_hits > 0
+
+    # the first interval is always read when it is needed
+    assert runs[True][0].prefetch_stalls > 0
+
+
 c_grid = GridCurrentMover(curr_file,topology_file)
 
 
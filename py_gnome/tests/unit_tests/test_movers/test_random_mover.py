@@ -10,6 +10,7 @@ import numpy as np
 from gnome.movers import RandomMover
 
 from gnome.utilities.time_utils import sec_to_date, date_to_sec
+from gnome.utilities.rand import seed
 from gnome.utilities.projections import FlatEarthProjection
 from ..conftest import sample_sc_release
 
@@ -137,6 +138,31 @@ def test_variance1(start_loc, time_step):
     assert np.allclose(var, (expected, expected, 0.), rtol=0.1)
 
 
+def test_get_move_threads():
+    """
+    with random streams the delta doesn't depend on how the LEs are split
+    across threads, and the LEs still get different moves
+    """
+    num_le = 100
+    start_time = datetime.datetime(2012, 11, 10, 0)
+    sc = sample_sc_release(num_le, (0., 0., 0.), start_time)
+    time_step = 900
+
+    rand = RandomMover()
+    rand._min_chunk_size = 1
+
+    deltas = []
+    for num_threads in (2, 3):
+        seed(1)
+        rand.num_threads = num_threads
+        rand.prepare_for_model_step(sc, time_step, start_time)
+        deltas.append(np.copy(rand.get_move(sc, time_step, start_time)))
+        rand.model_step_is_done()
+
+    assert np.all(deltas[0] == deltas[1])
+    assert len(np.unique(deltas[0][:, 0])) == num_le
+
+
 if __name__ == '__main__':
     tw = TestRandomMover()
     tw.test_prepare_for_model_step()
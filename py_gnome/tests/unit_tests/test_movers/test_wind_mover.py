@@ -246,6 +246,46 @@ class TestWindMover:
 
         self.wm.model_step_is_done()
 
+    def test_accumulate_move(self):
+        """
+        accumulate_move() adds the same delta as get_move() to its output
+        array, computed in the SpillContainer's scratch buffer
+        """
+        self.wm.prepare_for_model_step(self.sc, self.time_step,
+                                       self.model_time)
+        delta = self.wm.get_move(self.sc, self.time_step, self.model_time)
+
+        out = np.copy(self.sc['positions'])
+        self.wm.accumulate_move(self.sc, self.time_step, self.model_time,
+                                out)
+
+        assert np.all(out == self.sc['positions'] + delta)
+        assert np.may_share_memory(self.wm.delta, self.sc.delta_buffer())
+
+        self.wm.model_step_is_done()
+
+    def test_get_move_threads(self):
+        """
+        splitting the LEs across threads gives the same delta
+        """
+        self.wm.prepare_for_model_step(self.sc, self.time_step,
+                                       self.model_time)
+        delta = np.copy(self.wm.get_move(self.sc, self.time_step,
+                                         self.model_time))
+
+        self.wm.num_threads = 2
+        self.wm._min_chunk_size = 1
+        try:
+            threaded = self.wm.get_move(self.sc, self.time_step,
+                                        self.model_time)
+        finally:
+            self.wm.num_threads = 1
+            del self.wm._min_chunk_size
+
+        assert np.all(threaded == delta)
+
+        self.wm.model_step_is_done()
+
     def test_get_move_exceptions(self):
         curr_time = sec_to_date(date_to_sec(self.model_time) + self.time_step)
         tmp_windages = self.sc._data_arrays['windages']
@@ -16,7 +16,8 @@ np = numpy
 
 from gnome.basic_types import (oil_status,
                                world_point_type,
-                               id_type)
+                               id_type,
+                               fate)
 from gnome import array_types
 from gnome.spill.elements import (ElementType,
                                   InitWindages,
@@ -989,6 +990,39 @@ def test_model_step_is_done():
     assert np.count_nonzero(sc['spill_num'] == 1) == num_elements - 4
 
 
+def test_release_after_model_step_is_done():
+    """
+    data arrays are views of preallocated buffers - check that releasing
+    elements after some are removed keeps the arrays consistent and reuses
+    the buffers instead of reallocating them
+    """
+    num_elements = 10
+    sc = SpillContainer()
+    sc.spills += point_line_release_spill(num_elements,
+                                          start_position,
+                                          release_time,
+                                          end_release_time=end_release_time)
+    sc.prepare_for_model_run(windage_at)
+
+    time_step = 3600
+    sc.release_elements(time_step, release_time)
+    num_rel = sc.num_released
+    buf = sc['id'].base
+
+    sc['status_codes'][0] = oil_status.to_be_removed
+    sc.model_step_is_done()
+    assert sc.num_released == num_rel - 1
+    assert sc['id'].base is buf
+
+    sc.release_elements(time_step,
+                        release_time + timedelta(seconds=time_step))
+    assert sc['id'].base is buf
+    assert np.all(np.diff(sc['id']) == 1)
+
+    for key, val in sc.array_types.iteritems():
+        assert sc[key].shape == (sc.num_released,) + val.shape
+
+
 def test_SpillContainer_add_array_types():
     '''
     Test an array_type is dynamically added/subtracted from SpillContainer if
@@ -1300,5 +1334,50 @@ def test_split_element():
         assert np.allclose(d_split, split)
 
 
+def test_fate_index():
+    '''
+    the fate index kept by FateDataView matches the fate mask as LEs are
+    released, change fate and are removed
+    '''
+    sc = SpillContainer()
+    reltime = datetime(2015, 1, 1, 12, 0, 0)
+    sc.spills += point_line_release_spill(20, (1, 1, 1),
+                                          reltime,
+                                          end_release_time=(reltime +
+                                                            timedelta(hours=1)),
+                                          amount=100,
+                                          units='kg',
+                                          substance=test_oil)
+    sc.prepare_for_model_run({'fate_status'})
+    subs = sc.get_substances(complete=False)[0]
+    view = sc._get_fatedataview(subs)
+
+    def check():
+        for f in ('surface_weather', 'non_weather', 'skim', 'all'):
+            assert np.all(view._get_fate_index(sc, f) ==
+                          np.where(view._get_fate_mask(sc, f))[0])
+
+    sc.release_elements(900, reltime)
+    check()
+
+    sc.release_elements(900, reltime + timedelta(seconds=900))
+    check()
+
+    # change fate through the SC and through a data view
+    sc.set_fate_status(np.arange(0, len(sc), 2), fate.surface_weather)
+    check()
+
+    data = sc.substancefatedata(subs, {'fate_status', 'mass'},
+                                'surface_weather')
+    data['fate_status'][:2] = fate.skim
+    data['mass'][2] = 0.
+    sc.update_from_fatedataview(subs, 'surface_weather')
+    check()
+
+    # remove LEs
+    sc['status_codes'][[1, 4]] = oil_status.to_be_removed
+    sc.model_step_is_done()
+    check()
+
 if __name__ == '__main__':
     test_rewind()
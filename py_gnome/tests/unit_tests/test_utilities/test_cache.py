@@ -282,6 +282,160 @@ def test_read_back_from_memory():
                           sc['positions'])
 
 
+def test_read_back_from_memory_shared():
+    """
+    steps held in memory are shared read-only by every load_timestep call;
+    writeable() gives a private copy
+    """
+    c = cache.ElementCache()
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    scp = SpillContainerPairData(sc)
+    c.save_timestep(0, scp)
+
+    sc_a = c.load_timestep(0).items()[0]
+    sc_b = c.load_timestep(0).items()[0]
+
+    assert sc_a['positions'] is sc_b['positions']
+    assert not sc_a['positions'].flags.writeable
+
+    with pytest.raises(ValueError):
+        sc_a['positions'] += 1.0
+
+    pos = sc_a.writeable('positions')
+    pos += 1.0
+    assert sc_a['positions'] is pos
+    assert np.array_equal(sc_b['positions'], sc['positions'])
+
+
+def test_async_write_and_read_back():
+    """
+    background writes are flushed before a step is read back from disk
+    """
+    c = cache.ElementCache(async_write=True)
+    assert c.async_write
+
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    scp = SpillContainerPairData(sc)
+
+    pos0 = sc['positions'].copy()
+    c.save_timestep(0, scp)
+
+    sc['positions'] += 1.1
+    c.save_timestep(1, scp)
+
+    # step 0 is no longer in memory - must come from disk
+    sc0 = c.load_timestep(0)
+    assert np.array_equal(sc0._spill_container['positions'], pos0)
+
+    c.flush()
+    assert os.path.isfile(c._make_filename(1))
+
+    c.async_write = False
+    assert not c.async_write
+
+
+def test_memmap_write_and_read_back():
+    """
+    MemmapElementCache appends steps to one file per data array and reads
+    them back as memory mapped arrays
+    """
+    c = cache.MemmapElementCache()
+
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    u_sc = sample_sc_release(num_elements=10, start_pos=(4.14, 3.72, 2.2),
+                             uncertain=True)
+    scp = SpillContainerPairData(sc, u_sc)
+
+    sc.current_time_stamp = dt
+    pos0 = sc['positions'].copy()
+    u_pos0 = u_sc['positions'].copy()
+    c.save_timestep(0, scp)
+
+    sc.current_time_stamp = dt + tdelta
+    sc['positions'] += 1.1
+    pos1 = sc['positions'].copy()
+    c.save_timestep(1, scp)
+
+    sc.current_time_stamp = dt + tdelta * 2
+    c.save_timestep(2, scp)
+
+    assert os.path.isfile(c._make_array_filename('positions'))
+    assert not os.path.isfile(c._make_filename(0))
+
+    scp1 = c.load_timestep(1)
+    assert isinstance(scp1._spill_container['positions'], np.memmap)
+    assert np.array_equal(scp1._spill_container['positions'], pos1)
+    assert scp1._spill_container.current_time_stamp == dt + tdelta
+
+    scp0 = c.load_timestep(0)
+    assert np.array_equal(scp0._spill_container['positions'], pos0)
+    assert np.array_equal(scp0._u_spill_container['positions'], u_pos0)
+    assert scp0._spill_container.current_time_stamp == dt
+
+    c.rewind()
+    with pytest.raises(cache.CacheError):
+        c.load_timestep(0)
+
+
+def test_recent_lru():
+    """
+    recent steps are kept in memory up to max_recent_bytes
+    """
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    scp = SpillContainerPairData(sc)
+    step_nbytes = sum(a.nbytes for a in sc.data_arrays.itervalues())
+
+    c = cache.ElementCache(enabled=False, max_recent_bytes=2 * step_nbytes)
+
+    for step in range(3):
+        c.save_timestep(step, scp)
+        sc['positions'] += 1.0
+
+    # only the last two steps fit in memory
+    assert c.recent.keys() == [1, 2]
+    with pytest.raises(cache.CacheError):
+        c.load_timestep(0)
+    assert c.misses == 1
+
+    # using step 1 makes step 2 the least recently used
+    c.load_timestep(1)
+    assert c.hits == 1
+    c.save_timestep(3, scp)
+    assert c.recent.keys() == [1, 3]
+    assert c.recent_nbytes <= c.max_recent_bytes
+
+
+@pytest.mark.parametrize("num_steps", [1, 2])
+def test_recent_keeps_last_saved(num_steps):
+    """
+    steps loaded from disk never push the most recently saved step out of
+    memory, even if the budget only holds one or two steps
+    """
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    scp = SpillContainerPairData(sc)
+    step_nbytes = sum(a.nbytes for a in sc.data_arrays.itervalues())
+
+    c = cache.ElementCache(max_recent_bytes=num_steps * step_nbytes)
+
+    for step in range(4):
+        c.save_timestep(step, scp)
+        sc['positions'] += 1.0
+
+    for step in range(4):
+        scp1 = c.load_timestep(step)
+        assert np.all(scp1._spill_container['positions'] ==
+                      sc['positions'] - 4 + step)
+
+        assert 3 in c.recent
+        assert c.recent_nbytes <= c.max_recent_bytes
+
+    # a step read from disk is only kept if it fits next to the last saved
+    if num_steps == 1:
+        assert c.recent.keys() == [3]
+    else:
+        assert c.recent.keys() == [2, 3]
+
+
 def test_cache_error():
     """
     you should get an exception when you ask for somethign not there
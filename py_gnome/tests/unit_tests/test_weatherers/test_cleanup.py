@@ -9,7 +9,7 @@ from pytest import raises, mark
 
 from gnome.basic_types import oil_status, fate
 
-from gnome.weatherers.cleanup import CleanUpBase
+from gnome.weatherers.cleanup import CleanUpBase, CleanupScheduler
 from gnome.weatherers import (WeatheringData,
                               FayGravityViscous,
                               Skimmer,
@@ -160,6 +160,44 @@ class TestCleanUpBase:
         assert self.base.efficiency == 1.0
 
 
+class TestCleanupScheduler(ObjForTests):
+    (sc, weatherers) = ObjForTests.mk_test_objs()
+
+    def test_mark(self):
+        '''
+        requests in the same step are served in order from the cumulative
+        mass of the surface LEs. LEs that are no longer 'surface_weather'
+        are not candidates for the following requests
+        '''
+        self.reset_and_release()
+        self.sc['frac_water'][:] = 0.5
+        substance = self.sc.get_substances(complete=False)[0]
+        le_mass = self.sc['mass'][0]
+
+        scheduler = CleanupScheduler()
+
+        # mass of oil/water mixture is 2 * le_mass per LE
+        marked, all_marked = scheduler.mark(self.sc, substance, fate.burn,
+                                            5 * le_mass)
+        assert not all_marked
+        assert np.all(marked == [0, 1, 2])
+        assert np.all(self.sc['fate_status'][:3] == fate.burn)
+
+        marked, all_marked = scheduler.mark(self.sc, substance,
+                                            fate.disperse, 2 * le_mass,
+                                            oilwater_mix=False)
+        assert not all_marked
+        assert np.all(marked == [3, 4])
+
+        marked, all_marked = scheduler.mark(self.sc, substance,
+                                            fate.skim | fate.surface_weather,
+                                            self.sc['mass'].sum() * 2)
+        assert all_marked
+        assert np.all(marked == range(5, len(self.sc)))
+        assert np.all(self.sc['fate_status'][5:] ==
+                      fate.skim | fate.surface_weather)
+
+
 class TestSkimmer(ObjForTests):
     skimmer = Skimmer(amount,
                       'kg',
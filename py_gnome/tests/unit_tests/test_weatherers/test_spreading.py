@@ -176,6 +176,43 @@ class TestFayGravityViscous:
         assert np.all(area[:4] == i_area)
         assert np.all(area[4:] < i_area)
 
+    def test_values_vary_spill_num(self):
+        '''
+        blobs of two spills with the same age are updated separately when
+        spill_num is given - same as calling update_area for each spill
+        '''
+        (bulk_init_volume, age, area) = data_arrays(12)
+        spill_num = np.zeros_like(age)
+        spill_num[6:] = 1
+        bulk_init_volume[6:] = 60
+        age[0::2] = 900
+        age[1::2] = 1800
+        for s_num in (0, 1):
+            for b_age in (900, 1800):
+                m = np.logical_and(spill_num == s_num, age == b_age)
+                area[m] = self.spread.init_area(water_viscosity,
+                                                rel_buoy,
+                                                bulk_init_volume[m][0])/m.sum()
+
+        exp_area = area.copy()
+        for s_num in (0, 1):
+            m = spill_num == s_num
+            exp_area[m] = self.spread.update_area(water_viscosity,
+                                                  rel_buoy,
+                                                  bulk_init_volume[m],
+                                                  exp_area[m],
+                                                  age[m])
+
+        self.spread.update_area(water_viscosity,
+                                rel_buoy,
+                                bulk_init_volume,
+                                area,
+                                age,
+                                spill_num)
+        assert np.allclose(area, exp_area)
+        (_, area_900) = self.expected(bulk_init_volume[6], 900)
+        assert np.isclose(area[6::2].sum(), area_900)
+
 
 class TestLangmuir(ObjForTests):
     thick = 1e-4
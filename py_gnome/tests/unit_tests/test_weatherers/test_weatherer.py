@@ -4,7 +4,7 @@
 Unit tests for the Weatherer classes
 '''
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import numpy
 np = numpy
@@ -12,8 +12,8 @@ np = numpy
 from gnome.utilities.inf_datetime import InfDateTime
 
 from gnome.spill.elements import floating
-from gnome.environment import Water
-from gnome.weatherers import Weatherer, HalfLifeWeatherer
+from gnome.environment import Water, Waves, constant_wind
+from gnome.weatherers import Weatherer, HalfLifeWeatherer, WeatheringForcing
 from oil_library import get_oil_props
 from conftest import weathering_data_arrays, test_oil
 
@@ -59,3 +59,43 @@ class TestWeatherer:
         print '\nsc["mass"]:\n', sc['mass']
         assert np.allclose(0.5 * orig_mc.sum(1), sc['mass'])
         assert np.allclose(0.5 * orig_mc, sc['mass_components'])
+
+
+class TestWeatheringForcing:
+    wind = constant_wind(5., 0)
+    water = Water()
+    waves = Waves(wind, water)
+    times = [rel_time + timedelta(hours=h) for h in range(4)]
+
+    def test_table(self):
+        forcing = WeatheringForcing(self.times, self.wind, self.waves,
+                                    self.water)
+        assert len(forcing) == len(self.times)
+
+        for t in self.times:
+            row = forcing.lookup(t)
+            assert row['wind_speed'] == self.wind.get_value(t)[0]
+            assert np.allclose((row['wave_height'], row['peak_period'],
+                                row['whitecap_fraction'],
+                                row['dissipation_energy']),
+                               self.waves.get_value(t))
+            assert np.isclose(row['emulsification_wind'],
+                              self.waves.get_emulsification_wind(t))
+            assert row['water_temp'] == self.water.get('temperature', 'K')
+
+        assert forcing.lookup(rel_time - timedelta(hours=1)) is None
+
+    def test_missing_objects(self):
+        weatherer = Weatherer()
+        weatherer.forcing = WeatheringForcing(self.times, wind=self.wind)
+
+        assert weatherer._get_forcing(rel_time, 'wind_speed') == 5.
+        assert weatherer._get_forcing(rel_time, 'wave_height') is None
+
+    def test_invalidated_by_change(self):
+        water = Water()
+        forcing = WeatheringForcing(self.times, water=water)
+        assert forcing.lookup(rel_time) is not None
+
+        water.temperature = 285.
+        assert forcing.lookup(rel_time) is None
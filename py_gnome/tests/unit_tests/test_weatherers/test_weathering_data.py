@@ -161,6 +161,34 @@ class TestWeatheringData:
             assert np.allclose(sc['density'], init_dens)
             assert np.allclose(sc['viscosity'], init_visc)
 
+    def test_fate_index_kept(self):
+        '''
+        WeatheringData works on all the LEs but does not change fate_status or
+        mass - the fate index is not rebuilt
+        '''
+        rel_time = datetime.now().replace(microsecond=0)
+        (sc, wd) = self.sample_sc_intrinsic(100, rel_time)
+        num = sc.release_elements(default_ts, rel_time)
+        wd.initialize_data(sc, num)
+
+        self.mock_weather_data(sc, wd, 3)
+
+        view = sc._get_fatedataview(sc.get_substances(complete=False)[0])
+        index = view._get_fate_index(sc, 'surface_weather')
+
+        self.step(wd, sc, rel_time)
+
+        assert view._get_fate_index(sc, 'surface_weather') is index
+
+        # LEs whose mass changed are moved
+        for _, data in sc.itersubstancedata(wd.array_types, fate='all'):
+            data['mass'][:2] = 0.
+        sc.update_from_fatedataview(fate='all')
+
+        assert np.all(view._get_fate_index(sc, 'surface_weather') ==
+                      np.where(view._get_fate_mask(sc, 'surface_weather'))[0])
+        assert 0 not in view._get_fate_index(sc, 'surface_weather')
+
     def test_density_threshold(self):
         '''
         check that density does not fall below water density